@@ -0,0 +1,87 @@
+# advanced_security_script/benchmarks/bench_bulk_ingest.py
+
+"""
+Measures offline bulk ingestion throughput (records/sec) of VulnerabilityCrawler.ingest_bulk_feeds
+with one worker process against a pool, into a fresh SQLite store.
+
+Synthetic gzip NVD year feeds are generated from a fixed seed, so runs are reproducible and need
+no network; pass --feeds to ingest a directory of downloaded feeds instead.
+
+Usage:
+    python -m advanced_security_script.benchmarks.bench_bulk_ingest [--years N] [--items N] [--workers N] [--feeds DIR]
+"""
+
+import argparse
+import asyncio
+import gzip
+import json
+import os
+import random
+import tempfile
+import time
+
+from advanced_security_script.core.config_manager import ConfigSnapshot, ConfigView
+from advanced_security_script.modules.intelligence.vulnerability_crawler import VulnerabilityCrawler
+from advanced_security_script.modules.intelligence.vulnerability_store import VulnerabilityStore
+
+def _bench_config(state_path: str) -> ConfigView:
+    """Crawler settings of one run; everything else takes the CONFIG_SCHEMA defaults."""
+    return ConfigView(ConfigSnapshot(0, {"vulnerability_crawler": {"nvd_sync_state_path": state_path, "http_cache_enabled": False}}))
+
+def _write_year_feed(path: str, year: int, items: int, rng: random.Random):
+    cve_items = []
+    for i in range(items):
+        score = round(rng.uniform(1, 10), 1)
+        cve_items.append({
+            "cve": {
+                "CVE_data_meta": {"ID": f"CVE-{year}-{i:05d}"},
+                "references": {"reference_data": [{"url": f"https://example.com/advisory/{year}/{i}"}]},
+                "description": {"description_data": [{"lang": "en", "value": " ".join(rng.choices(
+                    ["remote", "attackers", "execute", "arbitrary", "code", "via", "crafted", "request", "in"], k=30))}]},
+            },
+            "configurations": {"nodes": [{"operator": "OR", "cpe_match": [
+                {"vulnerable": True, "cpe23Uri": f"cpe:2.3:a:vendor{i % 50}:product{i % 200}:*:*:*:*:*:*:*:*"}]}]},
+            "impact": {"baseMetricV3": {"cvssV3": {"baseScore": score, "baseSeverity": "HIGH" if score >= 7 else "MEDIUM"}}},
+            "publishedDate": f"{year}-01-01T00:00Z",
+            "lastModifiedDate": f"{year}-06-01T00:00Z",
+        })
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        json.dump({"CVE_data_timestamp": "2025-06-01T07:00Z", "CVE_Items": cve_items}, f)
+
+async def _ingest(feed_dir: str, work_dir: str, workers: int) -> dict:
+    store = VulnerabilityStore(os.path.join(work_dir, f"bench_{workers}.db"))
+    crawler = VulnerabilityCrawler(_bench_config(os.path.join(work_dir, f"state_{workers}.json")), None, store=store)
+    try:
+        return await crawler.ingest_bulk_feeds([feed_dir], workers=workers)
+    finally:
+        store.close()
+
+def _measure(name: str, feed_dir: str, work_dir: str, workers: int):
+    started = time.perf_counter()
+    summary = asyncio.run(_ingest(feed_dir, work_dir, workers))
+    elapsed = time.perf_counter() - started
+    print(f"{name:14s} {summary['records']:8d} records {elapsed:7.2f} s {summary['records'] / elapsed:10.0f} records/s")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--years", type=int, default=8)
+    parser.add_argument("--items", type=int, default=10000, help="CVE items per generated year feed.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--feeds", help="Directory of feed files to ingest instead of generated ones.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        feed_dir = args.feeds
+        if feed_dir is None:
+            feed_dir = os.path.join(temp_dir, "feeds")
+            os.makedirs(feed_dir)
+            rng = random.Random(1)
+            for year in range(2015, 2015 + args.years):
+                _write_year_feed(os.path.join(feed_dir, f"nvdcve-1.1-{year}.json.gz"), year, args.items, rng)
+        size = sum(os.path.getsize(os.path.join(feed_dir, name)) for name in os.listdir(feed_dir))
+        print(f"feeds: {len(os.listdir(feed_dir))} files, {size / 1e6:.1f} MB compressed")
+        _measure("1 worker", feed_dir, temp_dir, 1)
+        _measure(f"{args.workers} workers", feed_dir, temp_dir, args.workers)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+# advanced_security_script/benchmarks/bench_config_lookup.py
+
+"""
+Measures configuration lookup cost (ns/lookup) of the compiled ConfigManager snapshot against
+the previous two-level `config.get(section, {}).get(key, default)` implementation.
+
+Usage:
+    python -m advanced_security_script.benchmarks.bench_config_lookup [--number N]
+"""
+
+import argparse
+import os
+import tempfile
+import timeit
+
+import yaml
+
+from advanced_security_script.core.config_manager import ConfigManager
+
+SAMPLE_CONFIG = {
+    "global": {"log_level": "INFO", "max_threads": 8},
+    "vulnerability_crawler": {"max_results_per_source": 50, "nvd_results_per_page": 2000},
+    "workflow_settings": {"max_parallel_items": 16},
+}
+
+def _legacy_get(config: dict, section: str, key: str, default=None):
+    return config.get(section, {}).get(key, default)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--number", type=int, default=1000000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        config_path = os.path.join(temp_dir, "config.yaml")
+        with open(config_path, "w") as f:
+            yaml.safe_dump(SAMPLE_CONFIG, f)
+        cm = ConfigManager(config_path=config_path)
+        raw = cm.get_all_config()
+
+        cases = {
+            "legacy get (present)": lambda: _legacy_get(raw, "vulnerability_crawler", "max_results_per_source", 10),
+            "legacy get (missing section)": lambda: _legacy_get(raw, "easm", "check_cache_ttl", 3600),
+            "get (present)": lambda: cm.get("vulnerability_crawler", "max_results_per_source", 10),
+            "get (missing section)": lambda: cm.get("easm", "check_cache_ttl", 3600),
+            "lookup (dotted path)": lambda: cm.lookup("vulnerability_crawler.max_results_per_source", 10),
+            "get_int (memoized)": lambda: cm.get_int("vulnerability_crawler.max_results_per_source"),
+        }
+        baseline = timeit.timeit(lambda: None, number=args.number) # Call overhead of the lambda itself
+        for name, case in cases.items():
+            elapsed = timeit.timeit(case, number=args.number) - baseline
+            print(f"{name:32s} {elapsed / args.number * 1e9:8.1f} ns/lookup")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+# advanced_security_script/benchmarks/bench_cpe_match.py
+
+"""
+Measures bulk asset-to-CVE matching with VulnerabilityStore.match_cpes (CPE applicability index)
+against a nested loop over every CPE entry, on a synthetic NVD-sized corpus.
+
+CVEs affect products drawn from a skewed popularity distribution, with exact versions, bounded
+and open-ended version ranges, as in NVD configurations. Each asset runs a few of the more common
+products. The nested loop is timed on a sample of assets and extrapolated.
+
+Usage:
+    python -m advanced_security_script.benchmarks.bench_cpe_match [--cves N] [--assets N] [--products N]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from advanced_security_script.modules.intelligence.cpe_index import ANY_VERSION, normalize_query, version_key
+from advanced_security_script.modules.intelligence.vulnerability_store import VulnerabilityStore
+
+def _version(rng: random.Random) -> str:
+    return f"{rng.randint(1, 9)}.{rng.randint(0, 20)}.{rng.randint(0, 40)}"
+
+def _cpe_match(rng: random.Random, vendor: str, product: str) -> dict:
+    kind = rng.random()
+    if kind < 0.4:
+        return {"cpe": f"cpe:2.3:a:{vendor}:{product}:{_version(rng)}:*:*:*:*:*:*:*", "version_start": None,
+                "start_inclusive": True, "version_end": None, "end_inclusive": True}
+    # Ranges mostly span a few minor releases of one major version
+    major, minor = rng.randint(1, 9), rng.randint(0, 20)
+    start, end = f"{major}.{minor}.0", f"{major}.{minor + rng.randint(0, 3)}.{rng.randint(0, 40)}"
+    return {"cpe": f"cpe:2.3:a:{vendor}:{product}:*:*:*:*:*:*:*:*", "version_start": start if kind < 0.8 else None,
+            "start_inclusive": True, "version_end": end, "end_inclusive": rng.random() < 0.5}
+
+def _populate(store: VulnerabilityStore, products: list, weights: list, cves: int, batch: int = 5000):
+    rng = random.Random(1)
+    for start in range(0, cves, batch):
+        records = []
+        for i in range(start, min(start + batch, cves)):
+            affected = rng.choices(products, weights, k=rng.randint(1, 3))
+            records.append({"id": f"CVE-{2000 + i % 25}-{i:06d}", "source": "NVD", "description": "synthetic",
+                            "cpe_matches": [_cpe_match(rng, vendor, product) for vendor, product in affected for _ in range(rng.randint(1, 2))]})
+        store.upsert_many(records)
+
+def _assets(products: list, weights: list, count: int) -> list:
+    rng = random.Random(2)
+    common = products[:2000]
+    return [[{"vendor": vendor, "product": product, "version": _version(rng)}
+             for vendor, product in rng.choices(common, weights[:2000], k=rng.randint(2, 5))] for _ in range(count)]
+
+def _nested_loop(entries: list, technologies: list) -> list:
+    """The naive matcher: every technology is checked against every CPE entry."""
+    results = []
+    for technology in technologies:
+        vendor, product, version = normalize_query(technology)
+        key, found = version_key(version), set()
+        for vuln_id, entry_vendor, entry_product, entry_version, start, start_incl, end, end_incl in entries:
+            if entry_vendor != vendor or entry_product != product:
+                continue
+            if start or end:
+                if start and (key < version_key(start) or (not start_incl and key == version_key(start))):
+                    continue
+                if end and (key > version_key(end) or (not end_incl and key == version_key(end))):
+                    continue
+            elif entry_version not in ANY_VERSION and entry_version != version:
+                continue
+            found.add(vuln_id)
+        results.append(sorted(found))
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cves", type=int, default=250000)
+    parser.add_argument("--assets", type=int, default=50000)
+    parser.add_argument("--products", type=int, default=20000)
+    parser.add_argument("--sample", type=int, default=10, help="Assets timed with the nested loop.")
+    args = parser.parse_args()
+
+    products = [(f"vendor{i % (args.products // 3 + 1)}", f"product{i}") for i in range(args.products)]
+    # Zipf-like popularity; the most affected product gets ~3% of the CVEs, as the Linux kernel does in NVD
+    weights = [1 / (rank + 1) ** 0.8 for rank in range(args.products)]
+    with tempfile.TemporaryDirectory() as temp_dir:
+        store = VulnerabilityStore(os.path.join(temp_dir, "cpe.db"))
+        started = time.perf_counter()
+        _populate(store, products, weights, args.cves)
+        entries = store._conn.execute("SELECT COUNT(*) FROM vulnerability_cpes").fetchone()[0]
+        print(f"stored {args.cves} CVEs ({entries} CPE entries) in {time.perf_counter() - started:.1f} s")
+
+        assets = _assets(products, weights, args.assets)
+        technologies = [technology for asset in assets for technology in asset]
+        started = time.perf_counter()
+        matches = store.match_cpes(technologies)
+        indexed = time.perf_counter() - started
+        print(f"match_cpes:  {args.assets} assets, {len(technologies)} technologies in {indexed:.2f} s "
+              f"({sum(map(len, matches))} CVE matches)")
+
+        rows = store._conn.execute("SELECT vuln_id, vendor, product, version, version_start, start_inclusive, "
+                                   "version_end, end_inclusive FROM vulnerability_cpes").fetchall()
+        rows = [tuple(row) for row in rows]
+        sample = technologies[:sum(len(asset) for asset in assets[:args.sample])]
+        started = time.perf_counter()
+        naive = _nested_loop(rows, sample)
+        per_technology = (time.perf_counter() - started) / len(sample)
+        assert naive == matches[:len(sample)], "nested loop and index disagree"
+        print(f"nested loop: {per_technology * 1000:.1f} ms per technology, "
+              f"~{per_technology * len(technologies) / 60:.0f} min for all assets (from {args.sample} assets)")
+        store.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+# advanced_security_script/benchmarks/bench_exploitdb_feed.py
+
+"""
+Measures Exploit-DB RSS parsing throughput (items/sec) and peak memory of the streaming parser
+against building the whole DOM with ElementTree.parse.
+
+By default the items of the sample feed in tests/fixtures are replicated into a large feed;
+pass --feed to benchmark a captured feed file instead.
+
+Usage:
+    python -m advanced_security_script.benchmarks.bench_exploitdb_feed [--items N] [--feed PATH]
+"""
+
+import argparse
+import os
+import re
+import tempfile
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+
+from advanced_security_script.modules.intelligence.exploitdb_feed import iter_exploitdb_file, normalize_exploitdb_item, ITEM_FIELDS
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "..", "tests", "fixtures", "exploitdb_rss.xml")
+
+def _write_large_feed(path: str, items: int):
+    with open(FIXTURE, "r", encoding="utf-8") as f:
+        sample = f.read()
+    head, rest = sample.split("<item>", 1)
+    templates = ["<item>" + item for item in ("<item>" + rest).split("<item>")[1:]]
+    templates[-1], tail = templates[-1].split("</channel>", 1)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(head)
+        for i in range(items):
+            # Distinct EDB-IDs so every replicated item is a separate record
+            f.write(re.sub(r"/exploits/\d+", f"/exploits/{100000 + i}", templates[i % len(templates)]))
+        f.write("</channel>" + tail)
+
+def _dom_records(path: str) -> int:
+    count = 0
+    for item in ET.parse(path).getroot().iter("item"):
+        fields = {child.tag: child.text for child in item if child.tag in ITEM_FIELDS}
+        count += normalize_exploitdb_item(fields) is not None
+    return count
+
+def _measure(name: str, func, path: str):
+    tracemalloc.start()
+    started = time.perf_counter()
+    count = func(path)
+    elapsed = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    # Timing under tracemalloc is pessimistic; repeat without it for throughput.
+    started = time.perf_counter()
+    func(path)
+    elapsed = time.perf_counter() - started
+    print(f"{name:24s} {count:8d} records {count / elapsed:10.0f} items/s  peak {peak / 1e6:7.1f} MB")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--items", type=int, default=100000)
+    parser.add_argument("--feed", help="Captured feed file to parse instead of a generated one.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = args.feed
+        if path is None:
+            path = os.path.join(temp_dir, "exploitdb_large.xml")
+            _write_large_feed(path, args.items)
+        print(f"feed: {os.path.getsize(path) / 1e6:.1f} MB")
+        _measure("streaming (pull parser)", lambda p: sum(1 for _ in iter_exploitdb_file(p)), path)
+        _measure("ElementTree.parse (DOM)", _dom_records, path)
+
+if __name__ == "__main__":
+    main()
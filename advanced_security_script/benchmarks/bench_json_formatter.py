@@ -0,0 +1,59 @@
+# advanced_security_script/benchmarks/bench_json_formatter.py
+
+"""
+Measures JSON log formatting throughput (records/sec) of the built-in FastJsonFormatter
+against python-json-logger's JsonFormatter (the previous setup, if installed) and the plain
+text formatter.
+
+Usage:
+    python -m advanced_security_script.benchmarks.bench_json_formatter [--records N]
+"""
+
+import argparse
+import logging
+import time
+
+from advanced_security_script.core.logger_manager import FastJsonFormatter, DEFAULT_JSON_FIELDS, orjson
+
+def _make_records(count: int) -> list:
+    records = []
+    for i in range(count):
+        record = logging.LogRecord(
+            "modules.intelligence.vulnerability_crawler", logging.DEBUG, __file__, 42,
+            "Fetched page %d from %s", (i, "https://services.nvd.nist.gov/rest/json/cves/1.0"), None,
+            func="fetch_from_source",
+        )
+        record.source = "NVD" # An `extra` field
+        records.append(record)
+    return records
+
+def _throughput(formatter: logging.Formatter, records: list) -> float:
+    start = time.perf_counter()
+    for record in records:
+        formatter.format(record)
+    return len(records) / (time.perf_counter() - start)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--records", type=int, default=200000)
+    args = parser.parse_args()
+    records = _make_records(args.records)
+
+    formatters = {
+        f"FastJsonFormatter ({'orjson' if orjson else 'json'})": FastJsonFormatter(service="advanced_security_script"),
+        "logging.Formatter (text)": logging.Formatter(
+            "%(asctime)s - %(name)s - %(levelname)s - %(module)s - %(funcName)s - %(lineno)d - %(message)s"),
+    }
+    try:
+        from pythonjsonlogger import jsonlogger
+        formatters["pythonjsonlogger.JsonFormatter"] = jsonlogger.JsonFormatter(
+            " ".join(f"%({field})s" for field in DEFAULT_JSON_FIELDS))
+    except ImportError:
+        print("python-json-logger is not installed; skipping the previous JSON formatter.")
+
+    for name, formatter in formatters.items():
+        _throughput(formatter, records[:1000]) # Warm-up
+        print(f"{name:40s} {_throughput(formatter, records):>12,.0f} records/sec")
+
+if __name__ == "__main__":
+    main()
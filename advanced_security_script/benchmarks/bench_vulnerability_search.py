@@ -0,0 +1,79 @@
+# advanced_security_script/benchmarks/bench_vulnerability_search.py
+
+"""
+Measures full-text search latency of VulnerabilityStore.search (FTS5, BM25-ranked, with snippets)
+against a LIKE substring scan, over a synthetic corpus the size of NVD.
+
+Usage:
+    python -m advanced_security_script.benchmarks.bench_vulnerability_search [--records N] [--db PATH]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from advanced_security_script.modules.intelligence.vulnerability_store import VulnerabilityStore
+
+VENDORS = [f"vendor{i}" for i in range(2000)] + ["apache", "microsoft", "cisco", "oracle", "wordpress", "jenkins"]
+WORDS = ["remote", "attackers", "execute", "arbitrary", "code", "via", "crafted", "request", "allows", "in", "the",
+         "authenticated", "users", "component", "function", "parameter", "version", "before", "could", "lead", "to"]
+# One weakness per record, so each weakness phrase matches about 1/20 of the corpus as in NVD
+WEAKNESSES = ["SQL injection", "cross-site scripting", "buffer overflow", "use-after-free", "path traversal",
+              "denial of service", "privilege escalation", "information disclosure", "command injection", "XXE",
+              "SSRF", "CSRF", "open redirect", "integer overflow", "race condition", "deserialization",
+              "authentication bypass", "memory corruption", "improper certificate validation", "NULL pointer dereference"]
+# The last query matches nearly every record: the worst case, since BM25 ranking scores every match
+QUERIES = ["apache", "wordpress plugin", "jenkins remote", "vendor1234", "micro*", "sql injection", "CVE-2020-10020", "remote"]
+
+def _populate(store: VulnerabilityStore, records: int, batch: int = 5000):
+    rng = random.Random(1)
+    for start in range(0, records, batch):
+        rows = []
+        for i in range(start, min(start + batch, records)):
+            vendor = rng.choice(VENDORS)
+            words = rng.choices(WORDS, k=25) + [rng.choice(WEAKNESSES)]
+            rng.shuffle(words)
+            words.insert(rng.randrange(len(words)), f"{vendor.capitalize()} {rng.choice(['plugin', 'server', 'portal'])}")
+            rows.append({
+                "id": f"CVE-{2000 + i % 25}-{i:05d}", "source": "NVD", "description": " ".join(words),
+                "severity": rng.choice(["LOW", "MEDIUM", "HIGH", "CRITICAL"]), "cvss_score": round(rng.uniform(1, 10), 1),
+                "published_date": f"{2000 + i % 25}-01-01T00:00Z",
+            })
+        store.upsert_many(rows)
+
+def _time(func, repeat: int = 20) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--records", type=int, default=250000)
+    parser.add_argument("--db", help="Existing store to search instead of a generated one.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = args.db or os.path.join(temp_dir, "search.db")
+        store = VulnerabilityStore(db_path)
+        if args.db is None:
+            started = time.perf_counter()
+            _populate(store, args.records)
+            print(f"indexed {args.records} records in {time.perf_counter() - started:.1f} s")
+        print(f"{'query':18s} {'hits':>6s} {'fts5 ms':>9s} {'LIKE ms':>9s}")
+        for query in QUERIES:
+            hits = len(store.search(query, limit=1000))
+            fts_ms = _time(lambda: store.search(query, limit=20))
+            needle = f"%{query.rstrip('*').split()[0]}%"
+            like_ms = _time(lambda: store._conn.execute(
+                "SELECT * FROM vulnerabilities WHERE description LIKE ? ORDER BY published_date DESC LIMIT 20", (needle,)).fetchall(), repeat=3)
+            print(f"{query:18s} {hits:6d} {fts_ms:9.1f} {like_ms:9.1f}")
+        store.close()
+
+if __name__ == "__main__":
+    main()
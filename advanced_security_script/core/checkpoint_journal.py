@@ -0,0 +1,100 @@
+# advanced_security_script/core/checkpoint_journal.py
+
+import logging
+import datetime
+import json
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+class CheckpointJournal:
+    def __init__(self, journal_dir: str):
+        """
+        Initializes the CheckpointJournal.
+        Each in-flight workflow run has an append-only JSON-lines file recording the task
+        configuration and the output of every completed step. Every record is fsynced, so a run
+        interrupted by a crash or restart can be resumed from its last completed step. The file is
+        removed once the run finishes.
+        Args:
+            journal_dir (str): Directory holding the journal files (created on first write).
+        """
+        self.journal_dir = journal_dir
+        self._lock = threading.Lock()
+
+    def _path(self, run_id: str) -> str:
+        return os.path.join(self.journal_dir, f"{run_id}.jsonl")
+
+    def _append(self, run_id: str, record: dict):
+        record["ts"] = datetime.datetime.now().isoformat()
+        line = json.dumps(record, separators=(",", ":")) + "\n"
+        with self._lock:
+            os.makedirs(self.journal_dir, exist_ok=True)
+            with open(self._path(run_id), "a", encoding="utf-8") as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def start_run(self, run_id: str, task_config: dict):
+        """
+        Opens the journal of a new run.
+
+        Raises:
+            TypeError/ValueError: If the task configuration is not JSON-serializable.
+        """
+        self._append(run_id, {"event": "started", "task_config": task_config})
+
+    def record_step(self, run_id: str, step_name: str, output) -> bool:
+        """
+        Checkpoints a completed step. Outputs that are not JSON-serializable are not
+        checkpointed (the step will simply run again on resume).
+
+        Returns:
+            True if the checkpoint was written.
+        """
+        try:
+            self._append(run_id, {"event": "step_completed", "step": step_name, "output": output})
+        except (TypeError, ValueError) as e:
+            logger.warning("Output of step '%s' (run %s) is not JSON-serializable; not checkpointed: %s", step_name, run_id, e)
+            return False
+        return True
+
+    def finish_run(self, run_id: str):
+        """
+        Closes a run; finished runs are not resumed.
+        """
+        with self._lock:
+            try:
+                os.remove(self._path(run_id))
+            except FileNotFoundError:
+                pass
+
+    def load_run(self, run_id: str) -> tuple:
+        """
+        Reads a run's journal.
+
+        Returns:
+            A tuple (task_config, completed_outputs). A torn last line left by a crash mid-write is ignored.
+        """
+        task_config, completed = None, {}
+        with open(self._path(run_id), "r", encoding="utf-8") as f:
+            for line_number, line in enumerate(f, 1):
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    logger.warning("Ignoring corrupt record at line %s of checkpoint journal %s.", line_number, run_id)
+                    continue
+                if record.get("event") == "started":
+                    task_config = record["task_config"]
+                elif record.get("event") == "step_completed":
+                    completed[record["step"]] = record["output"]
+        return task_config, completed
+
+    def incomplete_runs(self) -> list:
+        """
+        Lists the runs that were started but never finished, oldest first.
+        """
+        if not os.path.isdir(self.journal_dir):
+            return []
+        paths = [os.path.join(self.journal_dir, name) for name in os.listdir(self.journal_dir) if name.endswith(".jsonl")]
+        return [os.path.basename(path)[:-len(".jsonl")] for path in sorted(paths, key=os.path.getmtime)]
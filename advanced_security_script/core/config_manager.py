@@ -2,45 +2,306 @@
 
 import yaml
 import logging
+import collections
 import os
+import threading
+import hashlib
+import json
+import marshal
+import sys
 
 logger = logging.getLogger(__name__)
 
 DEFAULT_CONFIG_PATH = os.path.join(os.path.dirname(__file__), "..", "configs", "default_config.yaml")
 
-class ConfigManager:
-    def __init__(self, config_path=None):
+# libyaml's C loader parses several times faster than the pure-Python SafeLoader.
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Binary cache of the parsed YAML, stored next to the file as .<name>.cache. marshal output is
+# only valid for the interpreter version that wrote it, hence the cache tag in the header.
+CONFIG_CACHE_FORMAT = ("advanced_security_config", 1, sys.implementation.cache_tag)
+
+def config_cache_path(config_path: str) -> str:
+    directory, filename = os.path.split(config_path)
+    return os.path.join(directory, f".{filename}.cache")
+
+def read_yaml_cached(config_path: str, use_cache: bool = True):
+    """
+    Parses a YAML configuration file, serving the result from its binary cache when the cache
+    was written for the same file content (size and SHA-256). On a miss the file is parsed
+    with the C loader when available and the cache is rewritten.
+
+    Raises:
+        OSError: If the YAML file cannot be read.
+        yaml.YAMLError: If it cannot be parsed.
+    """
+    with open(config_path, 'rb') as f:
+        data = f.read()
+    if not use_cache:
+        return yaml.load(data, Loader=YAML_LOADER)
+    key = (len(data), hashlib.sha256(data).digest())
+    cache_path = config_cache_path(config_path)
+    try:
+        with open(cache_path, 'rb') as f:
+            cache_format, cache_key, config = marshal.loads(f.read()) # load(f) reads the file in tiny chunks
+        if cache_format == CONFIG_CACHE_FORMAT and cache_key == key:
+            return config
+    except FileNotFoundError:
+        pass
+    except (OSError, EOFError, ValueError, TypeError) as e:
+        logger.debug("Ignoring unreadable config cache %s: %s", cache_path, e)
+    config = yaml.load(data, Loader=YAML_LOADER)
+    try:
+        payload = marshal.dumps((CONFIG_CACHE_FORMAT, key, config))
+    except ValueError as e: # e.g. YAML timestamps, which marshal cannot store
+        logger.debug("Configuration %s is not cacheable: %s", config_path, e)
+        return config
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp" # Worker processes may write the cache concurrently
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(payload)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        logger.debug("Could not write config cache %s: %s", cache_path, e)
+    return config
+
+# Environment variables ADVANCED_SECURITY__<SECTION>__<KEY>=<YAML value> override the file,
+# e.g. ADVANCED_SECURITY__VULNERABILITY_CRAWLER__MAX_RESULTS_PER_SOURCE=50.
+ENV_PREFIX = "ADVANCED_SECURITY__"
+
+_MISSING = object()
+
+def _to_bool(value) -> bool:
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, int) and value in (0, 1):
+        return bool(value)
+    if isinstance(value, str) and value.strip().lower() in ("true", "yes", "on", "1", "false", "no", "off", "0"):
+        return value.strip().lower() in ("true", "yes", "on", "1")
+    raise ValueError(f"{value!r} is not a boolean")
+
+def _to_int(value) -> int:
+    if isinstance(value, bool) or (isinstance(value, float) and not value.is_integer()):
+        raise ValueError(f"{value!r} is not an integer")
+    return int(value)
+
+def _to_str(value) -> str:
+    if isinstance(value, (dict, list)):
+        raise ValueError(f"{value!r} is not a string")
+    return str(value)
+
+def _to_list(value) -> list:
+    if isinstance(value, (list, tuple)):
+        return list(value)
+    raise ValueError(f"{value!r} is not a list")
+
+# Converters used by the typed accessors and the schema.
+_CONVERTERS = {bool: _to_bool, int: _to_int, float: float, str: _to_str, list: _to_list}
+
+# Known settings: dotted path -> (type, default). Values present in the file are validated and
+# coerced once when a snapshot is compiled; invalid values are replaced by the default. get, lookup
+# and the typed accessors fall back to these defaults when the caller passes none, so call sites
+# do not repeat them.
+CONFIG_SCHEMA = {
+    "global.log_level": (str, "INFO"),
+    "global.log_file_path": (str, "./logs/script.log"),
+    "global.json_log_format": (bool, False),
+    "global.async_logging": (bool, False),
+    "global.log_queue_size": (int, 10000),
+    "global.log_queue_overflow": (str, "block"),
+    "global.max_threads": (int, 4),
+    "global.config_reload_interval": (float, 2.0),
+    "global.config_overrides_cache_size": (int, 256),
+    "task_executor.queue_size": (int, 100),
+    "task_executor.process_workers": (int, os.cpu_count() or 1),
+    "task_executor.cpu_bound_modules": (list, []), # Workflow task names run on the process pool
+    "task_executor.resume_on_start": (bool, True),
+    "http_client.max_connections": (int, 100),
+    "http_client.max_connections_per_host": (int, 10),
+    "http_client.keepalive_timeout": (float, 30.0),
+    "http_client.dns_cache_ttl": (int, 300),
+    "http_client.total_timeout": (float, 60.0),
+    "http_client.user_agent": (str, "advanced-security-script"),
+    "vulnerability_crawler.max_results_per_source": (int, 10),
+    "vulnerability_crawler.nvd_results_per_page": (int, 2000),
+    "vulnerability_crawler.nvd_max_concurrent_pages": (int, 4),
+    "vulnerability_crawler.nvd_streaming": (bool, True),
+    "vulnerability_crawler.nvd_stream_batch_size": (int, 100),
+    "vulnerability_crawler.max_retries": (int, 4),
+    "vulnerability_crawler.http_cache_enabled": (bool, True),
+    "vulnerability_crawler.http_cache_dir": (str, "./data/http_cache"),
+    "vulnerability_crawler.http_cache_max_bytes": (int, 64 * 1024 * 1024),
+    "vulnerability_crawler.retry_backoff_base": (float, 1.0),
+    "vulnerability_crawler.retry_backoff_max": (float, 60.0),
+    "vulnerability_crawler.bulk_ingest_workers": (int, os.cpu_count() or 1),
+    "vulnerability_crawler.bulk_ingest_batch_size": (int, 1000),
+    "vulnerability_crawler.source_priority": (list, ["NVD", "Exploit-DB"]),
+    "vulnerability_crawler.nvd_sync_state_path": (str, "./data/nvd_sync_state.json"),
+    "vulnerability_crawler.crawl_cache_ttl": (float, 3600.0),
+    "vulnerability_store.db_path": (str, "./data/vulnerabilities.db"),
+    "workflow_settings.max_parallel_items": (int, 16),
+    "workflow_settings.step_cache_enabled": (bool, True),
+    "workflow_settings.step_cache_dir": (str, "./data/step_cache"),
+    "workflow_settings.step_cache_max_bytes": (int, 256 * 1024 * 1024),
+    "workflow_settings.step_cache_ttl": (float, 24 * 3600),
+    "workflow_settings.checkpoint_enabled": (bool, True),
+    "workflow_settings.checkpoint_dir": (str, "./data/checkpoints"),
+    "easm.check_cache_ttl": (float, 3600.0),
+    "easm.connect_timeout": (float, 3.0),
+    "easm.ports": (list, [80, 443]),
+}
+
+def merge_config(base: dict, overlay: dict) -> dict:
+    """
+    Deep-merges overlay onto base without copying the whole tree: only the dicts on the
+    overridden paths are copied, every other sub-dict is shared with base.
+    """
+    merged = dict(base)
+    for key, value in overlay.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = merge_config(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+def _nest_dotted(overrides: dict) -> dict:
+    """Turns {"a.b": 1} into {"a": {"b": 1}}; nested dicts are kept as they are."""
+    nested = {}
+    for key, value in overrides.items():
+        *parents, leaf = str(key).split(".")
+        node = nested
+        for parent in parents:
+            node = node.setdefault(parent, {})
+        if isinstance(value, dict) and isinstance(node.get(leaf), dict):
+            node[leaf] = merge_config(node[leaf], value)
+        else:
+            node[leaf] = value
+    return nested
+
+def env_layer(environ=None, prefix: str = ENV_PREFIX) -> dict:
+    """
+    Collects the configuration overrides defined in environment variables.
+    """
+    environ = os.environ if environ is None else environ
+    overrides = {}
+    for name, raw in environ.items():
+        if not name.startswith(prefix) or len(name) == len(prefix):
+            continue
+        try:
+            value = yaml.safe_load(raw)
+        except yaml.YAMLError:
+            value = raw
+        overrides[name[len(prefix):].lower().replace("__", ".")] = value
+    return _nest_dotted(overrides)
+
+class ConfigSnapshot:
+    """
+    One compiled, immutable configuration version.
+
+    Compilation validates the schema'd settings and precomputes a flat index of every dotted path
+    ("vulnerability_crawler.max_results_per_source"), so lookups are a single dict access without
+    allocating. The nested dicts are shared with callers of get_section/get_all_config and must be
+    treated as read-only; a change always produces a new snapshot.
+    """
+    __slots__ = ("version", "config", "sections", "index", "errors", "_typed")
+
+    def __init__(self, version: int, config: dict, schema: dict = None):
+        config, errors = self._validate(config, CONFIG_SCHEMA if schema is None else schema)
+        index = {}
+        self._flatten(config, "", index)
+        set_attr = object.__setattr__
+        set_attr(self, "version", version)
+        set_attr(self, "config", config)
+        set_attr(self, "sections", {name: value for name, value in config.items() if isinstance(value, dict)})
+        set_attr(self, "index", index)
+        set_attr(self, "errors", tuple(errors))
+        set_attr(self, "_typed", {type_: {} for type_ in _CONVERTERS}) # Conversions memoized per snapshot
+
+    def __setattr__(self, name, value):
+        raise AttributeError("ConfigSnapshot is immutable")
+
+    @staticmethod
+    def _flatten(mapping: dict, prefix: str, index: dict):
+        for key, value in mapping.items():
+            path = f"{prefix}{key}"
+            index[path] = value
+            if isinstance(value, dict):
+                ConfigSnapshot._flatten(value, f"{path}.", index)
+
+    @staticmethod
+    def _validate(config: dict, schema: dict) -> tuple:
+        """Coerces schema'd values to their types, copying only the dicts on the changed paths."""
+        errors = []
+        for path, (type_, default) in schema.items():
+            *parents, key = path.split(".")
+            node = config
+            for parent in parents:
+                node = node.get(parent) if isinstance(node, dict) else None
+            if not isinstance(node, dict) or key not in node:
+                continue
+            value = node[key]
+            try:
+                coerced = _CONVERTERS[type_](value)
+            except (TypeError, ValueError):
+                errors.append(f"{path}: expected {type_.__name__}, got {value!r}; using default {default!r}")
+                coerced = default
+            if coerced is value or (type(coerced) is type(value) and coerced == value):
+                continue
+            config = dict(config)
+            node = config
+            for parent in parents:
+                node[parent] = dict(node[parent])
+                node = node[parent]
+            node[key] = coerced
+        return config, errors
+
+    def lookup(self, path: str, default=None):
+        value = self.index.get(path, _MISSING)
+        if value is _MISSING:
+            return CONFIG_SCHEMA[path][1] if default is None and path in CONFIG_SCHEMA else default
+        return value
+
+    def typed(self, type_, path: str, default=None):
+        cache = self._typed[type_]
+        value = cache.get(path, _MISSING)
+        if value is _MISSING:
+            raw = self.index.get(path, _MISSING)
+            try:
+                value = _MISSING if raw is _MISSING else _CONVERTERS[type_](raw)
+            except (TypeError, ValueError):
+                logger.warning("Configuration value %s=%r is not a valid %s; using the default.", path, raw, type_.__name__)
+                value = _MISSING
+            cache[path] = value
+        if value is _MISSING:
+            return CONFIG_SCHEMA[path][1] if default is None and path in CONFIG_SCHEMA else default
+        return value
+
+class ConfigView:
+    def __init__(self, snapshot: ConfigSnapshot, config_path: str = None):
         """
-        Initializes the ConfigManager.
+        Read-only access to one configuration snapshot. ConfigManager.with_overrides returns views
+        with per-task overrides applied; ConfigManager itself is a view of its latest snapshot.
         Args:
-            config_path (str, optional): Path to the configuration file.
-                                         Defaults to DEFAULT_CONFIG_PATH.
+            snapshot (ConfigSnapshot): The compiled configuration.
+            config_path (str, optional): File the base configuration was loaded from.
         """
-        self.config_path = config_path if config_path else DEFAULT_CONFIG_PATH
-        self.config = {}
-        self.load_config()
+        self._snapshot = snapshot
+        self.config_path = config_path
 
-    def load_config(self):
+    @property
+    def config(self) -> dict:
+        return self._snapshot.config
+
+    @property
+    def version(self) -> int:
+        return self._snapshot.version
+
+    def snapshot(self) -> ConfigSnapshot:
         """
-        Loads the configuration from the YAML file.
+        Returns the current compiled snapshot. Holding on to it gives a consistent view even
+        while the configuration is reloaded.
         """
-        try:
-            with open(self.config_path, 'r') as f:
-                self.config = yaml.safe_load(f)
-            if not self.config:
-                self.config = {}
-                logger.warning(f"Configuration file {self.config_path} is empty or invalid. Using empty config.")
-            else:
-                logger.info(f"Configuration loaded successfully from {self.config_path}")
-        except FileNotFoundError:
-            logger.error(f"Configuration file not found: {self.config_path}. Using empty config.")
-            self.config = {}
-        except yaml.YAMLError as e:
-            logger.error(f"Error parsing YAML configuration file {self.config_path}: {e}. Using empty config.")
-            self.config = {}
-        except Exception as e:
-            logger.error(f"An unexpected error occurred while loading config {self.config_path}: {e}. Using empty config.")
-            self.config = {}
+        return self._snapshot
 
     def get(self, section: str, key: str, default=None):
         """
@@ -50,11 +311,46 @@ class ConfigManager:
             section (str): The section name in the configuration.
             key (str): The key name within the section.
             default (any, optional): The default value to return if the key is not found.
+                                     If None, the built-in CONFIG_SCHEMA default is used.
 
         Returns:
             The configuration value or the default value.
         """
-        return self.config.get(section, {}).get(key, default)
+        section_values = self._snapshot.sections.get(section)
+        value = _MISSING if section_values is None else section_values.get(key, _MISSING)
+        if value is _MISSING:
+            if default is None:
+                schema = CONFIG_SCHEMA.get(f"{section}.{key}")
+                return None if schema is None else schema[1]
+            return default
+        return value
+
+    def lookup(self, path: str, default=None):
+        """
+        Retrieves a value by dotted path, e.g. "vulnerability_crawler.max_results_per_source".
+        Paths are precomputed when the configuration is loaded, so this is a single dict lookup.
+        Missing values return `default`, or the built-in CONFIG_SCHEMA default if None.
+        """
+        return self._snapshot.lookup(path, default)
+
+    def get_int(self, path: str, default: int = None) -> int:
+        """
+        Typed accessors: the value at a dotted path converted to the type (once per configuration
+        version). Missing or invalid values return `default`, or the CONFIG_SCHEMA default if None.
+        """
+        return self._snapshot.typed(int, path, default)
+
+    def get_float(self, path: str, default: float = None) -> float:
+        return self._snapshot.typed(float, path, default)
+
+    def get_bool(self, path: str, default: bool = None) -> bool:
+        return self._snapshot.typed(bool, path, default)
+
+    def get_str(self, path: str, default: str = None) -> str:
+        return self._snapshot.typed(str, path, default)
+
+    def get_list(self, path: str, default: list = None) -> list:
+        return self._snapshot.typed(list, path, default)
 
     def get_section(self, section: str) -> dict:
         """
@@ -66,7 +362,7 @@ class ConfigManager:
         Returns:
             A dictionary representing the section, or an empty dict if not found.
         """
-        return self.config.get(section, {})
+        return self._snapshot.sections.get(section, {})
 
     def get_all_config(self) -> dict:
         """
@@ -77,6 +373,224 @@ class ConfigManager:
         """
         return self.config
 
+class ConfigManager(ConfigView):
+    def __init__(self, config_path=None, binary_cache=True):
+        """
+        Initializes the ConfigManager.
+        Parsed YAML is cached in a binary file next to the configuration (see read_yaml_cached),
+        so short-lived processes loading an unchanged file skip YAML parsing.
+        Settings resolve through layers: built-in defaults (CONFIG_SCHEMA, used by get, lookup
+        and the typed accessors) -> YAML file -> ADVANCED_SECURITY__* environment variables -> per-task
+        overrides (with_overrides).
+        The configuration can be reloaded while the process runs (see reload/start_watching);
+        subscribers are notified of every new version.
+        Args:
+            config_path (str, optional): Path to the configuration file.
+                                         Defaults to DEFAULT_CONFIG_PATH.
+            binary_cache (bool, optional): Whether to use the binary parse cache.
+        """
+        self.config_path = config_path if config_path else DEFAULT_CONFIG_PATH
+        self.binary_cache = binary_cache
+        self._snapshot = ConfigSnapshot(0, {})
+        self._file_config = {}
+        self._views = collections.OrderedDict() # (version, overrides fingerprint) -> ConfigView, LRU
+        self._signature = None # (mtime_ns, size) of the file the current snapshot was read from
+        self._lock = threading.RLock()
+        self._subscribers = [] # (callback, sections)
+        self._watch_thread = None
+        self._watch_stop = threading.Event()
+        self.load_config()
+
+    def _file_signature(self):
+        try:
+            stat = os.stat(self.config_path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def load_config(self):
+        """
+        Loads the configuration from the YAML file.
+        """
+        with self._lock:
+            signature = self._file_signature()
+            config = {}
+            try:
+                config = read_yaml_cached(self.config_path, self.binary_cache)
+                if not config:
+                    config = {}
+                    logger.warning("Configuration file %s is empty or invalid. Using empty config.", self.config_path)
+                else:
+                    logger.info("Configuration loaded successfully from %s", self.config_path)
+            except FileNotFoundError:
+                logger.error("Configuration file not found: %s. Using empty config.", self.config_path)
+            except yaml.YAMLError as e:
+                logger.error("Error parsing YAML configuration file %s: %s. Using empty config.", self.config_path, e)
+            except Exception as e:
+                logger.error("An unexpected error occurred while loading config %s: %s. Using empty config.", self.config_path, e)
+            self._publish(config, signature)
+
+    def reload(self) -> bool:
+        """
+        Re-reads the configuration file if it changed on disk (modification time or size).
+        Unlike load_config, a file that cannot be read or parsed keeps the current configuration,
+        so a half-written edit never wipes the running config.
+
+        Returns:
+            True if a new configuration version was published.
+        """
+        with self._lock:
+            signature = self._file_signature()
+            if signature == self._signature:
+                return False
+            try:
+                config = read_yaml_cached(self.config_path, self.binary_cache) or {}
+                if not isinstance(config, dict):
+                    raise yaml.YAMLError(f"top-level value is a {type(config).__name__}, not a mapping")
+            except (OSError, yaml.YAMLError) as e:
+                logger.error("Could not reload configuration %s: %s. Keeping version %s.", self.config_path, e, self.version)
+                self._signature = signature # Retry only once the file changes again
+                return False
+            return self._publish(config, signature)
+
+    def update(self, section: str, key: str, value, persist: bool = True) -> int:
+        """
+        Sets a single configuration value and publishes it as a new version.
+
+        Args:
+            section (str): The section name in the configuration.
+            key (str): The key name within the section.
+            value (any): The new value.
+            persist (bool, optional): Also write the configuration back to the YAML file
+                                      (comments in the file are not preserved).
+
+        Returns:
+            The new configuration version.
+        """
+        with self._lock:
+            config = dict(self._file_config)
+            config[section] = dict(config.get(section) or {}, **{key: value})
+            signature = self._signature
+            if persist:
+                tmp_path = f"{self.config_path}.tmp"
+                with open(tmp_path, 'w') as f:
+                    yaml.safe_dump(config, f, default_flow_style=False, sort_keys=False)
+                os.replace(tmp_path, self.config_path)
+                signature = self._file_signature()
+            self._publish(config, signature)
+            return self.version
+
+    def _publish(self, file_config: dict, signature) -> bool:
+        self._signature = signature
+        self._file_config = file_config
+        environment = env_layer()
+        config = merge_config(file_config, environment) if environment else file_config
+        old = self._snapshot
+        if config == old.config and old.version > 0:
+            return False
+        self._snapshot = ConfigSnapshot(old.version + 1, config)
+        self._views.clear() # Views of older versions are never served again
+        for error in self._snapshot.errors:
+            logger.error("Invalid configuration value in %s: %s", self.config_path, error)
+        if old.version > 0:
+            logger.info("Configuration %s updated to version %s.", self.config_path, self._snapshot.version)
+        for callback, sections in list(self._subscribers):
+            if sections is not None and all(old.config.get(s) == config.get(s) for s in sections):
+                continue
+            try:
+                callback(old.config, config)
+            except Exception as e:
+                logger.error("Configuration subscriber %r failed: %s", callback, e, exc_info=True)
+        return True
+
+    def with_overrides(self, overrides: dict = None) -> ConfigView:
+        """
+        Returns a read-only view of the current configuration with per-task overrides applied on
+        top of the layers built-in defaults -> YAML file -> environment variables.
+
+        Views are memoized per configuration version and override fingerprint, so tasks sharing
+        the same overrides share one merged view. The merge itself copies only the overridden paths.
+
+        Args:
+            overrides (dict, optional): Nested ({"rl_agent": {"episodes": 10}}) or dotted
+                                        ({"rl_agent.episodes": 10}) override values.
+
+        Raises:
+            ValueError: If an override has the wrong type for a CONFIG_SCHEMA setting.
+        """
+        snapshot = self._snapshot
+        if not overrides:
+            return ConfigView(snapshot, self.config_path)
+        overrides = _nest_dotted(overrides)
+        fingerprint = json.dumps(overrides, sort_keys=True, default=repr, separators=(",", ":"))
+        cache_key = (snapshot.version, fingerprint)
+        with self._lock:
+            view = self._views.get(cache_key)
+            if view is not None:
+                self._views.move_to_end(cache_key)
+                return view
+        merged = ConfigSnapshot(snapshot.version, merge_config(snapshot.config, overrides))
+        new_errors = [error for error in merged.errors if error not in snapshot.errors]
+        if new_errors:
+            raise ValueError(f"Invalid configuration overrides: {'; '.join(new_errors)}")
+        view = ConfigView(merged, self.config_path)
+        with self._lock:
+            self._views[cache_key] = view
+            max_views = self.get_int("global.config_overrides_cache_size")
+            while len(self._views) > max_views:
+                self._views.popitem(last=False)
+        return view
+
+    def subscribe(self, callback, sections=None):
+        """
+        Registers a callback invoked as callback(old_config, new_config) whenever a new
+        configuration version is published. Callbacks run on the thread that published the
+        change (e.g. the watcher thread) and should return quickly.
+
+        Args:
+            callback (callable): The subscriber.
+            sections (iterable, optional): Only notify when one of these sections changed.
+
+        Returns:
+            The callback, for use with unsubscribe.
+        """
+        with self._lock:
+            self._subscribers.append((callback, tuple(sections) if sections is not None else None))
+        return callback
+
+    def unsubscribe(self, callback):
+        with self._lock:
+            self._subscribers = [(cb, sections) for cb, sections in self._subscribers if cb != callback]
+
+    def start_watching(self, interval: float = None):
+        """
+        Starts a daemon thread that polls the configuration file and reloads it on change.
+
+        Args:
+            interval (float, optional): Polling interval in seconds. Defaults to
+                                        `global.config_reload_interval` (2 seconds).
+        """
+        if self._watch_thread is not None:
+            return
+        interval = interval or self.get("global", "config_reload_interval")
+        self._watch_stop.clear()
+        self._watch_thread = threading.Thread(target=self._watch, args=(interval,), name="config-watcher", daemon=True)
+        self._watch_thread.start()
+
+    def stop_watching(self):
+        if self._watch_thread is None:
+            return
+        self._watch_stop.set()
+        self._watch_thread.join()
+        self._watch_thread = None
+
+    def _watch(self, interval: float):
+        while not self._watch_stop.wait(interval):
+            try:
+                self.reload()
+            except Exception as e:
+                logger.error("Configuration watcher error: %s", e, exc_info=True)
+
 if __name__ == '__main__':
     # Create a dummy config for testing
     dummy_config_content = """
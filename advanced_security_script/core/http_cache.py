@@ -0,0 +1,73 @@
+# advanced_security_script/core/http_cache.py
+
+import logging
+import hashlib
+import json
+from .step_cache import StepCache
+
+logger = logging.getLogger(__name__)
+
+class HttpCache:
+    def __init__(self, cache_dir: str, max_bytes: int = 64 * 1024 * 1024):
+        """
+        Initializes the HttpCache, an on-disk cache of HTTP responses used for conditional requests.
+        Responses carrying an ETag or Last-Modified validator are stored with their body; the next
+        request for the same URL sends If-None-Match / If-Modified-Since, and a 304 answer is served
+        from the cache. Entries never expire (the server revalidates them) and the least recently
+        used ones are evicted beyond max_bytes.
+        Args:
+            cache_dir (str): Directory holding the cache entries (created on first write).
+            max_bytes (int, optional): Size bound of the cache on disk.
+        """
+        self._store = StepCache(cache_dir, max_bytes=max_bytes, default_ttl=None)
+
+    @staticmethod
+    def make_key(url: str, params: dict = None) -> str:
+        payload = json.dumps([url, sorted((str(k), str(v)) for k, v in (params or {}).items())], separators=(",", ":"))
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def lookup(self, url: str, params: dict = None) -> dict:
+        """
+        Returns the cached entry for a request (keys: etag, last_modified, content_type, charset, body),
+        or None.
+        """
+        hit, entry = self._store.get(self.make_key(url, params))
+        return entry if hit else None
+
+    @staticmethod
+    def conditional_headers(entry: dict) -> dict:
+        """Returns the validator headers that turn a request for a cached entry into a conditional one."""
+        headers = {}
+        if entry is None:
+            return headers
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def store(self, url: str, params: dict, headers, content_type: str, charset: str, body: bytes) -> bool:
+        """
+        Caches a 200 response if it carries a validator and does not forbid storing.
+
+        Returns:
+            True if the response was cached.
+        """
+        etag, last_modified = headers.get("ETag"), headers.get("Last-Modified")
+        if not (etag or last_modified) or "no-store" in headers.get("Cache-Control", "").lower():
+            return False
+        self._store.set(self.make_key(url, params), {
+            "etag": etag, "last_modified": last_modified,
+            "content_type": content_type, "charset": charset, "body": bytes(body),
+        })
+        return True
+
+    def clear(self):
+        self._store.clear()
+
+    def __len__(self):
+        return len(self._store)
+
+    @property
+    def total_bytes(self) -> int:
+        return self._store.total_bytes
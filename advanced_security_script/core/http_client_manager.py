@@ -0,0 +1,69 @@
+# advanced_security_script/core/http_client_manager.py
+
+import logging
+import asyncio
+
+logger = logging.getLogger(__name__)
+
+class HttpClientManager:
+    def __init__(self, config):
+        """
+        Initializes the HttpClientManager.
+        Owns the aiohttp ClientSession shared by every HTTP-using module (vulnerability crawler,
+        NVD sync and future fetchers), so DNS lookups, TCP connections and TLS sessions are reused
+        across runs instead of being set up again for every crawl. The session is created on first
+        use and is bound to the event loop it was created on.
+        Args:
+            config: Configuration object (from ConfigManager); settings are read from the `http_client` section.
+        """
+        self.config = config
+        self._session = None
+        self._loop = None
+
+    def _connector_settings(self) -> dict:
+        get = self.config.get
+        return {
+            "limit": get("http_client", "max_connections"),
+            "limit_per_host": get("http_client", "max_connections_per_host"),
+            "keepalive_timeout": get("http_client", "keepalive_timeout"),
+            "ttl_dns_cache": get("http_client", "dns_cache_ttl"),
+        }
+
+    async def get_session(self):
+        """
+        Returns the shared session, creating it (and its connection pool) on first use.
+        Must be awaited on the event loop the session belongs to.
+
+        Raises:
+            RuntimeError: If the session is still open on another running event loop.
+        """
+        import aiohttp # Lazy import: only HTTP-using modules need aiohttp
+        loop = asyncio.get_running_loop()
+        if self._session is not None and not self._session.closed:
+            if self._loop is loop:
+                return self._session
+            if not self._loop.is_closed():
+                raise RuntimeError("The shared HTTP session is bound to another event loop.")
+            # The owning loop is gone and its connections with it; start over on this loop.
+            logger.debug("Discarding HTTP session of a closed event loop.")
+        settings = self._connector_settings()
+        connector = aiohttp.TCPConnector(use_dns_cache=True, **settings)
+        timeout = aiohttp.ClientTimeout(total=self.config.get("http_client", "total_timeout"))
+        self._session = aiohttp.ClientSession(
+            connector=connector, timeout=timeout,
+            headers={"User-Agent": self.config.get("http_client", "user_agent")},
+        )
+        self._loop = loop
+        logger.info("Opened shared HTTP session (limit=%s, limit_per_host=%s, keepalive=%ss, dns_ttl=%ss).",
+                    settings["limit"], settings["limit_per_host"], settings["keepalive_timeout"], settings["ttl_dns_cache"])
+        return self._session
+
+    async def close(self):
+        """
+        Closes the shared session and its pooled connections. Must be awaited on the session's
+        event loop; the next get_session call opens a new session.
+        """
+        session, self._session, self._loop = self._session, None, None
+        if session is not None and not session.closed:
+            await session.close()
+            logger.info("Closed shared HTTP session.")
@@ -2,16 +2,197 @@
 
 import logging
 import logging.config
+import logging.handlers
+import atexit
+import copy
 import os
 import json
+import queue
+import socket
+import time
+
+try:
+    import orjson # Optional: considerably faster JSON serialization
+except ImportError:
+    orjson = None
 
 # Assuming ConfigManager is in the same core directory or accessible via path
 # from .config_manager import ConfigManager # If ConfigManager is in the same directory
 
+LOG_QUEUE_OVERFLOW_POLICIES = ("block", "drop_debug", "drop_oldest")
+
+class StructuredMessage:
+    """
+    A log message with key/value fields, rendered only if a handler actually emits the record:
+
+        logger.debug(StructuredMessage("Fetching data", source=source_name, url=url))
+
+    Text formatters render "Fetching data source=NVD url=..."; FastJsonFormatter emits the
+    fields as top-level JSON keys. Like %-style arguments, nothing is formatted when the level
+    is disabled.
+    """
+    __slots__ = ("message", "args", "fields")
+
+    def __init__(self, message: str, *args, **fields):
+        self.message = message
+        self.args = args
+        self.fields = fields
+
+    def text(self) -> str:
+        return self.message % self.args if self.args else self.message
+
+    def __str__(self):
+        if not self.fields:
+            return self.text()
+        return f"{self.text()} " + " ".join(f"{key}={value}" for key, value in self.fields.items())
+
+DEFAULT_JSON_FIELDS = ("asctime", "name", "levelname", "module", "funcName", "lineno", "message")
+
+# Attributes every LogRecord has; anything else on a record was passed through `extra`.
+_RESERVED_RECORD_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+class FastJsonFormatter(logging.Formatter):
+    def __init__(self, fields=DEFAULT_JSON_FIELDS, service: str = None, datefmt: str = None):
+        """
+        Built-in JSON log formatter: one JSON object per record, with the configured fields, the
+        static host/pid/service fields and any `extra` fields. Serializes with orjson when it is
+        installed.
+        Args:
+            fields (iterable, optional): LogRecord attributes to emit, in order. "asctime" and
+                                         "message" are computed; other names are read from the record.
+            service (str, optional): Service name added to every record (omitted if None).
+            datefmt (str, optional): strftime format of "asctime" (logging's default format if None).
+        """
+        super().__init__(datefmt=datefmt)
+        self.fields = tuple(fields)
+        self._plain_fields = tuple(f for f in self.fields if f not in ("asctime", "message"))
+        self._with_asctime = "asctime" in self.fields
+        self._with_message = "message" in self.fields
+        # Static fields are computed once per formatter.
+        self._static = {"host": socket.gethostname(), "pid": os.getpid()}
+        if service:
+            self._static["service"] = service
+        self._time_cache = (None, "") # (second, formatted date prefix)
+
+    def formatTime(self, record, datefmt=None):
+        if datefmt:
+            return super().formatTime(record, datefmt)
+        # The date part only changes once a second; reuse it for all records within that second.
+        second = int(record.created)
+        cached_second, prefix = self._time_cache
+        if second != cached_second:
+            prefix = time.strftime("%Y-%m-%d %H:%M:%S", self.converter(second))
+            self._time_cache = (second, prefix)
+        return f"{prefix},{int(record.msecs):03d}"
+
+    def format(self, record) -> str:
+        record_dict = record.__dict__
+        payload = {}
+        if self._with_asctime:
+            payload["asctime"] = self.formatTime(record, self.datefmt)
+        for field in self._plain_fields:
+            payload[field] = record_dict.get(field)
+        msg = record.msg
+        structured = isinstance(msg, StructuredMessage) and not record.args
+        if self._with_message:
+            payload["message"] = msg.text() if structured else record.getMessage()
+        payload.update(self._static)
+        if structured:
+            for key, value in msg.fields.items():
+                payload.setdefault(key, value)
+        for key, value in record_dict.items():
+            if key not in _RESERVED_RECORD_ATTRS:
+                payload[key] = value
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = self.formatException(record.exc_info)
+            payload["exc_info"] = record.exc_text
+        elif record.exc_text:
+            payload["exc_info"] = record.exc_text
+        if record.stack_info:
+            payload["stack_info"] = self.formatStack(record.stack_info)
+        return _dumps(payload)
+
+def _dumps(payload: dict) -> str:
+    if orjson is not None:
+        try:
+            return orjson.dumps(payload, default=str).decode("utf-8")
+        except TypeError: # e.g. non-string keys or integers beyond 64 bits in extra fields
+            pass
+    return json.dumps(payload, default=str, ensure_ascii=False)
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    def __init__(self, log_queue: queue.Queue, overflow: str = "block"):
+        """
+        QueueHandler for a bounded queue, with a policy for records arriving while the queue is full.
+        Args:
+            log_queue (queue.Queue): Bounded queue drained by a QueueListener.
+            overflow (str, optional): "block" waits for free space, "drop_debug" discards DEBUG records
+                                      (and blocks for others), "drop_oldest" discards the oldest queued record.
+        """
+        if overflow not in LOG_QUEUE_OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown log queue overflow policy '{overflow}'. Allowed: {', '.join(LOG_QUEUE_OVERFLOW_POLICIES)}.")
+        super().__init__(log_queue)
+        self.overflow = overflow
+        self.dropped = 0 # Records discarded because the queue was full
+
+    def prepare(self, record):
+        # The queue never leaves the process, so the record does not need to be picklable.
+        # Only the message is rendered here (capturing mutable arguments as they were at the call site);
+        # exceptions are formatted by the real handlers on the listener thread.
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        if isinstance(record.msg, StructuredMessage) and not record.args:
+            # Keep the fields for FastJsonFormatter; the text is rendered now.
+            record.msg = StructuredMessage(record.msg.text(), **dict(record.msg.fields))
+        else:
+            record.msg = record.message
+        record.args = None
+        return record
+
+    def enqueue(self, record):
+        if self.overflow == "block":
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+            return
+        except queue.Full:
+            pass
+        if self.overflow == "drop_debug":
+            if record.levelno <= logging.DEBUG:
+                self.dropped += 1
+            else:
+                self.queue.put(record)
+            return
+        while True: # drop_oldest
+            try:
+                self.queue.get_nowait()
+                self.dropped += 1
+            except queue.Empty:
+                pass
+            try:
+                self.queue.put_nowait(record)
+                return
+            except queue.Full:
+                continue
+
+class _QueueListener(logging.handlers.QueueListener):
+    def enqueue_sentinel(self):
+        # The stdlib uses put_nowait, which fails when the bounded queue is full.
+        self.queue.put(self._sentinel)
+
 class LoggerManager:
+    # Logging is process-wide, so the queue listener of the async mode is shared by all instances.
+    _queue_handler = None
+    _queue_listener = None
+
     def __init__(self, config_manager=None, default_log_level="INFO"):
         """
         Initializes the LoggerManager.
+        When `global.async_logging` is enabled, log calls only enqueue the record on a bounded queue;
+        a background QueueListener thread performs the console and file I/O.
+        Changes of `global.log_level` published by the ConfigManager are applied without reconfiguring.
         Args:
             config_manager (ConfigManager, optional): Instance of ConfigManager to get logging settings.
             default_log_level (str, optional): Default log level if not found in config.
@@ -19,6 +200,36 @@ class LoggerManager:
         self.config_manager = config_manager
         self.default_log_level = default_log_level
         self._setup_logging()
+        if hasattr(config_manager, "subscribe"):
+            config_manager.subscribe(self._on_config_change, sections=("global",))
+
+    def close(self):
+        """
+        Stops following configuration changes. Logging itself stays configured, since it is process-wide.
+        """
+        if hasattr(self.config_manager, "unsubscribe"):
+            self.config_manager.unsubscribe(self._on_config_change)
+
+    def _on_config_change(self, old_config: dict, new_config: dict):
+        old_level = (old_config.get("global") or {}).get("log_level", self.default_log_level)
+        new_level = (new_config.get("global") or {}).get("log_level", self.default_log_level)
+        if str(new_level).upper() != str(old_level).upper():
+            self.set_level(new_level)
+
+    @staticmethod
+    def set_level(level):
+        """
+        Changes the level of the root logger and of its handlers (behind the queue listener too).
+        """
+        level = logging.getLevelName(str(level).upper()) if isinstance(level, str) else level
+        root = logging.getLogger()
+        handlers = list(root.handlers)
+        if LoggerManager._queue_listener is not None:
+            handlers += list(LoggerManager._queue_listener.handlers)
+        for handler in handlers:
+            handler.setLevel(level)
+        root.setLevel(level)
+        logging.info("Log level set to %s.", logging.getLevelName(level))
 
     def _get_log_config(self):
         """
@@ -28,12 +239,16 @@ class LoggerManager:
         log_file_path = "./logs/script.log" # Default log file path
         log_format = "%(asctime)s - %(name)s - %(levelname)s - %(module)s - %(funcName)s - %(lineno)d - %(message)s"
         json_log_format = False
+        json_log_fields = DEFAULT_JSON_FIELDS
+        service_name = "advanced_security_script"
 
         if self.config_manager:
             log_level = self.config_manager.get("global", "log_level", self.default_log_level)
-            log_file_path = self.config_manager.get("global", "log_file_path", "./logs/script.log")
+            log_file_path = self.config_manager.get("global", "log_file_path")
             log_format_config = self.config_manager.get("global", "log_format", log_format)
-            json_log_format = self.config_manager.get("global", "json_log_format", False)
+            json_log_format = self.config_manager.get("global", "json_log_format")
+            json_log_fields = self.config_manager.get("global", "json_log_fields", DEFAULT_JSON_FIELDS)
+            service_name = self.config_manager.get("global", "log_service_name", service_name)
         else:
             log_format_config = log_format
 
@@ -71,8 +286,9 @@ class LoggerManager:
             "formatters": {
                 "standard": {"format": log_format_config},
                 "json": {
-                    "()": "pythonjsonlogger.jsonlogger.JsonFormatter",
-                    "format": "%(asctime)s %(name)s %(levelname)s %(module)s %(funcName)s %(lineno)d %(message)s"
+                    "()": FastJsonFormatter,
+                    "fields": json_log_fields,
+                    "service": service_name,
                 }
             },
             "handlers": {
@@ -111,14 +327,62 @@ class LoggerManager:
         """
         Applies the logging configuration.
         """
+        # Drain queued records into the current handlers before dictConfig closes them.
+        LoggerManager.shutdown()
         try:
             log_config = self._get_log_config()
             logging.config.dictConfig(log_config)
+            if self.config_manager and self.config_manager.get("global", "async_logging"):
+                self._start_queue_listener()
             logging.info("LoggerManager initialized and logging configured.")
         except Exception as e:
             # Fallback to basic config if dictConfig fails
             logging.basicConfig(level=self.default_log_level.upper())
-            logging.error(f"Error setting up logging with dictConfig: {e}. Fell back to basicConfig.", exc_info=True)
+            logging.error("Error setting up logging with dictConfig: %s. Fell back to basicConfig.", e, exc_info=True)
+
+    def _start_queue_listener(self):
+        """
+        Moves the root handlers behind a QueueHandler/QueueListener pair.
+        """
+        queue_size = int(self.config_manager.get("global", "log_queue_size"))
+        overflow = self.config_manager.get("global", "log_queue_overflow")
+        root = logging.getLogger()
+        handlers = list(root.handlers)
+        log_queue = queue.Queue(maxsize=max(1, queue_size))
+        queue_handler = BoundedQueueHandler(log_queue, overflow)
+        listener = _QueueListener(log_queue, *handlers, respect_handler_level=True)
+        for handler in handlers:
+            root.removeHandler(handler)
+        root.addHandler(queue_handler)
+        listener.start()
+        LoggerManager._queue_handler = queue_handler
+        LoggerManager._queue_listener = listener
+
+    @staticmethod
+    def shutdown():
+        """
+        Stops the async logging listener, if any, after it has written every queued record, and
+        attaches its handlers back to the root logger so logging continues synchronously.
+        Registered with atexit.
+        """
+        queue_handler, listener = LoggerManager._queue_handler, LoggerManager._queue_listener
+        if listener is None:
+            return
+        LoggerManager._queue_handler = LoggerManager._queue_listener = None
+        root = logging.getLogger()
+        root.removeHandler(queue_handler)
+        listener.stop()
+        for handler in listener.handlers:
+            root.addHandler(handler)
+        if queue_handler.dropped:
+            logging.warning("Async logging dropped %s record(s) because the log queue was full.", queue_handler.dropped)
+
+    @staticmethod
+    def dropped_records() -> int:
+        """
+        Number of records discarded by the async logging overflow policy since it was configured.
+        """
+        return LoggerManager._queue_handler.dropped if LoggerManager._queue_handler else 0
 
     @staticmethod
     def get_logger(name):
@@ -131,6 +395,8 @@ class LoggerManager:
         """
         return logging.getLogger(name)
 
+atexit.register(LoggerManager.shutdown)
+
 if __name__ == '__main__':
     # This test requires ConfigManager to be available or mocked
     # For standalone testing, we can mock ConfigManager
@@ -184,5 +450,5 @@ if __name__ == '__main__':
     std_logger.warning("This is a WARNING from Standard logger.")
 
     print("\nCheck ./logs/test_script_json.log and ./logs/test_script_std.log for output.")
-    print("You might need to install python-json-logger: pip install python-json-logger")
+    print("Install orjson for faster JSON log serialization: pip install orjson")
 
@@ -0,0 +1,26 @@
+# advanced_security_script/core/process_pool.py
+
+import logging
+import concurrent.futures
+import multiprocessing
+
+logger = logging.getLogger(__name__)
+
+# Worker processes are spawned, never forked: the parent runs an event loop and thread pools,
+# which a forked child would inherit in an inconsistent state. Queues and other synchronization
+# primitives shared with the workers must come from this context too.
+SPAWN_CONTEXT = multiprocessing.get_context("spawn")
+
+def spawn_process_pool(max_workers: int, initializer=None, initargs: tuple = ()) -> concurrent.futures.ProcessPoolExecutor:
+    """
+    Creates a process pool whose workers are started with the "spawn" method.
+
+    Args:
+        max_workers (int): Number of worker processes.
+        initializer (callable, optional): Called once in every worker process with initargs.
+        initargs (tuple, optional): Arguments of the initializer; a SPAWN_CONTEXT.Queue can be handed
+                                    to the workers this way.
+    """
+    logger.debug("Creating a pool of %s spawned worker process(es).", max_workers)
+    return concurrent.futures.ProcessPoolExecutor(max_workers=max_workers, mp_context=SPAWN_CONTEXT,
+                                                  initializer=initializer, initargs=initargs)
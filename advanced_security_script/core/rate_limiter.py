@@ -0,0 +1,188 @@
+# advanced_security_script/core/rate_limiter.py
+
+import logging
+import asyncio
+import contextlib
+import datetime
+import email.utils
+import random
+import time
+from .logger_manager import StructuredMessage
+
+logger = logging.getLogger(__name__)
+
+def parse_retry_after(value) -> float:
+    """
+    Parses a Retry-After header (delay in seconds or an HTTP date).
+
+    Returns:
+        The delay in seconds (never negative), or None if the header is missing or malformed.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=datetime.timezone.utc)
+    return max(0.0, (retry_at - datetime.datetime.now(datetime.timezone.utc)).total_seconds())
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: int = 1, clock=time.monotonic):
+        """
+        Initializes the TokenBucket.
+        Allows bursts of up to `burst` requests, then `rate` requests per second. Tokens are
+        reserved in arrival order, so waiting callers are served first come, first served.
+        Args:
+            rate (float): Sustained requests per second (None or 0 for no limit).
+            burst (int, optional): Bucket capacity.
+            clock (callable, optional): Monotonic time source in seconds.
+        """
+        self.rate = rate
+        self.burst = max(1, int(burst))
+        self.clock = clock
+        self._tokens = float(self.burst)
+        self._updated = clock() # Time the token count refers to; in the future while paused
+
+    def reserve(self) -> float:
+        """
+        Takes a token, borrowing against future refills if the bucket is empty.
+
+        Returns:
+            The number of seconds the caller must wait before using the token.
+        """
+        if not self.rate:
+            return 0.0
+        now = self.clock()
+        if now > self._updated:
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+        self._tokens -= 1
+        return (self._updated - now) + max(0.0, -self._tokens) / self.rate
+
+    async def acquire(self):
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def pause(self, seconds: float):
+        """
+        Stops handing out tokens for `seconds` (e.g. a server's Retry-After), then resumes at
+        the sustained rate rather than with a full burst.
+        """
+        if not self.rate:
+            return
+        resume_at = self.clock() + seconds
+        if resume_at > self._updated:
+            self._tokens = min(self._tokens, 0.0)
+            self._updated = resume_at
+
+class AdaptiveConcurrencyLimiter:
+    def __init__(self, initial: int, minimum: int = 1, maximum: int = None, decrease_factor: float = 0.5,
+                 decrease_interval: float = 1.0, clock=time.monotonic):
+        """
+        Initializes the AdaptiveConcurrencyLimiter.
+        Bounds the number of concurrent requests with an AIMD limit: every success raises the
+        limit by 1/limit (about +1 per round of requests), every throttling response multiplies
+        it by decrease_factor.
+        Args:
+            initial (int): Starting limit.
+            minimum (int, optional): Lower bound of the limit.
+            maximum (int, optional): Upper bound of the limit (defaults to initial).
+            decrease_factor (float, optional): Multiplicative decrease on throttling.
+            decrease_interval (float, optional): Seconds during which further throttling responses
+                                                 (from requests already in flight) do not shrink the limit again.
+            clock (callable, optional): Monotonic time source in seconds.
+        """
+        self.minimum = max(1, int(minimum))
+        self.maximum = max(self.minimum, int(maximum if maximum is not None else initial))
+        self.limit = float(min(max(int(initial), self.minimum), self.maximum))
+        self.decrease_factor = decrease_factor
+        self.decrease_interval = decrease_interval
+        self.clock = clock
+        self._last_decrease = None
+        self._in_flight = 0
+        self._condition = asyncio.Condition()
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    async def __aenter__(self):
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._in_flight < int(self.limit))
+            self._in_flight += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        async with self._condition:
+            self._in_flight -= 1
+            self._condition.notify_all()
+
+    def record_success(self):
+        self.limit = min(self.maximum, self.limit + 1 / self.limit)
+
+    def record_throttled(self):
+        now = self.clock()
+        if self._last_decrease is not None and now - self._last_decrease < self.decrease_interval:
+            return
+        self._last_decrease = now
+        self.limit = max(self.minimum, self.limit * self.decrease_factor)
+
+class SourceThrottle:
+    def __init__(self, name: str, requests_per_second: float = None, burst: int = 1, max_concurrency: int = 4,
+                 max_retries: int = 4, backoff_base: float = 1.0, backoff_max: float = 60.0,
+                 retry_statuses=(429, 500, 502, 503, 504), throttle_statuses=(429, 503)):
+        """
+        Initializes the SourceThrottle: the request budget of one upstream source.
+        Combines a TokenBucket (request rate), an AdaptiveConcurrencyLimiter (requests in flight)
+        and the retry policy (exponential backoff with full jitter).
+        Args:
+            name (str): Source name, used in logs.
+            requests_per_second (float, optional): Sustained request rate (None for no limit).
+            burst (int, optional): Requests allowed back to back before the rate applies.
+            max_concurrency (int, optional): Upper bound of concurrent requests.
+            max_retries (int, optional): Retries after the first attempt.
+            backoff_base (float, optional): Backoff ceiling of the first retry in seconds; doubles per retry.
+            backoff_max (float, optional): Upper bound of the backoff ceiling.
+            retry_statuses (iterable, optional): HTTP statuses worth retrying.
+            throttle_statuses (iterable, optional): HTTP statuses signalling a quota breach; they
+                                                    also shrink the concurrency limit and honor Retry-After.
+        """
+        self.name = name
+        self.bucket = TokenBucket(requests_per_second, burst)
+        self.concurrency = AdaptiveConcurrencyLimiter(max_concurrency)
+        self.max_retries = max(0, int(max_retries))
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.throttle_statuses = frozenset(throttle_statuses)
+        self.retry_statuses = frozenset(retry_statuses) | self.throttle_statuses
+
+    @contextlib.asynccontextmanager
+    async def slot(self):
+        """Waits for a concurrency slot and a rate token, and holds the slot for the request."""
+        async with self.concurrency:
+            await self.bucket.acquire()
+            yield
+
+    def backoff_delay(self, attempt: int, retry_after: float = None) -> float:
+        """
+        Returns the delay before retry number attempt + 1: a random delay up to
+        backoff_base * 2**attempt (capped at backoff_max), or the server's Retry-After when longer.
+        """
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+        return max(delay, retry_after or 0.0)
+
+    def record_success(self):
+        self.concurrency.record_success()
+
+    def record_throttled(self, retry_after: float = None):
+        self.concurrency.record_throttled()
+        if retry_after:
+            self.bucket.pause(retry_after)
+        logger.warning(StructuredMessage("Source is throttling requests", source=self.name,
+                                         concurrency_limit=round(self.concurrency.limit, 1), retry_after=retry_after))
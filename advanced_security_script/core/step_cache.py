@@ -0,0 +1,136 @@
+# advanced_security_script/core/step_cache.py
+
+import logging
+import collections
+import hashlib
+import json
+import os
+import pickle
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+def _canonical(value):
+    """JSON fallback for values without a native JSON form (sets, datetimes, custom objects)."""
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=repr)
+    return repr(value)
+
+class StepCache:
+    def __init__(self, cache_dir: str, max_bytes: int = 256 * 1024 * 1024, default_ttl: float = 24 * 3600):
+        """
+        Initializes the StepCache, a content-addressed on-disk cache of workflow step outputs.
+        Entries expire after a TTL and the least recently used entries are evicted once the
+        cache grows beyond max_bytes.
+        Args:
+            cache_dir (str): Directory holding the cache entries (created on first write).
+            max_bytes (int, optional): Size bound of the cache on disk.
+            default_ttl (float, optional): Default entry lifetime in seconds (None for no expiry).
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self._lock = threading.Lock()
+        self._entries = collections.OrderedDict() # key -> size in bytes, least recently used first
+        self._total_bytes = 0
+        self._load_index()
+
+    @staticmethod
+    def make_key(step_name: str, version: str, inputs: dict, context: dict, config_section: dict = None) -> str:
+        """
+        Computes the content address of a step execution: a SHA-256 over the step identity and
+        version, its inputs, the task context and the relevant config section.
+        """
+        payload = json.dumps(
+            {"step": step_name, "version": version, "inputs": inputs, "context": context, "config": config_section or {}},
+            sort_keys=True, default=_canonical, separators=(",", ":"),
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.pkl")
+
+    def _load_index(self):
+        """Rebuilds the LRU index from the entries on disk, oldest modification time first."""
+        if not os.path.isdir(self.cache_dir):
+            return
+        found = []
+        for root, _, files in os.walk(self.cache_dir):
+            for filename in files:
+                if filename.endswith(".pkl"):
+                    stat = os.stat(os.path.join(root, filename))
+                    found.append((stat.st_mtime, filename[:-4], stat.st_size))
+        for _, key, size in sorted(found):
+            self._entries[key] = size
+            self._total_bytes += size
+
+    def get(self, key: str) -> tuple:
+        """
+        Looks up an entry.
+
+        Returns:
+            A tuple (hit, value); value is None on a miss.
+        """
+        with self._lock:
+            if key not in self._entries:
+                return False, None
+            path = self._path(key)
+            try:
+                with open(path, "rb") as f:
+                    expires_at, value = pickle.load(f)
+            except (OSError, pickle.UnpicklingError, EOFError, ValueError) as e:
+                logger.warning("Dropping unreadable step cache entry %s: %s", key, e)
+                self._remove(key)
+                return False, None
+            if expires_at is not None and expires_at < time.time():
+                self._remove(key)
+                return False, None
+            self._entries.move_to_end(key)
+            os.utime(path) # Persist recency so the LRU order survives restarts
+            return True, value
+
+    def set(self, key: str, value, ttl: float = None):
+        """
+        Stores an entry, evicting least recently used entries if the size bound is exceeded.
+        Values that cannot be pickled are not cached.
+        """
+        ttl = self.default_ttl if ttl is None else ttl
+        expires_at = time.time() + ttl if ttl else None
+        try:
+            data = pickle.dumps((expires_at, value), protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError) as e:
+            logger.warning("Step output for cache key %s is not picklable; not caching: %s", key, e)
+            return
+        path = self._path(key)
+        with self._lock:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+            if key in self._entries:
+                self._total_bytes -= self._entries.pop(key)
+            self._entries[key] = len(data)
+            self._total_bytes += len(data)
+            while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: str):
+        self._total_bytes -= self._entries.pop(key, 0)
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def clear(self):
+        with self._lock:
+            for key in list(self._entries):
+                self._remove(key)
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
@@ -0,0 +1,263 @@
+# advanced_security_script/core/task_executor.py
+
+import logging
+import asyncio
+import concurrent.futures
+import datetime
+import itertools
+import threading
+from .logger_manager import StructuredMessage
+from .process_pool import spawn_process_pool
+
+logger = logging.getLogger(__name__)
+
+# Per-process orchestrator used by the process pool (built once by the pool initializer).
+_process_orchestrator = None
+
+def _init_worker_process(config_path):
+    """
+    Process pool initializer: builds a WorkflowOrchestrator once per worker process.
+    """
+    global _process_orchestrator
+    from .workflow_orchestrator import WorkflowOrchestrator
+    _process_orchestrator = WorkflowOrchestrator(config_path=config_path)
+
+def _run_workflow_in_process(task_config: dict) -> dict:
+    _process_orchestrator.config_manager.reload() # Pick up config edits (a stat call if unchanged)
+    return _process_orchestrator.run_workflow(task_config)
+
+def _now() -> str:
+    return datetime.datetime.now().isoformat()
+
+class TaskExecutor:
+    def __init__(self, config_manager, orchestrator_factory=None):
+        """
+        Initializes the TaskExecutor.
+        Runs submitted tasks through the WorkflowOrchestrator on background workers, so task
+        execution never blocks the caller's event loop.
+
+        Tasks wait in a bounded asyncio queue and are consumed by `global.max_threads` workers.
+        Workflows run on a thread pool, except those whose task name is listed in
+        `task_executor.cpu_bound_modules` (none by default), which run on a process pool. Changes of `global.max_threads`
+        published by a hot-reloading ConfigManager resize the worker pool while tasks keep running.
+        Args:
+            config_manager (ConfigManager): Source of executor settings and of the config path
+                                            handed to worker processes.
+            orchestrator_factory (callable, optional): Builds the orchestrator used by thread workers.
+                                                       Defaults to WorkflowOrchestrator on the same config.
+        """
+        self.config_manager = config_manager
+        self.orchestrator_factory = orchestrator_factory
+        self.max_workers = max(1, int(config_manager.get("global", "max_threads")))
+        self.queue_size = max(1, int(config_manager.get("task_executor", "queue_size")))
+        self.cpu_bound_modules = set(config_manager.get("task_executor", "cpu_bound_modules"))
+        self.process_workers = max(1, int(config_manager.get("task_executor", "process_workers")))
+        self.resume_on_start = config_manager.get("task_executor", "resume_on_start")
+
+        self._queue = None
+        self._loop = None
+        self._workers = set()
+        self._busy = set() # Workers currently executing a task
+        self._retiring = 0 # Busy workers that exit after their current task (pool shrink)
+        self._worker_ids = itertools.count()
+        self._thread_pool = None
+        self._process_pool = None
+        self._orchestrator = None
+        self._orchestrator_lock = threading.Lock()
+        self._pending = {} # task_id -> status callback, for tasks still waiting in the queue
+
+    @property
+    def running(self) -> bool:
+        return bool(self._workers)
+
+    async def start(self):
+        """
+        Creates the queue, the thread pool and the worker coroutines on the running event loop.
+        """
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._thread_pool = concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="task-worker")
+        self._add_workers(self.max_workers)
+        if hasattr(self.config_manager, "subscribe"):
+            self.config_manager.subscribe(self._on_config_change, sections=("global",))
+        logger.info("TaskExecutor started with %s workers (queue size %s).", self.max_workers, self.queue_size)
+        if self.resume_on_start:
+            # Workflows interrupted by the previous shutdown continue in the background.
+            asyncio.get_running_loop().run_in_executor(self._thread_pool, self._resume_incomplete_workflows)
+
+    def _resume_incomplete_workflows(self):
+        try:
+            resume = getattr(self._get_orchestrator(), "resume_incomplete_workflows", None)
+            if resume is not None:
+                results = resume()
+                if results:
+                    logger.info("Resumed %s interrupted workflow run(s): %s", len(results), sorted(results))
+        except Exception as e:
+            logger.error("Resuming interrupted workflows failed: %s", e, exc_info=True)
+
+    def _add_workers(self, count: int):
+        for _ in range(count):
+            worker_id = next(self._worker_ids)
+            worker = asyncio.create_task(self._worker(worker_id), name=f"task-worker-{worker_id}")
+            self._workers.add(worker)
+            worker.add_done_callback(self._workers.discard)
+
+    def _on_config_change(self, old_config: dict, new_config: dict):
+        # Runs on the thread that published the config; the resize happens on the event loop.
+        max_workers = max(1, int((new_config.get("global") or {}).get("max_threads", 4)))
+        if max_workers != self.max_workers and self._loop is not None:
+            self._loop.call_soon_threadsafe(self.resize, max_workers)
+
+    def resize(self, max_workers: int):
+        """
+        Changes the number of concurrent workers. Running tasks are never interrupted: when
+        shrinking, idle workers stop immediately and busy ones once their task is done.
+        Must be called on the executor's event loop.
+        """
+        if not self.running or max_workers == self.max_workers:
+            return
+        logger.info("Resizing TaskExecutor from %s to %s workers.", self.max_workers, max_workers)
+        self.max_workers = max_workers
+        # Tasks already on the old pool finish there; new tasks use a pool of the new size.
+        old_pool = self._thread_pool
+        self._thread_pool = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="task-worker")
+        old_pool.shutdown(wait=False)
+        surplus = len(self._workers) - self._retiring - max_workers
+        if surplus < 0:
+            revived = min(self._retiring, -surplus)
+            self._retiring -= revived
+            self._add_workers(-surplus - revived)
+            return
+        for worker in list(self._workers - self._busy)[:surplus]:
+            self._workers.discard(worker)
+            worker.cancel()
+            surplus -= 1
+        self._retiring += surplus
+
+    async def shutdown(self):
+        """
+        Stops the workers. Tasks still waiting in the queue are marked as failed; tasks already
+        running on a pool are left to finish in the background, after which the orchestrator's
+        shared resources (HTTP connection pool, event loop) are released.
+        """
+        if not self.running:
+            return
+        if hasattr(self.config_manager, "unsubscribe"):
+            self.config_manager.unsubscribe(self._on_config_change)
+        workers = list(self._workers)
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        self._workers.clear()
+        self._busy.clear()
+        self._retiring = 0
+        for task_id, on_status in list(self._pending.items()):
+            self._notify(on_status, task_id, "failed", completed_at=_now(), result_summary="Cancelled: task executor shut down.")
+        self._pending.clear()
+        self._thread_pool.shutdown(wait=False, cancel_futures=True)
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=False, cancel_futures=True)
+            self._process_pool = None
+        with self._orchestrator_lock:
+            orchestrator, self._orchestrator = self._orchestrator, None
+        if hasattr(orchestrator, "close"):
+            # Closes the shared HTTP session once the workflows still running have finished;
+            # not a daemon thread, so the interpreter waits for it at exit.
+            threading.Thread(target=orchestrator.close, name="orchestrator-close").start()
+        logger.info("TaskExecutor shut down.")
+
+    def submit(self, task_id: str, task_config: dict, on_status=None):
+        """
+        Queues a task for execution without waiting for it to run.
+
+        Args:
+            task_id: Identifier reported back through on_status.
+            task_config: Task definition passed to WorkflowOrchestrator.run_workflow
+                         (must contain "task_name"; optional "config_overrides" are layered
+                         on top of the shared configuration for this task only).
+            on_status: Optional callable(task_id, status, **fields) invoked on every status
+                       transition (pending, running, completed, failed) with ISO timestamps.
+
+        Raises:
+            RuntimeError: If the executor has not been started.
+            asyncio.QueueFull: If the queue is at capacity.
+            ValueError: If the task's config_overrides are invalid.
+        """
+        if not self.running:
+            raise RuntimeError("TaskExecutor is not running.")
+        if task_config.get("config_overrides") and hasattr(self.config_manager, "with_overrides"):
+            # Validates the overrides up front and warms the memoized view the workflow will use.
+            self.config_manager.with_overrides(task_config["config_overrides"])
+        self._queue.put_nowait((task_id, task_config, on_status))
+        self._pending[task_id] = on_status
+        self._notify(on_status, task_id, "pending")
+        logger.debug(StructuredMessage("Task queued", task_id=task_id, queued=self._queue.qsize(), queue_size=self.queue_size))
+
+    @staticmethod
+    def _notify(on_status, task_id, status, **fields):
+        if on_status is None:
+            return
+        try:
+            on_status(task_id, status, **fields)
+        except Exception as e:
+            logger.error("Status callback failed for task %s: %s", task_id, e, exc_info=True)
+
+    def _get_orchestrator(self):
+        with self._orchestrator_lock:
+            if self._orchestrator is None:
+                if self.orchestrator_factory is not None:
+                    self._orchestrator = self.orchestrator_factory()
+                else:
+                    from .workflow_orchestrator import WorkflowOrchestrator
+                    self._orchestrator = WorkflowOrchestrator(config_manager=self.config_manager)
+            return self._orchestrator
+
+    def _get_process_pool(self):
+        if self._process_pool is None:
+            self._process_pool = spawn_process_pool(self.process_workers, initializer=_init_worker_process,
+                                                    initargs=(self.config_manager.config_path,))
+        return self._process_pool
+
+    async def _execute(self, task_config: dict) -> dict:
+        loop = asyncio.get_running_loop()
+        if task_config.get("task_name") in self.cpu_bound_modules:
+            return await loop.run_in_executor(self._get_process_pool(), _run_workflow_in_process, task_config)
+        orchestrator = await loop.run_in_executor(self._thread_pool, self._get_orchestrator)
+        return await loop.run_in_executor(self._thread_pool, orchestrator.run_workflow, task_config)
+
+    async def _worker(self, worker_index: int):
+        current = asyncio.current_task()
+        while True:
+            if self._retiring > 0: # The pool shrank while this worker was busy
+                self._retiring -= 1
+                self._workers.discard(current)
+                return
+            task_id, task_config, on_status = await self._queue.get()
+            self._pending.pop(task_id, None)
+            self._busy.add(current)
+            try:
+                self._notify(on_status, task_id, "running", started_at=_now())
+                try:
+                    result = await self._execute(task_config)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.error("Task %s raised an exception: %s", task_id, e, exc_info=True)
+                    self._notify(on_status, task_id, "failed", completed_at=_now(), result_summary=f"{type(e).__name__}: {e}")
+                    continue
+                result = result or {}
+                status = "failed" if result.get("status") == "error" else "completed"
+                summary = result.get("message") or f"Workflow finished with status '{result.get('status', 'unknown')}'."
+                self._notify(on_status, task_id, status, completed_at=_now(), result_summary=summary)
+                logger.info(StructuredMessage("Task finished", task_id=task_id, status=status, worker=worker_index))
+            finally:
+                self._busy.discard(current)
+                self._queue.task_done()
+
+    async def join(self):
+        """
+        Waits until every queued task has been processed.
+        """
+        await self._queue.join()
@@ -0,0 +1,190 @@
+# advanced_security_script/core/workflow_graph.py
+
+import logging
+import asyncio
+import functools
+from .logger_manager import StructuredMessage
+
+logger = logging.getLogger(__name__)
+
+class WorkflowDefinitionError(ValueError):
+    """Raised when a workflow graph is malformed (duplicate steps, unknown dependencies, cycles)."""
+
+class WorkflowExecutionError(RuntimeError):
+    """Raised when one or more steps of a workflow failed."""
+    def __init__(self, workflow_name: str, failed_steps: dict, skipped_steps: list, outputs: dict):
+        self.workflow_name = workflow_name
+        self.failed_steps = failed_steps
+        self.skipped_steps = skipped_steps
+        self.outputs = outputs
+        failures = ", ".join(f"{name}: {error}" for name, error in failed_steps.items())
+        super().__init__(f"Workflow {workflow_name} failed ({failures}).")
+
+class WorkflowStep:
+    def __init__(self, name: str, func, depends_on=(), map_over: str = None,
+                 cache: bool = False, version: str = "1", config_section: str = None, cache_ttl: float = None):
+        """
+        A single module step of a workflow graph.
+        Args:
+            name (str): Unique step name; other steps refer to it in depends_on.
+            func (callable): Sync or async callable invoked as func(context, inputs), where inputs
+                             maps each dependency name to its output. Sync callables run on a thread.
+            depends_on (iterable, optional): Names of the steps whose outputs this step consumes.
+            map_over (str, optional): Name of a dependency whose output is a list. The step is then
+                                      run once per item, concurrently, as func(context, inputs, item),
+                                      and its output is the list of per-item results.
+            cache (bool, optional): Whether the step output may be served from the orchestrator's StepCache.
+                                    Only enable for steps whose output depends solely on their inputs,
+                                    the task configuration and config_section.
+            version (str, optional): Module/step version; bump it to invalidate cached outputs.
+            config_section (str, optional): Config section the step reads; part of the cache key.
+            cache_ttl (float, optional): Lifetime of cached outputs in seconds (cache default if None).
+        """
+        self.name = name
+        self.func = func
+        self.depends_on = tuple(depends_on)
+        self.map_over = map_over
+        self.cache = cache
+        self.version = version
+        self.config_section = config_section
+        self.cache_ttl = cache_ttl
+        if map_over is not None and map_over not in self.depends_on:
+            raise WorkflowDefinitionError(f"Step {name}: map_over '{map_over}' must be one of its dependencies.")
+
+    def __repr__(self):
+        return f"WorkflowStep({self.name!r}, depends_on={self.depends_on!r})"
+
+class WorkflowGraph:
+    def __init__(self, name: str, steps: list):
+        """
+        A workflow declared as a directed acyclic graph of steps.
+        Args:
+            name (str): Workflow name (used in logs and errors).
+            steps (list): WorkflowStep instances.
+
+        Raises:
+            WorkflowDefinitionError: If step names repeat, a dependency is unknown, or the graph has a cycle.
+        """
+        self.name = name
+        self.steps = {}
+        for step in steps:
+            if step.name in self.steps:
+                raise WorkflowDefinitionError(f"Workflow {name}: duplicate step '{step.name}'.")
+            self.steps[step.name] = step
+        for step in steps:
+            for dependency in step.depends_on:
+                if dependency not in self.steps:
+                    raise WorkflowDefinitionError(f"Workflow {name}: step '{step.name}' depends on unknown step '{dependency}'.")
+        self.order = self._topological_order()
+
+    def _topological_order(self) -> list:
+        """Kahn's algorithm; also detects cycles."""
+        remaining = {name: len(step.depends_on) for name, step in self.steps.items()}
+        dependents = self.dependents()
+        ready = [name for name, count in remaining.items() if count == 0]
+        order = []
+        while ready:
+            name = ready.pop()
+            order.append(name)
+            for dependent in dependents[name]:
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    ready.append(dependent)
+        if len(order) != len(self.steps):
+            cyclic = sorted(name for name in self.steps if name not in order)
+            raise WorkflowDefinitionError(f"Workflow {self.name}: dependency cycle among steps {cyclic}.")
+        return order
+
+    def dependents(self) -> dict:
+        dependents = {name: [] for name in self.steps}
+        for step in self.steps.values():
+            for dependency in step.depends_on:
+                dependents[dependency].append(step.name)
+        return dependents
+
+    async def run(self, context: dict, step_runner=None, completed: dict = None, max_parallel_items: int = 16) -> dict:
+        """
+        Executes the graph with maximal parallelism: every step starts as soon as all of its
+        dependencies have finished. If a step fails, its dependents are skipped while independent
+        branches keep running.
+
+        Args:
+            context: Task configuration shared with every step.
+            step_runner: Optional coroutine function (step, inputs, run) wrapping step execution,
+                         where `run` is a coroutine function executing the step itself.
+                         Used by the orchestrator for caching and checkpointing.
+            completed: Outputs of steps that already finished (e.g. restored from a checkpoint);
+                       these steps are not run again.
+            max_parallel_items: Upper bound on concurrently running items of a map_over step.
+
+        Returns:
+            A dictionary mapping step names to their outputs.
+
+        Raises:
+            WorkflowExecutionError: If any step failed.
+        """
+        outputs = dict(completed or {})
+        failed, skipped = {}, []
+        dependents = self.dependents()
+        waiting_on = {
+            name: {dep for dep in step.depends_on if dep not in outputs}
+            for name, step in self.steps.items() if name not in outputs
+        }
+        running = {}
+
+        def launch_ready():
+            for name in [n for n, deps in waiting_on.items() if not deps]:
+                del waiting_on[name]
+                step = self.steps[name]
+                inputs = {dep: outputs[dep] for dep in step.depends_on}
+                run = functools.partial(self._run_step, step, context, inputs, max_parallel_items)
+                coroutine = step_runner(step, inputs, run) if step_runner else run()
+                running[asyncio.ensure_future(coroutine)] = name
+
+        def skip_dependents(name):
+            for dependent in dependents[name]:
+                if dependent in waiting_on:
+                    del waiting_on[dependent]
+                    skipped.append(dependent)
+                    skip_dependents(dependent)
+
+        launch_ready()
+        while running:
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                error = future.exception()
+                if error is not None:
+                    logger.error(StructuredMessage("Workflow step failed", workflow=self.name, step=name, error=error), exc_info=error)
+                    failed[name] = error
+                    skip_dependents(name)
+                    continue
+                outputs[name] = future.result()
+                for dependent in dependents[name]:
+                    if dependent in waiting_on:
+                        waiting_on[dependent].discard(name)
+            launch_ready()
+
+        if failed:
+            raise WorkflowExecutionError(self.name, failed, skipped, outputs)
+        return outputs
+
+    @staticmethod
+    async def _call(func, *args):
+        if asyncio.iscoroutinefunction(func):
+            return await func(*args)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(func, *args))
+
+    async def _run_step(self, step: WorkflowStep, context: dict, inputs: dict, max_parallel_items: int):
+        logger.debug(StructuredMessage("Starting workflow step", workflow=self.name, step=step.name))
+        if step.map_over is None:
+            return await self._call(step.func, context, inputs)
+
+        semaphore = asyncio.Semaphore(max_parallel_items)
+
+        async def run_item(item):
+            async with semaphore:
+                return await self._call(step.func, context, inputs, item)
+
+        return list(await asyncio.gather(*(run_item(item) for item in inputs[step.map_over] or [])))
@@ -1,8 +1,20 @@
 # advanced_security_script/core/workflow_orchestrator.py
 
 import logging
+import asyncio
+import concurrent.futures
+import socket
+import threading
+import uuid
 from .config_manager import ConfigManager
 from .logger_manager import LoggerManager
+from .workflow_graph import WorkflowGraph, WorkflowStep, WorkflowExecutionError
+from .step_cache import StepCache
+from .checkpoint_journal import CheckpointJournal
+from .http_client_manager import HttpClientManager
+
+# Task configuration keys that identify a submission rather than its inputs; excluded from step cache keys.
+VOLATILE_TASK_KEYS = ("task_id",)
 # Import other managers and module interfaces as they are developed
 # from .model_manager import ModelManager # Placeholder
 # from ..modules.reporting.llm_report_generator import LLMReportGenerator
@@ -15,20 +27,22 @@ from .logger_manager import LoggerManager
 # However, it's better to initialize LoggerManager first and then get loggers.
 
 class WorkflowOrchestrator:
-    def __init__(self, config_path=None):
+    def __init__(self, config_path=None, config_manager=None):
         """
         Initializes the WorkflowOrchestrator.
         Manages the overall execution flow of the security script.
         Args:
             config_path (str, optional): Path to the main configuration file.
+            config_manager (ConfigManager, optional): Shared (e.g. hot-reloaded) ConfigManager to use
+                                                      instead of loading config_path.
         """
-        self.config_manager = ConfigManager(config_path=config_path)
+        self.config_manager = config_manager if config_manager is not None else ConfigManager(config_path=config_path)
         # Initialize LoggerManager with the config_manager instance
         self.logger_manager = LoggerManager(config_manager=self.config_manager)
         self.logger = self.logger_manager.get_logger(__name__) # Get a logger for this module
 
         self.logger.info("WorkflowOrchestrator initialized.")
-        self.logger.debug(f"Configuration loaded: {self.config_manager.get_all_config()}")
+        self.logger.debug("Configuration loaded: %s", self.config_manager.get_all_config())
 
         # Initialize other managers and modules here
         # self.model_manager = ModelManager(self.config_manager)
@@ -36,8 +50,303 @@ class WorkflowOrchestrator:
         # self.vuln_crawler = VulnerabilityCrawler(self.config_manager, None) # None for data_manager placeholder
         # self.rl_agent = RLAgent(self.config_manager, self.model_manager, None, None) # Placeholders
         # self.adv_tester = AdversarialTester(self.config_manager, self.model_manager)
+
+        # Workflows declared as dependency graphs, keyed by task name
+        self.workflows = {
+            "vulnerability_intelligence": self._build_vulnerability_intelligence_workflow,
+            "easm_assessment": self._build_easm_assessment_workflow,
+            "full_assessment": self._build_full_assessment_workflow,
+        }
+        self.max_parallel_items = self.config_manager.get("workflow_settings", "max_parallel_items")
+        self.step_cache = None
+        if self.config_manager.get("workflow_settings", "step_cache_enabled"):
+            self.step_cache = StepCache(
+                self.config_manager.get("workflow_settings", "step_cache_dir"),
+                max_bytes=self.config_manager.get("workflow_settings", "step_cache_max_bytes"),
+                default_ttl=self.config_manager.get("workflow_settings", "step_cache_ttl"),
+            )
+        self.checkpoint_journal = None
+        if self.config_manager.get("workflow_settings", "checkpoint_enabled"):
+            self.checkpoint_journal = CheckpointJournal(
+                self.config_manager.get("workflow_settings", "checkpoint_dir"))
+        # Workflows run on one long-lived event loop so the pooled HTTP session (bound to a loop)
+        # and its warm connections are reused by every run.
+        self.http_client = HttpClientManager(self.config_manager)
+        self._loop = None
+        self._loop_thread = None
+        self._loop_lock = threading.Lock()
+        self._in_flight = set() # Futures of the workflow runs currently on the loop
         self.logger.info("Core managers (Config, Logger) are set up. Other modules to be integrated.")
 
+    def config_for_task(self, task_config: dict):
+        """
+        Returns the configuration a task runs with: the shared configuration with the task's
+        "config_overrides" applied (memoized by the ConfigManager per distinct override set).
+        """
+        overrides = task_config.get("config_overrides")
+        if not overrides:
+            return self.config_manager
+        return self.config_manager.with_overrides(overrides)
+
+    def _run_on_loop(self, coroutine):
+        """
+        Runs a coroutine on the orchestrator's event loop (started on first use in a daemon thread)
+        and blocks the calling thread until it finishes. Must not be called from the loop itself.
+        """
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._loop_thread = threading.Thread(target=self._loop.run_forever, name="workflow-loop", daemon=True)
+                self._loop_thread.start()
+            future = asyncio.run_coroutine_threadsafe(coroutine, self._loop)
+            self._in_flight.add(future)
+        future.add_done_callback(self._in_flight.discard)
+        return future.result()
+
+    def close(self):
+        """
+        Waits for the workflow runs in progress, then closes the shared HTTP session and stops the
+        event loop. A later run starts a new loop. Also detaches the LoggerManager from the
+        ConfigManager, which would otherwise keep it alive.
+        """
+        self.logger_manager.close()
+        with self._loop_lock:
+            loop, thread, self._loop, self._loop_thread = self._loop, self._loop_thread, None, None
+            in_flight = list(self._in_flight)
+        if loop is None:
+            return
+        concurrent.futures.wait(in_flight)
+        asyncio.run_coroutine_threadsafe(self.http_client.close(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.run_until_complete(loop.shutdown_default_executor())
+        loop.close()
+        self.logger.info("WorkflowOrchestrator closed.")
+
+    def vulnerability_store(self, config=None):
+        """
+        Returns the store crawled vulnerabilities are written to: the process-wide store of
+        `vulnerability_store.db_path`, shared with the dashboard API. It is opened on first use
+        and outlives the orchestrator.
+        Args:
+            config (ConfigView, optional): Configuration of the task; defaults to the shared one.
+        """
+        from ..modules.intelligence.vulnerability_store import shared_store
+        return shared_store((config or self.config_manager).get("vulnerability_store", "db_path"))
+
+    def register_workflow(self, task_name: str, builder):
+        """
+        Registers a graph workflow.
+
+        Args:
+            task_name (str): Task name that selects the workflow in run_workflow.
+            builder (callable): Returns a WorkflowGraph when called with the task configuration.
+        """
+        self.workflows[task_name] = builder
+
+    async def run_graph_workflow(self, task_config: dict, run_id: str = None, completed: dict = None) -> dict:
+        """
+        Runs a registered graph workflow, scheduling independent steps in parallel.
+        Every completed step is checkpointed to the journal so an interrupted run can be resumed.
+
+        Args:
+            task_config (dict): Task definition; "task_name" selects the workflow.
+            run_id (str, optional): Journal identifier of the run; defaults to the task_id or a new UUID.
+            completed (dict, optional): Step outputs restored from a checkpoint; those steps are skipped.
+
+        Returns:
+            A result dictionary with the status and the outputs of every step.
+        """
+        task_name = task_config.get("task_name")
+        graph = self.workflows[task_name](task_config)
+        journal = self.checkpoint_journal
+        if completed is None:
+            run_id = run_id or task_config.get("task_id") or str(uuid.uuid4())
+            if journal is not None:
+                try:
+                    journal.start_run(run_id, task_config)
+                except (TypeError, ValueError) as e:
+                    self.logger.warning("Task configuration of run %s is not JSON-serializable; run will not be checkpointed: %s", run_id, e)
+                    journal = None
+        self.logger.info("Executing graph workflow '%s' (%s steps, run %s).", task_name, len(graph.steps), run_id)
+        try:
+            outputs = await graph.run(task_config, step_runner=self._make_step_runner(task_config, run_id, journal),
+                                      completed=completed, max_parallel_items=self.max_parallel_items)
+        except WorkflowExecutionError as e:
+            self.logger.error(str(e))
+            if journal is not None:
+                journal.finish_run(run_id)
+            return {
+                "status": "error",
+                "message": str(e),
+                "failed_steps": sorted(e.failed_steps),
+                "skipped_steps": e.skipped_steps,
+                "outputs": e.outputs,
+            }
+        if journal is not None:
+            journal.finish_run(run_id)
+        self.logger.info("Graph workflow '%s' completed.", task_name)
+        return {"status": "success", "message": f"Workflow {task_name} completed.", "outputs": outputs}
+
+    def resume_incomplete_workflows(self) -> dict:
+        """
+        Resumes every graph workflow run left unfinished in the checkpoint journal (e.g. by a
+        crash or a deploy), skipping the steps that had already completed.
+
+        Returns:
+            A dictionary mapping run IDs to their workflow results.
+        """
+        results = {}
+        if self.checkpoint_journal is None:
+            return results
+        for run_id in self.checkpoint_journal.incomplete_runs():
+            task_config, completed = self.checkpoint_journal.load_run(run_id)
+            if not task_config or task_config.get("task_name") not in self.workflows:
+                self.logger.warning("Discarding checkpoint journal %s: unknown or missing workflow.", run_id)
+                self.checkpoint_journal.finish_run(run_id)
+                continue
+            self.logger.info("Resuming workflow run %s (%s step(s) already completed).", run_id, len(completed))
+            results[run_id] = self._run_on_loop(self.run_graph_workflow(task_config, run_id=run_id, completed=completed))
+        return results
+
+    def _make_step_runner(self, task_config: dict, run_id: str, journal):
+        """
+        Builds the step runner that serves cacheable steps from the StepCache and checkpoints
+        completed steps to the journal. Disk I/O runs on a thread so it never blocks the
+        workflow's event loop.
+        """
+        context = {key: value for key, value in task_config.items() if key not in VOLATILE_TASK_KEYS}
+        config = self.config_for_task(task_config)
+
+        async def run_cached(step, inputs, run):
+            if self.step_cache is None or not step.cache:
+                return await run()
+            loop = asyncio.get_running_loop()
+            config_section = config.get_section(step.config_section) if step.config_section else None
+            key = StepCache.make_key(step.name, step.version, inputs, context, config_section)
+            hit, value = await loop.run_in_executor(None, self.step_cache.get, key)
+            if hit:
+                self.logger.info("Step '%s' served from cache.", step.name)
+                return value
+            value = await run()
+            await loop.run_in_executor(None, self.step_cache.set, key, value, step.cache_ttl)
+            return value
+
+        async def run_step(step, inputs, run):
+            value = await run_cached(step, inputs, run)
+            if journal is not None:
+                await asyncio.get_running_loop().run_in_executor(None, journal.record_step, run_id, step.name, value)
+            return value
+
+        return run_step
+
+    # --- Built-in workflow definitions ---
+
+    def _build_vulnerability_intelligence_workflow(self, task_config: dict) -> WorkflowGraph:
+        # crawl -> enrich -> report
+        return WorkflowGraph("vulnerability_intelligence", [
+            self._crawl_step(),
+            WorkflowStep("enrich", self._step_enrich_vulnerabilities, depends_on=["crawl"], cache=True),
+            WorkflowStep("report", self._step_generate_report, depends_on=["enrich"], cache=True, config_section="llm_report_generator"),
+        ])
+
+    def _build_easm_assessment_workflow(self, task_config: dict) -> WorkflowGraph:
+        # discovery -> per-asset checks (fanned out) -> report
+        return WorkflowGraph("easm_assessment", [
+            WorkflowStep("discover_assets", self._step_discover_assets, cache=True),
+            self._check_assets_step(),
+            WorkflowStep("report", self._step_generate_report, depends_on=["check_assets"], cache=True, config_section="llm_report_generator"),
+        ])
+
+    def _build_full_assessment_workflow(self, task_config: dict) -> WorkflowGraph:
+        # The EASM and vulnerability-intelligence branches are independent and run concurrently.
+        return WorkflowGraph("full_assessment", [
+            WorkflowStep("discover_assets", self._step_discover_assets, cache=True),
+            self._check_assets_step(),
+            self._crawl_step(),
+            WorkflowStep("enrich", self._step_enrich_vulnerabilities, depends_on=["crawl"], cache=True),
+            WorkflowStep("report", self._step_generate_report, depends_on=["check_assets", "enrich"], cache=True, config_section="llm_report_generator"),
+        ])
+
+    def _crawl_step(self) -> WorkflowStep:
+        # Crawled data goes stale quickly, so cached crawls expire sooner than the cache default.
+        return WorkflowStep("crawl", self._step_crawl_vulnerabilities, cache=True, config_section="vulnerability_crawler",
+                            cache_ttl=self.config_manager.get("vulnerability_crawler", "crawl_cache_ttl"))
+
+    def _check_assets_step(self) -> WorkflowStep:
+        return WorkflowStep("check_assets", self._step_check_asset, depends_on=["discover_assets"], map_over="discover_assets",
+                            cache=True, config_section="easm", cache_ttl=self.config_manager.get("easm", "check_cache_ttl"))
+
+    # --- Workflow steps. Outputs are plain JSON-compatible data passed to dependent steps. ---
+
+    async def _step_crawl_vulnerabilities(self, task_config: dict, inputs: dict) -> list:
+        from ..modules.intelligence.vulnerability_crawler import VulnerabilityCrawler # Lazy import: needs aiohttp
+        config = self.config_for_task(task_config)
+        crawler = VulnerabilityCrawler(config, None, http_client=self.http_client, store=self.vulnerability_store(config))
+        max_results = task_config.get("max_results", config.get("vulnerability_crawler", "max_results_per_source"))
+        return await crawler.crawl_vulnerabilities(keywords=task_config.get("keywords"), max_results_per_source=max_results)
+
+    def _step_enrich_vulnerabilities(self, task_config: dict, inputs: dict) -> list:
+        # Turn crawled vulnerabilities into report findings, most severe first
+        findings = [
+            {
+                "title": f"{vuln.get('id')} ({vuln.get('source')})",
+                "description": vuln.get("description", "N/A"),
+                "severity": vuln.get("severity") or "UNKNOWN",
+                "cvss_score": vuln.get("cvss_score"),
+                "component": ", ".join(task_config.get("keywords") or []) or "N/A",
+                "recommendation": f"Review vendor advisories: {vuln.get('link', 'N/A')}",
+            }
+            for vuln in inputs["crawl"]
+        ]
+        findings.sort(key=lambda finding: finding["cvss_score"] or 0, reverse=True)
+        return findings
+
+    def _step_discover_assets(self, task_config: dict, inputs: dict) -> list:
+        targets = task_config.get("targets") or ([task_config["target"]] if task_config.get("target") else [])
+        return [{"identifier": target, "asset_type": "domain"} for target in targets]
+
+    async def _step_check_asset(self, task_config: dict, inputs: dict, asset: dict) -> dict:
+        # Resolve the asset and probe common web ports
+        loop = asyncio.get_running_loop()
+        config = self.config_for_task(task_config)
+        timeout = config.get("easm", "connect_timeout")
+        ports = task_config.get("ports", config.get("easm", "ports"))
+        result = dict(asset, addresses=[], open_ports=[])
+        try:
+            infos = await loop.getaddrinfo(asset["identifier"], None, type=socket.SOCK_STREAM)
+            result["addresses"] = sorted({info[4][0] for info in infos})
+        except (socket.gaierror, UnicodeError) as e:
+            result["error"] = f"Resolution failed: {e}"
+            return result
+        for port in ports:
+            try:
+                _, writer = await asyncio.wait_for(asyncio.open_connection(asset["identifier"], port), timeout)
+            except (OSError, asyncio.TimeoutError):
+                continue
+            result["open_ports"].append(port)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError as e: # The port accepted the connection; a reset while closing does not change that
+                self.logger.debug("Closing the connection to %s:%s failed: %s", asset["identifier"], port, e)
+        return result
+
+    def _step_generate_report(self, task_config: dict, inputs: dict) -> str:
+        from ..modules.reporting.llm_report_generator import LLMReportGenerator
+        findings = list(inputs.get("enrich", []))
+        for asset in inputs.get("check_assets", []):
+            findings.append({
+                "title": f"External asset {asset['identifier']}",
+                "description": asset.get("error") or f"Resolves to {', '.join(asset['addresses']) or 'nothing'}; open ports: {asset['open_ports'] or 'none'}.",
+                "severity": "INFO",
+                "component": asset["identifier"],
+                "recommendation": "Confirm the asset is expected to be exposed.",
+            })
+        reporter = LLMReportGenerator(self.config_for_task(task_config), None, None)
+        target = task_config.get("target") or ", ".join(task_config.get("targets") or []) or "N/A"
+        return reporter.generate_report(findings, {"url": target})
+
     def run_workflow(self, task_config: dict):
         """
         Runs a specific security workflow based on the task configuration.
@@ -47,8 +356,11 @@ class WorkflowOrchestrator:
                                 {"task_name": "full_scan", "target_url": "http://example.com", ...}
         """
         task_name = task_config.get("task_name", "default_task")
-        self.logger.info(f"Starting workflow: {task_name}")
-        self.logger.debug(f"Task configuration: {task_config}")
+        self.logger.info("Starting workflow: %s", task_name)
+        self.logger.debug("Task configuration: %s", task_config)
+
+        if task_name in self.workflows:
+            return self._run_on_loop(self.run_graph_workflow(task_config))
 
         # Example workflow steps (to be greatly expanded)
         if task_name == "test_setup":
@@ -76,10 +388,10 @@ class WorkflowOrchestrator:
             return {"status": "pending_integration", "message": "VulnerabilityCrawler test pending full integration."}
 
         else:
-            self.logger.warning(f"Unknown task name: {task_name}")
+            self.logger.warning("Unknown task name: %s", task_name)
             return {"status": "error", "message": f"Unknown task: {task_name}"}
 
-        self.logger.info(f"Workflow {task_name} finished.")
+        self.logger.info("Workflow %s finished.", task_name)
 
 if __name__ == '__main__':
     # This main block is for testing the orchestrator itself.
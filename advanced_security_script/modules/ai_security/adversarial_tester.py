@@ -33,7 +33,7 @@ class AdversarialTester:
         Returns:
             A dictionary containing the robustness assessment results (e.g., accuracy under attack).
         """
-        logger.info(f"Starting robustness test for model: {model_name} using dataset: {dataset_identifier}")
+        logger.info("Starting robustness test for model: %s using dataset: %s", model_name, dataset_identifier)
         
         # 1. Load the model using ModelManager
         # model_instance, model_metadata = self.model_manager.load_model(model_name)
@@ -84,7 +84,7 @@ class AdversarialTester:
             "accuracy_baseline": random.uniform(0.8, 0.95), # Placeholder
             "accuracy_under_attack": random.uniform(0.1, 0.5) # Placeholder
         }
-        logger.info(f"Adversarial robustness testing logic for model 	{model_name}	 to be implemented using libraries like ART.")
+        logger.info("Adversarial robustness testing logic for model 	%s	 to be implemented using libraries like ART.", model_name)
         return results
 
 if __name__ == '__main__':
@@ -93,7 +93,7 @@ if __name__ == '__main__':
         def get(self, section, key, default=None): return default
     class MockModelManager:
         def load_model(self, model_name):
-            logger.info(f"Mock loading model: {model_name}")
+            logger.info("Mock loading model: %s", model_name)
             # return (MockPytorchModel(), {"input_shape": (1,28,28), "num_classes": 10}) # Example metadata
             return (None, {})
     
@@ -106,7 +106,7 @@ class RLAgent:
         # model_save_path = self.config.get("rl_agent", "model_save_path", default="./models/rl_agent_model.zip")
         # self.model_manager.save_model(self.rl_model, model_save_path, type="rl")
         # logger.info(f"RL agent training complete. Model saved to {model_save_path}")
-        logger.info(f"RL agent training process to be implemented here. This will involve interaction with the SecurityTestingEnv.")
+        logger.info("RL agent training process to be implemented here. This will involve interaction with the SecurityTestingEnv.")
 
     def run_exploitation(self, target_info: dict) -> list:
         """
@@ -152,7 +152,7 @@ class RLAgent:
             An optimized payload string.
         """
         # This could be a separate RL environment or a heuristic guided by an RL policy.
-        logger.info(f"Payload optimization for '{base_payload}' requested. RL-based optimization pending.")
+        logger.info("Payload optimization for '%s' requested. RL-based optimization pending.", base_payload)
         # For now, return a slightly modified payload as a placeholder
         return base_payload + "_optimized_by_rl_placeholder"
 
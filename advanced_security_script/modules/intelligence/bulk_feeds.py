@@ -0,0 +1,219 @@
+# advanced_security_script/modules/intelligence/bulk_feeds.py
+
+import logging
+import contextlib
+import gzip
+import itertools
+import json
+import os
+import queue
+import zipfile
+from .exploitdb_feed import iter_exploitdb_csv
+from .nvd_sync import ijson, normalize_nvd_item
+from .vulnerability_store import normalize_timestamp
+
+logger = logging.getLogger(__name__)
+
+NVD_FEED_ITEM_PREFIX = "CVE_Items.item"
+NVD_FEED_TIMESTAMP = "CVE_data_timestamp"
+# Feed kinds by file extension (after stripping .gz / .zip)
+FEED_KINDS = {".json": "nvd_json", ".csv": "exploitdb_csv"}
+COMPRESSED_SUFFIXES = (".gz", ".zip")
+
+def detect_feed_kind(path: str) -> str:
+    """
+    Returns the kind of a bulk feed file from its name: "nvd_json" for NVD JSON year feeds
+    (nvdcve-1.1-2021.json[.gz|.zip]) or "exploitdb_csv" for Exploit-DB exports (files_exploits.csv[.gz|.zip]).
+
+    Raises:
+        ValueError: If the file is of neither kind.
+    """
+    name = os.path.basename(path).lower()
+    for suffix in COMPRESSED_SUFFIXES:
+        if name.endswith(suffix):
+            name = name[:-len(suffix)]
+            break
+    kind = FEED_KINDS.get(os.path.splitext(name)[1])
+    if kind is None:
+        raise ValueError(f"Unsupported bulk feed file: {path}")
+    return kind
+
+def expand_feed_paths(paths: list) -> list:
+    """Expands directories into the feed files they contain (sorted); files are kept as given."""
+    expanded = []
+    for path in paths:
+        if not os.path.isdir(path):
+            expanded.append(path)
+            continue
+        for name in sorted(os.listdir(path)):
+            full_path = os.path.join(path, name)
+            try:
+                detect_feed_kind(full_path)
+            except ValueError:
+                continue
+            if os.path.isfile(full_path):
+                expanded.append(full_path)
+    return expanded
+
+@contextlib.contextmanager
+def open_feed(path: str):
+    """
+    Opens a feed file for binary reading, decompressing .gz and .zip files on the fly (the archive
+    member with the feed's extension is read) without extracting them.
+    """
+    name = path.lower()
+    if name.endswith(".gz"):
+        with gzip.open(path, "rb") as f:
+            yield f
+    elif name.endswith(".zip"):
+        with zipfile.ZipFile(path) as archive:
+            members = [member for member in archive.namelist() if os.path.splitext(member.lower())[1] in FEED_KINDS]
+            if not members:
+                raise ValueError(f"No feed file in archive {path}")
+            with archive.open(members[0]) as f:
+                yield f
+    else:
+        with open(path, "rb") as f:
+            yield f
+
+def read_nvd_feed(stream, on_items, batch_size: int = 1000, chunk_size: int = 256 * 1024) -> dict:
+    """
+    Parses an NVD JSON 1.1 feed ({"CVE_data_timestamp": ..., "CVE_Items": [...]}), handing raw CVE
+    items to on_items in batches. With ijson the feed is parsed incrementally; without it the feed
+    is decoded in full.
+
+    Returns:
+        {"timestamp": the feed's CVE_data_timestamp (or None), "itemCount": items delivered}
+    """
+    if ijson is None:
+        document = json.load(stream)
+        cve_items = document.get("CVE_Items", [])
+        for start in range(0, len(cve_items), batch_size):
+            on_items(cve_items[start:start + batch_size])
+        return {"timestamp": document.get(NVD_FEED_TIMESTAMP), "itemCount": len(cve_items)}
+
+    items = ijson.sendable_list()
+    items_parser = ijson.items_coro(items, NVD_FEED_ITEM_PREFIX, use_float=True)
+    timestamps = ijson.sendable_list()
+    timestamp_parser = ijson.items_coro(timestamps, NVD_FEED_TIMESTAMP)
+    count = 0
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        if timestamp_parser is not None:
+            timestamp_parser.send(chunk)
+            if timestamps:
+                timestamp_parser = None # Found; it precedes the items in NVD feeds
+        items_parser.send(chunk)
+        while len(items) >= batch_size:
+            batch = items[:batch_size]
+            del items[:batch_size]
+            count += len(batch)
+            on_items(batch)
+    items_parser.close() # Raises on a truncated feed
+    if timestamp_parser is not None:
+        timestamp_parser.close()
+    if items:
+        count += len(items)
+        on_items(list(items))
+    return {"timestamp": timestamps[0] if timestamps else None, "itemCount": count}
+
+def parse_feed_file(path: str, batch_size: int = 1000, on_records=None) -> dict:
+    """
+    Parses one bulk feed file into normalized records.
+
+    Args:
+        path: The feed file.
+        batch_size: Maximum number of records handed to on_records at a time.
+        on_records: Optional callable receiving the records in batches as they are parsed, so memory
+                    stays bounded by one batch. When omitted, the records are returned in "records".
+
+    Returns:
+        {"path", "kind", "count": number of records, "records": list of records (without on_records),
+         "snapshot": ISO time up to which the file reflects NVD modifications (NVD feeds only, else None)}
+
+    Raises:
+        ValueError: If the file is not a supported feed.
+        OSError, EOFError, zipfile.BadZipFile, ijson.JSONError: If the file cannot be read or decoded.
+    """
+    kind = detect_feed_kind(path)
+    records = []
+    deliver = on_records if on_records is not None else records.extend
+    count, snapshot = 0, None
+    with open_feed(path) as stream:
+        if kind == "nvd_json":
+            newest = [None] # Newest lastModifiedDate seen; NVD feed timestamps share one format, so strings compare
+
+            def on_items(cve_items):
+                batch = [normalize_nvd_item(item) for item in cve_items]
+                for record in batch:
+                    modified = record["last_modified_date"]
+                    if modified and (newest[0] is None or modified > newest[0]):
+                        newest[0] = modified
+                deliver(batch)
+
+            summary = read_nvd_feed(stream, on_items, batch_size=batch_size)
+            count = summary["itemCount"]
+            # The feed's generation time; the newest modification it contains if the timestamp is missing
+            snapshot = normalize_timestamp(summary["timestamp"] or newest[0])
+        else:
+            rows = iter_exploitdb_csv(stream)
+            while True:
+                batch = list(itertools.islice(rows, batch_size))
+                if not batch:
+                    break
+                count += len(batch)
+                deliver(batch)
+    logger.debug("Parsed bulk feed %s (%s): %s records.", path, kind, count)
+    result = {"path": path, "kind": kind, "count": count, "snapshot": snapshot}
+    if on_records is None:
+        result["records"] = records
+    return result
+
+# --- Worker side of VulnerabilityCrawler.ingest_bulk_feeds ---
+# Workers send ("records", path, batch) messages for every batch, then ("done", path, result) or
+# ("failed", path, error) through a bounded queue, so a feed never travels back whole and a slow
+# consumer holds the workers back instead of letting parsed records pile up.
+
+_feed_queue = None
+
+def init_feed_worker(feed_queue):
+    """Process pool initializer: keeps the queue the worker sends its messages to."""
+    global _feed_queue
+    _feed_queue = feed_queue
+
+def parse_feed_to_queue(path: str, batch_size: int):
+    try:
+        result = parse_feed_file(path, batch_size, on_records=lambda batch: _feed_queue.put(("records", path, batch)))
+    except Exception as e:
+        _feed_queue.put(("failed", path, f"{type(e).__name__}: {e}"))
+    else:
+        _feed_queue.put(("done", path, result))
+
+def next_feed_message(feed_queue, futures: dict, pending: set, poll_interval: float = 0.5) -> tuple:
+    """
+    Waits for the next worker message. A worker process that dies (e.g. killed by the OOM killer)
+    sends nothing; its futures fail instead, and the files it was parsing are reported as failed.
+
+    Args:
+        feed_queue: The queue handed to init_feed_worker.
+        futures (dict): Future of parse_feed_to_queue -> path.
+        pending (set): Paths without a "done" or "failed" message yet.
+    """
+    while True:
+        try:
+            return feed_queue.get(timeout=poll_interval)
+        except queue.Empty:
+            pass
+        for future, path in futures.items():
+            if path in pending and future.done() and not future.cancelled() and future.exception() is not None:
+                return ("failed", path, f"{type(future.exception()).__name__}: {future.exception()}")
+
+def drain_feed_queue(feed_queue, futures: dict):
+    """Discards worker messages until every worker has finished, so none stays blocked on a full queue."""
+    while not all(future.done() for future in futures):
+        try:
+            feed_queue.get(timeout=0.5)
+        except queue.Empty:
+            pass
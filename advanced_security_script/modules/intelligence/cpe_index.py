@@ -0,0 +1,223 @@
+# advanced_security_script/modules/intelligence/cpe_index.py
+
+import logging
+import heapq
+import re
+
+logger = logging.getLogger(__name__)
+
+CPE23_PREFIX = "cpe:2.3:"
+ANY_VERSION = ("*", "-", "")
+_VERSION_PART = re.compile(r"\d+|[a-z]+")
+# Pre-release tags sort below the release they precede, in this order; other letters ("p1", "2a") follow it
+_PRE_RELEASE = {"dev": 0, "alpha": 1, "beta": 2, "pre": 3, "preview": 3, "rc": 4}
+_RELEASE = (0, "") # Closes every key, so "1.0" sorts after "1.0rc1" and before "1.0.1" and "1.0p1"
+
+def parse_cpe23(uri: str) -> dict:
+    """
+    Splits a CPE 2.3 formatted string (cpe:2.3:part:vendor:product:version:...) into its
+    part, vendor, product and version fields, honouring backslash escapes ("\\:").
+
+    Returns:
+        {"part", "vendor", "product", "version"}, or None if uri is not a CPE 2.3 string.
+    """
+    if not uri or not uri.lower().startswith(CPE23_PREFIX):
+        return None
+    fields, current, escaped = [], [], False
+    for char in uri[len(CPE23_PREFIX):]:
+        if escaped:
+            current.append(char)
+            escaped = False
+        elif char == "\\":
+            escaped = True
+        elif char == ":":
+            fields.append("".join(current))
+            current = []
+        else:
+            current.append(char)
+    fields.append("".join(current))
+    if len(fields) < 4:
+        return None
+    part, vendor, product, version = (field.lower() for field in fields[:4])
+    return {"part": part, "vendor": vendor, "product": product, "version": version}
+
+def normalize_name(name: str) -> str:
+    """Normalizes a vendor or product name the way CPE names are written ("HTTP Server" -> "http_server")."""
+    return "_".join((name or "").lower().split())
+
+def normalize_query(query) -> tuple:
+    """
+    Normalizes a product query, either a dict with "product" and optional "vendor" and "version"
+    or a CPE 2.3 string, to a (vendor, product, version) key; missing parts are empty strings.
+    Keys (tuples) are returned as they are.
+    """
+    if isinstance(query, tuple):
+        return query
+    if isinstance(query, str):
+        query = parse_cpe23(query) or {}
+    version = (query.get("version") or "").strip().lower()
+    return (normalize_name(query.get("vendor")), normalize_name(query.get("product")), "" if version in ANY_VERSION else version)
+
+def version_key(version: str) -> tuple:
+    """
+    Orders version strings component by component: numbers numerically, letters alphabetically,
+    letters before numbers ("2.4.9" < "2.4.10", "8.2p1" < "8.2.1"). Pre-release tags (dev, alpha,
+    beta, pre, preview, rc) sort below the release ("1.0rc1" < "1.0"); single letters such as
+    "a" or "b" are taken as patch letters ("1.0.2" < "1.0.2a"), as OpenSSL uses them.
+    """
+    parts = _VERSION_PART.findall((version or "").lower())
+    return tuple((1, int(part)) if part.isdigit() else (-1, _PRE_RELEASE[part]) if part in _PRE_RELEASE else (0, part)
+                 for part in parts) + (_RELEASE,)
+
+def extract_cpe_matches(cve_item: dict) -> list:
+    """
+    Extracts the vulnerable CPE matches of an NVD 1.1 CVE item (configurations.nodes, children included).
+
+    Platform conditions of AND nodes (e.g. "running on Windows") are not kept, so a product
+    matches regardless of the platform it runs on.
+
+    Returns:
+        A list of {"cpe", "version_start", "start_inclusive", "version_end", "end_inclusive"}.
+    """
+    matches, seen = [], set()
+    nodes = list((cve_item.get("configurations") or {}).get("nodes") or [])
+    while nodes:
+        node = nodes.pop()
+        nodes.extend(node.get("children") or [])
+        for cpe_match in node.get("cpe_match") or []:
+            if not cpe_match.get("vulnerable", True) or not cpe_match.get("cpe23Uri"):
+                continue
+            match = {
+                "cpe": cpe_match["cpe23Uri"],
+                "version_start": cpe_match.get("versionStartIncluding") or cpe_match.get("versionStartExcluding"),
+                "start_inclusive": "versionStartExcluding" not in cpe_match,
+                "version_end": cpe_match.get("versionEndIncluding") or cpe_match.get("versionEndExcluding"),
+                "end_inclusive": "versionEndExcluding" not in cpe_match,
+            }
+            marker = tuple(match.values())
+            if marker not in seen:
+                seen.add(marker)
+                matches.append(match)
+    return matches
+
+class _ProductEntries:
+    """Applicability entries of one (vendor, product)."""
+    __slots__ = ("exact", "any_version", "ranges", "_sorted")
+
+    def __init__(self):
+        self.exact = {}          # version -> set of vulnerability IDs
+        self.any_version = set() # IDs affecting every version
+        self.ranges = []         # (start key, 0 if start inclusive else 1, end key or None, end inclusive, ID)
+        self._sorted = True
+
+    def add(self, vuln_id: str, version: str, version_start: str, start_inclusive: bool, version_end: str, end_inclusive: bool):
+        if version_start or version_end:
+            start = version_key(version_start) if version_start else () # () sorts before every version
+            end = version_key(version_end) if version_end else None
+            self.ranges.append((start, 0 if start_inclusive else 1, end, bool(end_inclusive), vuln_id))
+            self._sorted = False
+        elif not version or version in ANY_VERSION:
+            self.any_version.add(vuln_id)
+        else:
+            self.exact.setdefault(version, set()).add(vuln_id)
+
+    def match_versions(self, versions) -> dict:
+        """
+        Matches several versions in one sweep: versions are visited in ascending order while ranges
+        enter an active set at their lower bound and leave it (through a heap on their upper bound)
+        past it, so each version only looks at the ranges that contain it.
+
+        Returns:
+            {version: set of vulnerability IDs}; the empty version matches every entry.
+        """
+        found = {}
+        if "" in versions:
+            found[""] = set(self.any_version).union(*self.exact.values(), (entry[4] for entry in self.ranges))
+        if not self._sorted:
+            self.ranges.sort(key=lambda entry: entry[:2])
+            self._sorted = True
+        active, expiry, position = {}, [], 0
+        for key, version in sorted((version_key(version), version) for version in versions if version):
+            while position < len(self.ranges):
+                start, start_exclusive, end, end_inclusive, vuln_id = self.ranges[position]
+                if start > key or (start == key and start_exclusive):
+                    break
+                active[position] = vuln_id
+                if end is not None:
+                    # Exclusive bounds sort first, so they expire on their end version itself
+                    heapq.heappush(expiry, (end, end_inclusive, position))
+                position += 1
+            while expiry and (expiry[0][0] < key or (expiry[0][0] == key and not expiry[0][1])):
+                del active[heapq.heappop(expiry)[2]]
+            found[version] = self.any_version | self.exact.get(version, set()) | set(active.values())
+        return found
+
+class CpeIndex:
+    def __init__(self):
+        """
+        Initializes the CpeIndex: an in-memory applicability index from (vendor, product, version)
+        to the vulnerabilities affecting it, built from NVD CPE configurations.
+
+        Entries are grouped per (vendor, product), with a hash map for exact versions and a list of
+        version ranges sorted by their lower bound. Lookups touch only the entries of the queried
+        product, and the versions queried for one product are matched in a single sweep.
+        """
+        self._products = {} # (vendor, product) -> _ProductEntries
+        self._vendors = {}  # product -> vendors, for queries without a vendor
+
+    def __len__(self):
+        return len(self._products)
+
+    def add(self, vuln_id: str, vendor: str, product: str, version: str = "*", version_start: str = None,
+            start_inclusive: bool = True, version_end: str = None, end_inclusive: bool = True):
+        entries = self._products.get((vendor, product))
+        if entries is None:
+            entries = self._products[(vendor, product)] = _ProductEntries()
+            self._vendors.setdefault(product, set()).add(vendor)
+        entries.add(vuln_id, version, version_start, start_inclusive, version_end, end_inclusive)
+
+    def add_record(self, vuln_id: str, cpe_matches: list):
+        """Indexes the cpe_matches (see extract_cpe_matches) of one vulnerability."""
+        for match in cpe_matches:
+            cpe = parse_cpe23(match["cpe"])
+            if cpe is not None:
+                self.add(vuln_id, cpe["vendor"], cpe["product"], cpe["version"], match.get("version_start"),
+                         match.get("start_inclusive", True), match.get("version_end"), match.get("end_inclusive", True))
+
+    def match(self, product: str, version: str = None, vendor: str = None) -> list:
+        """
+        Returns the sorted IDs of the vulnerabilities affecting a product version. Without a version,
+        every vulnerability of the product is returned; without a vendor, the product is looked up
+        under every vendor that has one by that name.
+        """
+        return self.match_many([{"product": product, "version": version, "vendor": vendor}])[0]
+
+    def match_many(self, queries: list) -> list:
+        """
+        Resolves many product queries at once. Assets share their software stacks, so every distinct
+        (vendor, product, version) is resolved once and the result reused.
+
+        Args:
+            queries (list): Dicts with "product" and optional "vendor" and "version", CPE 2.3 strings,
+                            or keys from normalize_query.
+
+        Returns:
+            The list of matching vulnerability IDs of each query, in query order.
+        """
+        keys = [normalize_query(query) for query in queries]
+        # Distinct versions queried per (vendor, product); vendor-less queries fan out to every vendor
+        versions, found = {}, {}
+        for vendor, product, version in set(keys):
+            for vendor_name in ([vendor] if vendor else self._vendors.get(product, ())):
+                if (vendor_name, product) in self._products:
+                    versions.setdefault((vendor_name, product), set()).add(version)
+        for product_key, product_versions in versions.items():
+            found[product_key] = self._products[product_key].match_versions(product_versions)
+        resolved = {}
+        for key in keys:
+            if key not in resolved:
+                vendor, product, version = key
+                vendors = [vendor] if vendor else self._vendors.get(product, ())
+                resolved[key] = sorted(set().union(*(found[(name, product)][version] for name in vendors if (name, product) in found)))
+        logger.debug("Resolved %s CPE queries (%s distinct).", len(queries), len(resolved))
+        return [resolved[key] for key in keys]
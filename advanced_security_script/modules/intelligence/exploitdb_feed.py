@@ -0,0 +1,179 @@
+# advanced_security_script/modules/intelligence/exploitdb_feed.py
+
+import logging
+import csv
+import datetime
+import email.utils
+import io
+import re
+import xml.etree.ElementTree as ET
+
+logger = logging.getLogger(__name__)
+
+EDB_ID_PATTERN = re.compile(r"/exploits/(\d+)")
+CVE_ID_PATTERN = re.compile(r"\bCVE-\d{4}-\d{4,}\b", re.IGNORECASE)
+TITLE_PATTERN = re.compile(r"^\[(?P<type>[^\]]+)\]\s*(?P<title>.+)$")
+ITEM_FIELDS = ("title", "link", "guid", "description", "pubDate")
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+def _rfc822_to_iso(value: str):
+    """Converts an RSS pubDate (RFC 822) to an ISO-8601 UTC string; None if it cannot be parsed."""
+    if not value:
+        return None
+    try:
+        parsed = email.utils.parsedate_to_datetime(value.strip())
+    except (TypeError, ValueError):
+        logger.debug("Unparseable Exploit-DB pubDate %r.", value)
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=datetime.timezone.utc)
+    return parsed.astimezone(datetime.timezone.utc).isoformat()
+
+def _date_to_iso(value: str):
+    """Converts a CSV date (YYYY-MM-DD) to an ISO-8601 UTC string; None if it cannot be parsed."""
+    if not value:
+        return None
+    try:
+        parsed = datetime.date.fromisoformat(value.strip())
+    except ValueError:
+        logger.debug("Unparseable Exploit-DB date %r.", value)
+        return None
+    return datetime.datetime(parsed.year, parsed.month, parsed.day, tzinfo=datetime.timezone.utc).isoformat()
+
+def normalize_exploitdb_item(fields: dict) -> dict:
+    """
+    Converts the text fields of one RSS <item> into the crawler's normalized record format.
+
+    Returns:
+        The record, or None if the item carries no Exploit-DB ID.
+    """
+    link = (fields.get("link") or fields.get("guid") or "").strip()
+    match = EDB_ID_PATTERN.search(link) or EDB_ID_PATTERN.search(fields.get("guid") or "")
+    if not match:
+        return None
+    edb_id = match.group(1)
+    title = (fields.get("title") or "").strip()
+    exploit_type = None
+    title_match = TITLE_PATTERN.match(title)
+    if title_match:
+        exploit_type, title = title_match.group("type").strip(), title_match.group("title").strip()
+    description = (fields.get("description") or "").strip() or title
+    published = _rfc822_to_iso(fields.get("pubDate"))
+    return {
+        "source": "Exploit-DB",
+        "id": f"EDB-ID:{edb_id}",
+        "title": title or f"EDB-ID:{edb_id}",
+        "description": description,
+        "severity": None,
+        "cvss_score": None,
+        "references": [link],
+        "published_date": published,
+        "last_modified_date": published,
+        "link": link or f"https://www.exploit-db.com/exploits/{edb_id}",
+        "exploit_type": exploit_type,
+        "cve_ids": sorted({cve.upper() for cve in CVE_ID_PATTERN.findall(f"{title} {description}")}),
+    }
+
+def normalize_exploitdb_csv_row(row: dict) -> dict:
+    """
+    Converts one row of the Exploit-DB CSV export (files_exploits.csv) into the same record format
+    as the RSS items.
+
+    Returns:
+        The record, or None if the row has no numeric id.
+    """
+    edb_id = (row.get("id") or "").strip()
+    if not edb_id.isdigit():
+        return None
+    title = (row.get("description") or "").strip()
+    published = _date_to_iso(row.get("date_published"))
+    link = f"https://www.exploit-db.com/exploits/{edb_id}"
+    return {
+        "source": "Exploit-DB",
+        "id": f"EDB-ID:{edb_id}",
+        "title": title or f"EDB-ID:{edb_id}",
+        "description": title or f"EDB-ID:{edb_id}",
+        "severity": None,
+        "cvss_score": None,
+        "references": [link],
+        "published_date": published,
+        "last_modified_date": _date_to_iso(row.get("date_updated")) or published,
+        "link": link,
+        "exploit_type": (row.get("type") or "").strip() or None,
+        "cve_ids": sorted({cve.upper() for cve in CVE_ID_PATTERN.findall(f"{row.get('codes') or ''} {title}")}),
+    }
+
+def iter_exploitdb_csv(stream):
+    """
+    Reads an Exploit-DB CSV export row by row, yielding one normalized record per exploit.
+
+    Args:
+        stream: Binary file object positioned at the header row (e.g. an open or decompressing file).
+    """
+    for row in csv.DictReader(io.TextIOWrapper(stream, encoding="utf-8", errors="replace", newline="")):
+        record = normalize_exploitdb_csv_row(row)
+        if record is not None:
+            yield record
+
+def iter_exploitdb_records(chunks):
+    """
+    Parses an Exploit-DB RSS feed incrementally, yielding one normalized record per <item>.
+
+    The feed is fed to an XMLPullParser chunk by chunk and every <item> is detached from the tree
+    once it has been read, so memory stays bounded by one chunk and one item however large the feed.
+
+    Args:
+        chunks: Iterable of bytes (or str) chunks of the feed, e.g. a file read in blocks.
+
+    Raises:
+        xml.etree.ElementTree.ParseError: If the feed is not well-formed XML.
+    """
+    parser = ET.XMLPullParser(events=("start", "end"))
+    open_elements = []
+
+    def drain():
+        for event, element in parser.read_events():
+            if event == "start":
+                open_elements.append(element)
+                continue
+            open_elements.pop()
+            if _local_name(element.tag) != "item":
+                continue
+            fields = {}
+            for child in element:
+                name = _local_name(child.tag)
+                if name in ITEM_FIELDS:
+                    fields[name] = child.text
+            if open_elements:
+                open_elements[-1].remove(element) # Detach the item so the tree never grows
+            record = normalize_exploitdb_item(fields)
+            if record is not None:
+                yield record
+
+    for chunk in chunks:
+        parser.feed(chunk)
+        yield from drain()
+    parser.close()
+    yield from drain()
+
+def _chunked(data, chunk_size: int):
+    for start in range(0, len(data), chunk_size):
+        yield data[start:start + chunk_size]
+
+def parse_exploitdb_feed(data, chunk_size: int = 64 * 1024) -> list:
+    """
+    Parses a complete feed held in memory (bytes or str).
+
+    Returns:
+        A list of normalized records.
+    """
+    return list(iter_exploitdb_records(_chunked(data, chunk_size)))
+
+def iter_exploitdb_file(path: str, chunk_size: int = 64 * 1024):
+    """
+    Streams the records of a feed stored on disk without loading the file.
+    """
+    with open(path, "rb") as f:
+        yield from iter_exploitdb_records(iter(lambda: f.read(chunk_size), b""))
@@ -0,0 +1,136 @@
+# advanced_security_script/modules/intelligence/keyword_matcher.py
+
+import logging
+import bisect
+import re
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FIELDS = ("id", "title", "description")
+FIELD_SEPARATOR = "\x00" # Joins the fields of a batch; never part of a keyword, so matches cannot span fields
+
+def _trie_pattern(words: list) -> str:
+    """
+    Builds a regular expression matching any of `words`, shaped like a prefix trie
+    (e.g. apache, apex, api -> ap(?:ache|ex|i)). Each position of the text is then tested against
+    one branch per distinct next character instead of against every keyword, and longer keywords
+    are tried before their prefixes.
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = None # End of a keyword
+
+    def build(node):
+        alternatives, single_chars = [], []
+        for char, child in sorted((k, v) for k, v in node.items() if k):
+            if child.keys() == {""}:
+                single_chars.append(re.escape(char))
+            else:
+                alternatives.append(re.escape(char) + build(child))
+        if single_chars:
+            alternatives.append(single_chars[0] if len(single_chars) == 1 else "[" + "".join(single_chars) + "]")
+        optional = "" in node
+        if len(alternatives) == 1 and not optional:
+            return alternatives[0]
+        group = "(?:" + "|".join(alternatives) + ")"
+        return group + "?" if optional else group
+
+    return build(trie)
+
+class KeywordMatcher:
+    def __init__(self, keywords: list, fields=DEFAULT_FIELDS):
+        """
+        Initializes the KeywordMatcher: a case-insensitive substring matcher for a keyword watchlist,
+        compiled once into a single trie-shaped regular expression over the lowercased keywords.
+        Args:
+            keywords (list): Keywords to look for; blank and duplicate (case-insensitive) entries are ignored.
+            fields (tuple, optional): Record fields searched for keywords.
+        """
+        self.fields = tuple(fields)
+        self.keywords = {} # lowercased keyword -> keyword as given
+        for keyword in keywords or []:
+            keyword = (keyword or "").strip()
+            if keyword and FIELD_SEPARATOR not in keyword:
+                self.keywords.setdefault(keyword.lower(), keyword)
+        self._pattern = self._ignorecase_pattern = None
+        if self.keywords:
+            pattern = _trie_pattern(list(self.keywords))
+            self._pattern = re.compile(pattern)
+            # Only for text whose lowercase form changes length (a few non-ASCII characters), where offsets
+            # in the lowercased text would not map back; IGNORECASE scanning is several times slower.
+            self._ignorecase_pattern = re.compile(pattern, re.IGNORECASE)
+        logger.debug("KeywordMatcher compiled %s keywords.", len(self.keywords))
+
+    def __len__(self):
+        return len(self.keywords)
+
+    def match_batch(self, records: list) -> list:
+        """
+        Matches a batch of records with one regex scan over their concatenated fields.
+
+        Matches do not overlap: where keywords overlap in the text (e.g. "sql" and "sql injection"),
+        the longest one starting first is reported.
+
+        Returns:
+            One list per record of matches {"keyword", "field", "start", "end"}; offsets are
+            relative to the field's text.
+        """
+        results = [[] for _ in records]
+        if self._pattern is None or not records:
+            return results
+        parts, offsets, owners = [], [], [] # owners[i] = (record index, field) of the part starting at offsets[i]
+        position = 0
+        for index, record in enumerate(records):
+            for field in self.fields:
+                text = record.get(field)
+                if not text:
+                    continue
+                text = str(text)
+                parts.append(text)
+                offsets.append(position)
+                owners.append((index, field))
+                position += len(text) + 1
+        text = FIELD_SEPARATOR.join(parts)
+        lowered = text.lower()
+        if len(lowered) == len(text):
+            matches = self._pattern.finditer(lowered)
+        else:
+            matches = self._ignorecase_pattern.finditer(text)
+        for match in matches:
+            start, end = match.span()
+            part = bisect.bisect_right(offsets, start) - 1
+            index, field = owners[part]
+            matched = match.group()
+            results[index].append({
+                "keyword": self.keywords.get(matched.lower(), matched),
+                "field": field,
+                "start": start - offsets[part],
+                "end": end - offsets[part],
+            })
+        return results
+
+    def filter_records(self, records: list, batch_size: int = 1000) -> list:
+        """
+        Keeps the records matching at least one keyword, recording their matches under "keyword_matches".
+        Without keywords every record is kept unchanged.
+
+        Args:
+            records (list): Normalized vulnerability records (updated in place).
+            batch_size (int, optional): Records scanned per regex pass.
+
+        Returns:
+            The matching records, in input order.
+        """
+        if self._pattern is None:
+            return list(records)
+        matched = []
+        for start in range(0, len(records), batch_size):
+            batch = records[start:start + batch_size]
+            for record, matches in zip(batch, self.match_batch(batch)):
+                if matches:
+                    record["keyword_matches"] = matches
+                    matched.append(record)
+        return matched
@@ -0,0 +1,298 @@
+# advanced_security_script/modules/intelligence/nvd_sync.py
+
+import logging
+import asyncio
+import collections
+import datetime
+import json
+import os
+from .cpe_index import extract_cpe_matches
+
+try:
+    import ijson # Optional: incremental parsing of NVD pages
+except ImportError:
+    ijson = None
+
+logger = logging.getLogger(__name__)
+
+# The NVD CVE API rejects modification-date ranges wider than this.
+NVD_MAX_DATE_RANGE_DAYS = 120
+NVD_MAX_RESULTS_PER_PAGE = 2000
+NVD_DATE_FORMAT = "%Y-%m-%dT%H:%M:%S:000 UTC-00:00"
+CVE_ITEM_PREFIX = "result.CVE_Items.item"
+PAGE_FIELDS = ("resultsPerPage", "startIndex", "totalResults")
+
+async def stream_cve_items(reader, on_items, batch_size: int = 100, chunk_size: int = 64 * 1024) -> dict:
+    """
+    Parses an NVD CVE API page incrementally (requires ijson), so only one batch of CVE items and
+    one chunk of the body are held in memory at a time instead of the whole decoded page.
+
+    The items and each page field are extracted by ijson's C-level item parsers. NVD sends the
+    page fields before "result", so their parsers are dropped after the first chunk or so.
+
+    Args:
+        reader: Object with a coroutine read(n) returning bytes (b"" at the end), e.g. aiohttp's response.content.
+        on_items: Callable (sync or async) receiving each batch (list) of raw CVE items.
+        batch_size: Maximum number of items per batch.
+        chunk_size: Number of bytes read at a time.
+
+    Returns:
+        The page fields found (totalResults, startIndex, resultsPerPage) plus "itemCount",
+        the number of items delivered.
+
+    Raises:
+        ijson.JSONError: If the body is not valid JSON.
+    """
+    items = ijson.sendable_list()
+    items_parser = ijson.items_coro(items, CVE_ITEM_PREFIX, use_float=True)
+    field_values = {name: ijson.sendable_list() for name in PAGE_FIELDS}
+    field_parsers = {name: ijson.items_coro(field_values[name], name) for name in PAGE_FIELDS}
+    count = 0
+
+    async def deliver(batch):
+        result = on_items(batch)
+        if asyncio.iscoroutine(result):
+            await result
+
+    while True:
+        chunk = await reader.read(chunk_size)
+        if not chunk:
+            break
+        for name in list(field_parsers):
+            field_parsers[name].send(chunk)
+            if field_values[name]:
+                del field_parsers[name] # Found; the rest of the body is not needed for this field
+        items_parser.send(chunk)
+        while len(items) >= batch_size:
+            batch = items[:batch_size]
+            del items[:batch_size]
+            count += len(batch)
+            await deliver(batch)
+    items_parser.close() # Raises on a truncated body
+    for parser in field_parsers.values():
+        parser.close()
+    if items:
+        count += len(items)
+        await deliver(list(items))
+    page = {name: values[0] for name, values in field_values.items() if values}
+    page["itemCount"] = count
+    return page
+
+def normalize_nvd_item(cve_item: dict) -> dict:
+    """
+    Converts a raw NVD `CVE_Items` entry into the crawler's normalized record format.
+    """
+    cve_id = cve_item.get("cve", {}).get("CVE_data_meta", {}).get("ID")
+    description = "N/A"
+    if cve_item.get("cve", {}).get("description", {}).get("description_data"):
+        description = cve_item["cve"]["description"]["description_data"][0]["value"]
+    # Prefer CVSS v3 metrics, fall back to v2 for older CVEs
+    impact = cve_item.get("impact", {})
+    cvss_v3 = impact.get("baseMetricV3", {}).get("cvssV3", {})
+    cvss_v2 = impact.get("baseMetricV2", {})
+    if cvss_v3:
+        cvss_score, severity = cvss_v3.get("baseScore"), cvss_v3.get("baseSeverity")
+    else:
+        cvss_score, severity = cvss_v2.get("cvssV2", {}).get("baseScore"), cvss_v2.get("severity")
+    references = [ref.get("url") for ref in cve_item.get("cve", {}).get("references", {}).get("reference_data", []) if ref.get("url")]
+    return {
+        "source": "NVD",
+        "id": cve_id,
+        "title": cve_id,
+        "description": description,
+        "severity": severity,
+        "cvss_score": cvss_score,
+        "references": references,
+        "published_date": cve_item.get("publishedDate"),
+        "last_modified_date": cve_item.get("lastModifiedDate"),
+        "link": f"https://nvd.nist.gov/vuln/detail/{cve_id}",
+        "cpe_matches": extract_cpe_matches(cve_item),
+    }
+
+class NVDSyncEngine:
+    def __init__(self, config, fetch_page, state_path=None, stream_page=None):
+        """
+        Initializes the NVDSyncEngine.
+        Walks the paginated NVD CVE API with a bounded window of concurrent page requests
+        and persists a `lastModified` watermark so subsequent runs only fetch the delta.
+        Args:
+            config: Configuration object (from ConfigManager).
+            fetch_page: Coroutine function taking a dict of query params and returning the
+                        decoded JSON page (dict) or None on failure.
+            state_path (str, optional): Path of the JSON file holding the sync watermark.
+            stream_page (callable, optional): Coroutine function (params, on_items) used instead of
+                                              fetch_page. It hands the page's CVE items to on_items
+                                              as they are parsed and returns the page fields
+                                              (see stream_cve_items), or None on failure.
+        """
+        self.config = config
+        self.fetch_page = fetch_page
+        self.stream_page = stream_page
+        self.state_path = state_path or self.config.get("vulnerability_crawler", "nvd_sync_state_path")
+        self.results_per_page = min(
+            int(self.config.get("vulnerability_crawler", "nvd_results_per_page")),
+            NVD_MAX_RESULTS_PER_PAGE,
+        )
+        self.max_concurrent_pages = max(1, int(self.config.get("vulnerability_crawler", "nvd_max_concurrent_pages")))
+
+    def load_state(self) -> dict:
+        """
+        Loads the persisted sync state.
+
+        Returns:
+            The state dictionary, or an empty dict if no previous sync completed.
+        """
+        try:
+            with open(self.state_path, "r") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.error("Could not read NVD sync state %s: %s. Falling back to a full sync.", self.state_path, e)
+            return {}
+
+    def save_state(self, state: dict):
+        """
+        Atomically persists the sync state (write to a temp file, then rename).
+        """
+        state_dir = os.path.dirname(self.state_path)
+        if state_dir:
+            os.makedirs(state_dir, exist_ok=True)
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.state_path)
+
+    @staticmethod
+    def _date_windows(start: datetime.datetime, end: datetime.datetime) -> list:
+        """
+        Splits [start, end] into windows no wider than the NVD maximum date range.
+        """
+        windows = []
+        max_range = datetime.timedelta(days=NVD_MAX_DATE_RANGE_DAYS)
+        window_start = start
+        while window_start < end:
+            window_end = min(window_start + max_range, end)
+            windows.append((window_start, window_end))
+            window_start = window_end
+        return windows
+
+    async def _walk_pages(self, base_params: dict, on_page) -> tuple:
+        """
+        Fetches every page for one query, keeping at most `max_concurrent_pages` requests in flight.
+
+        Returns:
+            A tuple (items_seen, pages_fetched, complete).
+        """
+        first_params = dict(base_params, startIndex=0, resultsPerPage=self.results_per_page)
+        first_page, items_seen = await self._fetch(first_params, on_page)
+        if first_page is None:
+            logger.error("NVD sync aborted: first page could not be fetched (params %s).", first_params)
+            return 0, 0, False
+
+        total_results = int(first_page.get("totalResults", 0))
+        pages_fetched = 1
+        complete = True
+
+        pending_indexes = collections.deque(range(self.results_per_page, total_results, self.results_per_page))
+        logger.info("NVD sync: %s results across %s pages.", total_results, len(pending_indexes) + 1)
+
+        in_flight = set()
+        while pending_indexes or in_flight:
+            while pending_indexes and len(in_flight) < self.max_concurrent_pages:
+                start_index = pending_indexes.popleft()
+                params = dict(base_params, startIndex=start_index, resultsPerPage=self.results_per_page)
+                in_flight.add(asyncio.ensure_future(self._fetch_indexed(start_index, params, on_page)))
+            done, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                start_index, page, items = task.result()
+                if page is None:
+                    logger.error("NVD sync: page at startIndex %s failed; watermark will not advance.", start_index)
+                    complete = False
+                    continue
+                items_seen += items
+                pages_fetched += 1
+        return items_seen, pages_fetched, complete
+
+    async def _fetch(self, params: dict, on_page) -> tuple:
+        """
+        Fetches one page and hands its items to on_page.
+
+        Returns:
+            A tuple (page, item_count); page is None if the fetch failed.
+        """
+        if self.stream_page is not None:
+            page = await self.stream_page(params, lambda items: self._deliver(items, on_page))
+            return (page, page.get("itemCount", 0)) if isinstance(page, dict) else (None, 0)
+        page = await self.fetch_page(params)
+        if not isinstance(page, dict):
+            return None, 0
+        items = page.get("result", {}).get("CVE_Items", [])
+        await self._deliver(items, on_page)
+        return page, len(items)
+
+    async def _fetch_indexed(self, start_index: int, params: dict, on_page) -> tuple:
+        return (start_index, *await self._fetch(params, on_page))
+
+    @staticmethod
+    async def _deliver(items: list, on_page):
+        if on_page and items:
+            result = on_page(items)
+            if asyncio.iscoroutine(result):
+                await result
+
+    async def sync(self, on_page=None, full: bool = False) -> dict:
+        """
+        Runs a sync against the NVD API.
+
+        On the first run (or with full=True) every page is fetched. Afterwards only CVEs
+        modified since the persisted watermark are requested. The watermark advances only
+        when every page of the run was fetched successfully.
+
+        Args:
+            on_page: Optional callable (sync or async) invoked with the list of raw CVE items
+                     of each page as it arrives.
+            full: Ignore the persisted watermark and fetch the whole dataset.
+
+        Returns:
+            A summary dictionary with counts, completeness and the watermark in effect.
+        """
+        state = {} if full else self.load_state()
+        sync_started_at = datetime.datetime.now(datetime.timezone.utc).replace(microsecond=0)
+
+        watermark = state.get("last_modified_watermark")
+        if watermark:
+            since = datetime.datetime.fromisoformat(watermark)
+            windows = self._date_windows(since, sync_started_at)
+            logger.info("NVD delta sync since %s (%s date window(s)).", watermark, len(windows))
+        else:
+            windows = [None]
+            logger.info("NVD full sync (no watermark persisted).")
+
+        items_seen, pages_fetched, complete = 0, 0, True
+        for window in windows:
+            params = {}
+            if window:
+                params["modStartDate"] = window[0].strftime(NVD_DATE_FORMAT)
+                params["modEndDate"] = window[1].strftime(NVD_DATE_FORMAT)
+            window_items, window_pages, window_complete = await self._walk_pages(params, on_page)
+            items_seen += window_items
+            pages_fetched += window_pages
+            complete = complete and window_complete
+
+        if complete:
+            state = {
+                "last_modified_watermark": sync_started_at.isoformat(),
+                "last_sync_items": items_seen,
+                "last_sync_pages": pages_fetched,
+            }
+            self.save_state(state)
+
+        logger.info("NVD sync finished: %s items in %s pages (complete=%s).", items_seen, pages_fetched, complete)
+        return {
+            "items": items_seen,
+            "pages": pages_fetched,
+            "complete": complete,
+            "delta": bool(watermark),
+            "watermark": state.get("last_modified_watermark"),
+        }
@@ -0,0 +1,236 @@
+# advanced_security_script/modules/intelligence/record_merger.py
+
+import logging
+import hashlib
+import json
+import re
+from .exploitdb_feed import EDB_ID_PATTERN
+from .vulnerability_store import MERGE_KEYS, normalize_timestamp
+
+try:
+    import orjson # Optional: faster fingerprints of merged records
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+CVE_ID = re.compile(r"^CVE-\d{4}-\d{4,}$", re.IGNORECASE)
+DEFAULT_SOURCE_PRIORITY = ("NVD", "Exploit-DB")
+MISSING_VALUES = (None, "", "N/A", [], {})
+# Member key source of stored merged rows: each stored field ranks as the source it came from
+# (see provenance), behind a fresh record of that source
+STORED = "stored"
+
+def _edb_references(record: dict) -> set:
+    """EDB-IDs an NVD record cross-references through exploit-db.com links."""
+    ids = set()
+    for url in record.get("references") or []:
+        if url and "exploit-db.com" in url:
+            match = EDB_ID_PATTERN.search(url)
+            if match:
+                ids.add(f"EDB-ID:{match.group(1)}")
+    return ids
+
+def _marker(value):
+    """Hashable form of a list item: flat dicts (e.g. CPE matches) as sorted items, other containers as JSON."""
+    if isinstance(value, dict):
+        try:
+            marker = tuple(sorted(value.items()))
+            hash(marker)
+            return marker
+        except TypeError:
+            pass
+    elif not isinstance(value, list):
+        return value
+    return json.dumps(value, sort_keys=True, default=str)
+
+def _fingerprint(merged: dict) -> str:
+    if orjson is not None:
+        return hashlib.sha1(orjson.dumps(merged, default=str, option=orjson.OPT_SORT_KEYS)).hexdigest()
+    return hashlib.sha1(json.dumps(merged, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+def _union(values: list) -> list:
+    """Concatenates lists, dropping repeated items (unhashable items are compared by their JSON form)."""
+    seen, merged = set(), []
+    for value in values:
+        marker = _marker(value)
+        if marker not in seen:
+            seen.add(marker)
+            merged.append(value)
+    return merged
+
+class RecordMerger:
+    def __init__(self, source_priority=DEFAULT_SOURCE_PRIORITY):
+        """
+        Initializes the RecordMerger: consolidates records of the same vulnerability reported by
+        different sources into one record, keyed on its canonical ID.
+
+        Records are grouped by CVE ID. NVD records define the group of their CVE; Exploit-DB records
+        join the groups of the CVEs they name (cve_ids) or of the NVD records that reference them
+        (exploit-db.com links). Records that cannot be tied to a CVE keep a group of their own
+        until a cross-reference shows up. Distinct CVEs are never merged.
+        Args:
+            source_priority (iterable, optional): Sources in decreasing order of authority. A merged
+                                                  field takes the value of the highest-priority source
+                                                  that has one; unknown sources rank last.
+        """
+        self.source_priority = {source: rank for rank, source in enumerate(source_priority)}
+        self._groups = {}         # canonical id -> {"members": {(source, id): record}, "merged": dict, "fingerprint": str}
+        self._aliases = {}        # EDB-ID -> CVE ids whose NVD record references it
+        self._member_groups = {}  # (source, id) -> canonical ids the record is merged into
+
+    def __len__(self):
+        return len(self._groups)
+
+    def get(self, vuln_id: str) -> dict:
+        """Returns the merged record of a canonical ID, or None."""
+        group = self._groups.get(vuln_id.upper() if CVE_ID.match(vuln_id) else vuln_id)
+        return group["merged"] if group else None
+
+    def related_ids(self, records: list) -> set:
+        """
+        Canonical IDs the records can merge into that the merger holds no group for: their own IDs,
+        the CVEs they name and the Exploit-DB entries they reference. Their stored rows are the
+        `stored` argument of merge.
+        """
+        ids = set()
+        for record in records:
+            vuln_id = record.get("id")
+            if not vuln_id:
+                continue
+            if CVE_ID.match(vuln_id):
+                ids.add(vuln_id.upper())
+                ids.update(_edb_references(record))
+            else:
+                ids.add(vuln_id)
+            ids.update(cve.upper() for cve in record.get("cve_ids") or [] if CVE_ID.match(cve))
+        return ids - self._groups.keys()
+
+    def _targets(self, record: dict) -> set:
+        vuln_id = record["id"]
+        if CVE_ID.match(vuln_id):
+            return {vuln_id.upper()}
+        cve_ids = {cve.upper() for cve in record.get("cve_ids") or [] if CVE_ID.match(cve)}
+        return cve_ids or set(self._aliases.get(vuln_id, ())) or {vuln_id}
+
+    def _place(self, record: dict, touched: dict, retired: set, member_key: tuple = None):
+        member_key = member_key or (record.get("source"), record["id"])
+        targets = self._targets(record)
+        for key in self._member_groups.get(member_key, set()) - targets:
+            group = self._groups[key]
+            del group["members"][member_key]
+            touched[key] = None
+            if not group["members"]:
+                del self._groups[key]
+                if group["fingerprint"] is not None:
+                    retired.add(key)
+        for key in targets:
+            self._groups.setdefault(key, {"members": {}, "merged": None, "fingerprint": None})["members"][member_key] = record
+            touched[key] = None
+            retired.discard(key)
+        self._member_groups[member_key] = targets
+
+        if CVE_ID.match(record["id"]):
+            for edb_id in _edb_references(record):
+                self._aliases.setdefault(edb_id, set()).add(record["id"].upper())
+                standalone = self._groups.get(edb_id)
+                if standalone is not None:
+                    # The exploit had no known CVE so far; move it into this CVE's group
+                    for member_key, member in list(standalone["members"].items()):
+                        self._place(member, touched, retired, member_key)
+
+    def _rank(self, member_key: tuple) -> tuple:
+        source, vuln_id = member_key
+        if source == STORED:
+            return (len(self.source_priority) + 1, "", vuln_id)
+        return (self.source_priority.get(source, len(self.source_priority)), source or "", vuln_id)
+
+    def _build(self, key: str, members: dict) -> tuple:
+        keys = sorted(members, key=self._rank)
+        ordered = [members[member_key] for member_key in keys]
+        labels = [(record.get("provenance") or {}) if source == STORED else {} for (source, _), record in zip(keys, ordered)]
+        rank = lambda source: self.source_priority.get(source, len(self.source_priority))
+        merged, provenance = {"id": key}, {}
+        fields = dict.fromkeys(field for record in ordered for field in record if field not in MERGE_KEYS and field != "id")
+        for field in fields:
+            # A stored value ranks as the source it came from; stored rows come last, so a fresh
+            # record of that source wins the tie (the sort is stable)
+            values = sorted(((record, record.get(field), label.get(field, record.get("source"))) for record, label in zip(ordered, labels)),
+                            key=lambda value: rank(value[2]))
+            if field == "last_modified_date":
+                dated = [(normalize_timestamp(value), origin) for _, value, origin in values if value]
+                dated = [(stamp, origin) for stamp, origin in dated if stamp]
+                if dated:
+                    merged[field], provenance[field] = max(dated, key=lambda pair: pair[0])
+                continue
+            if any(isinstance(value, list) for _, value, _ in values):
+                merged[field] = _union([item for _, value, _ in values if isinstance(value, list) for item in value])
+                continue
+            for record, value, origin in values:
+                # A title that merely repeats the record's ID (as NVD's do) is not informative
+                if value in MISSING_VALUES or (field == "title" and value == record["id"]):
+                    continue
+                merged[field], provenance[field] = value, origin
+                break
+            else:
+                merged[field] = values[0][1]
+        # Stored rows stand for every source and alias merged into them so far
+        sources = _union([source for (member_source, _), record in zip(keys, ordered)
+                          for source in (record.get("sources") or [record.get("source")] if member_source == STORED else [member_source])])
+        merged["sources"] = sorted(sources, key=rank)
+        if merged["sources"]:
+            merged["source"] = provenance["source"] = merged["sources"][0]
+        aliases = {record["id"] for record in ordered}.union(*(record.get("aliases") or () for (source, _), record in zip(keys, ordered) if source == STORED))
+        merged["aliases"] = sorted(aliases - {key})
+        merged["provenance"] = provenance
+        return merged, _fingerprint(merged)
+
+    def merge(self, records: list, stored: list = None) -> dict:
+        """
+        Folds records into the index.
+
+        Args:
+            records (list): Normalized records; records without an "id" are ignored.
+            stored (list, optional): Merged records already written to the store for the canonical IDs
+                                     the records touch (see related_ids). They join the groups as
+                                     members of their own, so the records build on the stored
+                                     values instead of replacing them, and count as already emitted.
+
+        Returns:
+            A dictionary with:
+            - "changed": merged records whose content changed (new groups included), in arrival order;
+            - "retired": canonical IDs emitted before that no longer exist because their records moved
+              into another group (e.g. an EDB-ID merged into its CVE);
+            - "ids": canonical IDs of the groups the records touched, changed or not.
+        """
+        touched, retired = {}, set() # touched is a dict used as an insertion-ordered set
+        seeded = {}
+        for record in stored or ():
+            # Seeded under a key of its own: a fresh record of the same source builds on the row
+            # (lists are unioned, fields it lacks fall back to the row) instead of replacing it
+            member_key = (STORED, record["id"])
+            if member_key not in self._member_groups and (record.get("source"), record["id"]) not in self._member_groups:
+                self._place(record, seeded, retired, member_key)
+                if record["id"] not in self._member_groups[member_key]:
+                    retired.add(record["id"]) # Stored on its own, but belongs to a known CVE
+        for record in stored or ():
+            group = self._groups.get(record["id"])
+            if group is not None and group["fingerprint"] is None:
+                # Emitted before, as stored; members it gained since make it change
+                group["merged"], group["fingerprint"] = self._build(record["id"], {(STORED, record["id"]): record})
+        for record in records:
+            if record.get("id"):
+                self._place(record, touched, retired)
+        changed, ids = [], []
+        for key in {**seeded, **touched}:
+            group = self._groups.get(key)
+            if group is None:
+                continue
+            if key in touched:
+                ids.append(key)
+            merged, fingerprint = self._build(key, group["members"])
+            if fingerprint != group["fingerprint"]:
+                group["merged"], group["fingerprint"] = merged, fingerprint
+                changed.append(merged)
+        logger.debug("Merged %s records: %s changed, %s retired, %s groups.", len(records), len(changed), len(retired), len(self._groups))
+        return {"changed": changed, "retired": sorted(retired), "ids": ids}
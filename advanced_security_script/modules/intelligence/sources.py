@@ -0,0 +1,89 @@
+# advanced_security_script/modules/intelligence/sources.py
+
+import logging
+import abc
+import asyncio
+import xml.etree.ElementTree as ET
+from .exploitdb_feed import parse_exploitdb_feed
+from .nvd_sync import normalize_nvd_item
+
+logger = logging.getLogger(__name__)
+
+class VulnerabilitySource(abc.ABC):
+    """
+    A source crawled by VulnerabilityCrawler.crawl_vulnerabilities. Each source fetches its own
+    raw data and parses it into normalized records; the crawler only schedules the sources and
+    filters, stores and collects their records. Register instances with
+    VulnerabilityCrawler.register_source.
+    """
+    key = None          # Registry key; also the key of the source's `vulnerability_crawler.rate_limits` entry
+    name = None         # Display name used in logs and for throttling
+    url_setting = None  # `vulnerability_crawler` setting holding the URL
+    default_url = None
+
+    def __init__(self, url: str):
+        self.url = url
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(config.get("vulnerability_crawler", cls.url_setting, default=cls.default_url))
+
+    def request_params(self, keywords: list, max_results: int) -> dict:
+        """Query parameters of the crawl request (None for a plain GET of the URL)."""
+        return None
+
+    async def fetch(self, crawler, session, keywords: list, max_results: int):
+        """
+        Fetches the raw data of one crawl. The default is a single throttled, cached GET through
+        crawler.fetch_from_source.
+
+        Returns:
+            The decoded response, or None if the fetch failed.
+        """
+        return await crawler.fetch_from_source(session, self.name, self.url, params=self.request_params(keywords, max_results))
+
+    @abc.abstractmethod
+    async def parse(self, data) -> list:
+        """
+        Converts fetched data into normalized records. CPU-heavy parsers should run on an executor.
+        """
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.url!r})"
+
+class NVDSource(VulnerabilitySource):
+    key = "nvd"
+    name = "NVD"
+    url_setting = "nvd_api_url"
+    default_url = "https://services.nvd.nist.gov/rest/json/cves/1.0"
+
+    def request_params(self, keywords: list, max_results: int) -> dict:
+        # Most recent CVEs. Full walks use sync_nvd.
+        params = {"resultsPerPage": max_results}
+        if keywords and len(keywords) == 1:
+            # The API searches for one phrase; a watchlist is matched locally by the crawler instead
+            params["keyword"] = keywords[0]
+        return params
+
+    async def parse(self, data) -> list:
+        if not isinstance(data, dict):
+            return []
+        return [normalize_nvd_item(item) for item in data.get("result", {}).get("CVE_Items", [])]
+
+class ExploitDBRSSSource(VulnerabilitySource):
+    key = "exploit_db_rss"
+    name = "Exploit-DB RSS"
+    url_setting = "exploit_db_rss"
+    default_url = "https://www.exploit-db.com/rss.xml"
+
+    async def parse(self, data) -> list:
+        if not isinstance(data, str):
+            return []
+        try:
+            return await asyncio.get_running_loop().run_in_executor(None, parse_exploitdb_feed, data)
+        except ET.ParseError as e:
+            logger.error("Malformed Exploit-DB RSS feed: %s", e)
+            return []
+
+# Sources every crawler starts with, in registration order.
+DEFAULT_SOURCES = (NVDSource, ExploitDBRSSSource)
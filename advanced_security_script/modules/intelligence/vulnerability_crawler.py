@@ -3,133 +3,464 @@
 import logging
 import asyncio
 import aiohttp
+import contextlib
+import datetime
 import json
+import re
+import threading
+import weakref
+from . import nvd_sync
+from .bulk_feeds import detect_feed_kind, drain_feed_queue, expand_feed_paths, init_feed_worker, next_feed_message, parse_feed_to_queue
+from .keyword_matcher import KeywordMatcher
+from .nvd_sync import NVDSyncEngine, normalize_nvd_item, stream_cve_items
+from .record_merger import RecordMerger
+from .sources import DEFAULT_SOURCES
+from ...core.logger_manager import StructuredMessage
+from ...core.process_pool import SPAWN_CONTEXT, spawn_process_pool
+from ...core.rate_limiter import SourceThrottle, parse_retry_after
+from ...core.http_cache import HttpCache
 # from bs4 import BeautifulSoup # For parsing HTML if direct APIs are not available for all sources
 
 logger = logging.getLogger(__name__)
 
+# Request budget per source, keyed like the entries of `vulnerability_crawler.rate_limits` (which
+# override these). Without an API key NVD allows 5 requests per rolling 30 seconds and answers 403
+# once the quota is exceeded.
+DEFAULT_RATE_LIMITS = {
+    "nvd": {"requests_per_second": 5 / 30, "burst": 5, "max_concurrency": 4, "throttle_statuses": [403, 429, 503]},
+}
+GENERIC_RATE_LIMIT = {"requests_per_second": 2.0, "burst": 5, "max_concurrency": 4, "throttle_statuses": [429, 503]}
+
+# Source throttles per event loop, keyed by source key. Workflows build a crawler per crawl step but
+# share the orchestrator's loop, so every crawler on it draws from one budget per source. (The
+# concurrency limiter waits on an asyncio condition, which cannot be shared between loops.)
+_shared_throttles = weakref.WeakKeyDictionary()
+_shared_throttles_lock = threading.Lock()
+
+def source_key(source_name: str) -> str:
+    """Maps a display name such as "Exploit-DB RSS" to its config key ("exploit_db_rss")."""
+    return re.sub(r"[^a-z0-9]+", "_", source_name.lower()).strip("_")
+
 class VulnerabilityCrawler:
-    def __init__(self, config, data_manager):
+    def __init__(self, config, data_manager, store=None, http_client=None):
         """
         Initializes the VulnerabilityCrawler.
         Args:
             config: Configuration object (from ConfigManager).
             data_manager: DataManager instance to potentially store crawled data or access API keys.
+            store (VulnerabilityStore, optional): Persistent store that crawled records are written to.
+            http_client (HttpClientManager, optional): Provides the shared, pooled HTTP session.
+                                                       Without it, every crawl opens its own session.
         """
         self.config = config
         self.data_manager = data_manager
-        self.sources = {
-            "nvd": self.config.get("vulnerability_crawler", "nvd_api_url", default="https://services.nvd.nist.gov/rest/json/cves/1.0"),
-            # Add more sources like CVEmitre, Exploit-DB (might need web scraping or specific APIs)
-            "exploit_db_rss": self.config.get("vulnerability_crawler", "exploit_db_rss", default="https://www.exploit-db.com/rss.xml"),
-        }
+        self.store = store
+        self.http_client = http_client
+        self.http_cache = None
+        if self.config.get("vulnerability_crawler", "http_cache_enabled"):
+            self.http_cache = HttpCache(
+                self.config.get("vulnerability_crawler", "http_cache_dir"),
+                max_bytes=self.config.get("vulnerability_crawler", "http_cache_max_bytes"),
+            )
+        # Consolidates the records of all crawls by this crawler, keyed on canonical (CVE) IDs. The
+        # store holds the result of earlier crawls (see _merge_into_store).
+        self.source_priority = self.config.get("vulnerability_crawler", "source_priority")
+        self.merger = RecordMerger(self.source_priority)
+        self.sources = {} # key -> VulnerabilitySource, crawled in registration order
+        for source_class in DEFAULT_SOURCES:
+            self.register_source(source_class.from_config(self.config))
         logger.info("VulnerabilityCrawler initialized.")
 
-    async def fetch_from_source(self, session, source_name, url, params=None):
+    def register_source(self, source):
+        """
+        Adds a source to crawl_vulnerabilities, replacing any source registered under the same key.
+
+        Args:
+            source (VulnerabilitySource): The source; sources without a URL are skipped when crawling.
+        """
+        self.sources[source.key] = source
+
+    @contextlib.asynccontextmanager
+    async def _session(self):
+        """
+        Yields the shared session of the HTTP client manager (left open for later runs), or a
+        session private to this call when the crawler has no manager.
+        """
+        if self.http_client is not None:
+            yield await self.http_client.get_session()
+            return
+        async with aiohttp.ClientSession() as session:
+            yield session
+
+    def _throttle(self, source_name: str) -> SourceThrottle:
+        """
+        Returns the throttle of a source, shared by every crawler on the running event loop. It is
+        built on first use from DEFAULT_RATE_LIMITS and the `rate_limits`, `max_retries`,
+        `retry_backoff_base` and `retry_backoff_max` settings of the crawler that first needs it.
+        """
+        key = source_key(source_name)
+        with _shared_throttles_lock:
+            throttles = _shared_throttles.setdefault(asyncio.get_running_loop(), {})
+            if key not in throttles:
+                configured = self.config.get("vulnerability_crawler", "rate_limits", default=None) or {}
+                limits = dict(DEFAULT_RATE_LIMITS.get(key, GENERIC_RATE_LIMIT), **(configured.get(key) or {}))
+                throttles[key] = SourceThrottle(
+                    source_name,
+                    max_retries=self.config.get("vulnerability_crawler", "max_retries"),
+                    backoff_base=self.config.get("vulnerability_crawler", "retry_backoff_base"),
+                    backoff_max=self.config.get("vulnerability_crawler", "retry_backoff_max"),
+                    **limits,
+                )
+            return throttles[key]
+
+    async def fetch_from_source(self, session, source_name, url, params=None, consume=None):
+        """
+        Fetches data from a single source URL within the source's rate and concurrency limits.
+        Throttling responses and transient failures (5xx, connection errors, timeouts) are retried
+        with exponential backoff and jitter, never sooner than the server's Retry-After.
+        Responses with an ETag or Last-Modified header are kept in the HTTP cache; later fetches
+        are conditional and a 304 answer is served from the cache.
+
+        Args:
+            consume: Optional coroutine function (response) -> result that reads the body
+                     incrementally instead of buffering it (bypasses the HTTP cache). Its result is
+                     returned. Transfer errors it raises are retried with a new response, so a
+                     consume that has already passed data on must handle them itself.
+
+        Returns:
+            The decoded JSON (dict) or feed text (str), the result of consume, or None if the fetch failed.
+        """
+        throttle = self._throttle(source_name)
+        loop = asyncio.get_running_loop()
+        cached = None
+        if self.http_cache is not None and consume is None:
+            cached = await loop.run_in_executor(None, self.http_cache.lookup, url, params)
+        headers = HttpCache.conditional_headers(cached)
+        for attempt in range(throttle.max_retries + 1):
+            retry_after = None
+            try:
+                async with throttle.slot():
+                    logger.debug(StructuredMessage("Fetching data", source=source_name, url=url, params=params, attempt=attempt + 1))
+                    async with session.get(url, params=params, headers=headers, timeout=30) as response:
+                        if response.status == 304 and cached is not None:
+                            throttle.record_success()
+                            logger.debug("%s not modified; serving cached response.", source_name)
+                            return self._decode_body(source_name, cached["content_type"], cached["charset"], cached["body"])
+                        if response.status in throttle.retry_statuses:
+                            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                            if response.status in throttle.throttle_statuses:
+                                throttle.record_throttled(retry_after)
+                            error = f"HTTP {response.status}"
+                        else:
+                            response.raise_for_status() # Remaining HTTP errors are not worth retrying
+                            if consume is not None:
+                                result = await consume(response)
+                                throttle.record_success()
+                                return result
+                            body = await response.read()
+                            throttle.record_success()
+                            if self.http_cache is not None:
+                                await loop.run_in_executor(None, self.http_cache.store, url, params, response.headers,
+                                                           response.content_type, response.charset, body)
+                            return self._decode_body(source_name, response.content_type, response.charset, body)
+            except aiohttp.ClientResponseError as e:
+                logger.error("Error fetching from %s (%s): %s", source_name, url, e)
+                return None
+            except aiohttp.ClientError as e:
+                error = str(e) or type(e).__name__
+            except asyncio.TimeoutError:
+                error = "timeout"
+            if attempt == throttle.max_retries:
+                break
+            delay = throttle.backoff_delay(attempt, retry_after)
+            logger.warning("Fetching from %s failed (%s); retry %s/%s in %.1fs.", source_name, error, attempt + 1, throttle.max_retries, delay)
+            await asyncio.sleep(delay)
+        logger.error("Giving up on %s (%s) after %s attempt(s): %s", source_name, url, throttle.max_retries + 1, error)
+        return None
+
+    @staticmethod
+    def _decode_body(source_name, content_type, charset, body: bytes):
+        if "json" in content_type:
+            try:
+                return json.loads(body)
+            except ValueError as e:
+                logger.error("Invalid JSON from %s: %s", source_name, e)
+                return None
+        elif "xml" in content_type or "rss" in content_type:
+            # Feeds are returned as text; the source's parse() turns them into records
+            return body.decode(charset or "utf-8", errors="replace")
+        logger.warning("Unsupported content type %s from %s", content_type, source_name)
+        return None
+
+    async def sync_nvd(self, full: bool = False, on_records=None) -> dict:
+        """
+        Incrementally syncs the NVD dataset, walking every result page.
+
+        The first run (or full=True) ingests the whole dataset; later runs only fetch CVEs
+        modified since the watermark persisted by the previous successful sync.
+
+        Args:
+            full: Ignore the persisted watermark and re-crawl everything.
+            on_records: Optional callable (sync or async) receiving normalized records page by page,
+                        or in batches of `nvd_stream_batch_size` when pages are parsed incrementally.
+                        When omitted, records are accumulated and returned in the summary.
+                        Records are also merged into the crawler's store, if one is configured.
+
+        Returns:
+            The sync summary from NVDSyncEngine, plus a "records" list when on_records is None.
+        """
+        collected = []
+
+        async def handle_page(cve_items):
+            records = [normalize_nvd_item(item) for item in cve_items]
+            if self.store is not None:
+                # A merger per page: the store carries the merged state, so memory stays flat over a full sync
+                await self._merge_into_store(RecordMerger(self.source_priority), records)
+            if on_records is None:
+                collected.extend(records)
+                return
+            result = on_records(records)
+            if asyncio.iscoroutine(result):
+                await result
+
+        streaming = self.config.get("vulnerability_crawler", "nvd_streaming")
+        if streaming and nvd_sync.ijson is None:
+            logger.info("ijson is not installed; NVD pages are decoded in full.")
+            streaming = False
+        batch_size = self.config.get("vulnerability_crawler", "nvd_stream_batch_size")
+
+        async with self._session() as session:
+            async def fetch_page(params):
+                return await self.fetch_from_source(session, "NVD", self.sources["nvd"].url, params=params)
+
+            async def stream_page(params, on_items):
+                delivered = 0
+
+                async def deliver(items):
+                    nonlocal delivered
+                    delivered += len(items)
+                    result = on_items(items)
+                    if asyncio.iscoroutine(result):
+                        await result
+
+                async def consume(response):
+                    try:
+                        return await stream_cve_items(response.content, deliver, batch_size=batch_size)
+                    except nvd_sync.ijson.JSONError as e:
+                        logger.error("Invalid JSON in NVD page (params %s): %s", params, e)
+                        return None
+                    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                        if not delivered:
+                            raise # Nothing handed on yet: fetch_from_source retries the page
+                        # A retry would deliver the first items again; the page fails instead and
+                        # the watermark stays put, so the next sync fetches it again.
+                        logger.error("NVD page (params %s) broke off after %s item(s): %s", params, delivered, e)
+                        return None
+                return await self.fetch_from_source(session, "NVD", self.sources["nvd"].url, params=params, consume=consume)
+
+            engine = NVDSyncEngine(self.config, fetch_page, stream_page=stream_page if streaming else None)
+            summary = await engine.sync(on_page=handle_page, full=full)
+
+        if on_records is None:
+            summary["records"] = collected
+        return summary
+
+    async def ingest_bulk_feeds(self, paths: list, workers: int = None, on_records=None, update_watermark: bool = True) -> dict:
+        """
+        Ingests local bulk feed files offline: NVD JSON year feeds and Exploit-DB CSV exports, plain
+        or compressed (.gz, .zip). Used to bootstrap a fresh install instead of paging the whole
+        NVD API. Files are decompressed and parsed in parallel by a pool of worker processes, which
+        send their records back in batches of `bulk_ingest_batch_size`; each batch is merged into the
+        store as it arrives (Exploit-DB entries join the CVEs they name), so memory use does not
+        grow with the size of the feeds.
+
+        When every NVD feed was ingested, the NVD sync watermark is set to the feeds' generation
+        time, so the next sync_nvd only fetches CVEs modified since. Pass all year feeds when
+        bootstrapping: CVEs of years that were not ingested are not fetched by later delta syncs.
+
+        Args:
+            paths: Feed files, or directories whose feed files are all ingested. Files of neither
+                   kind are reported as failed.
+            workers: Number of worker processes (defaults to `bulk_ingest_workers`).
+            on_records: Optional callable (sync or async) receiving the records batch by batch.
+            update_watermark: Advance the NVD sync watermark after a complete NVD ingest.
+
+        Returns:
+            A summary dictionary: files, failed (paths), records, records per feed kind, and the
+            NVD watermark now in effect (None if it was not updated).
+        """
+        paths = expand_feed_paths(paths)
+        workers = workers or self.config.get("vulnerability_crawler", "bulk_ingest_workers")
+        batch_size = self.config.get("vulnerability_crawler", "bulk_ingest_batch_size")
+        summary = {"files": len(paths), "failed": [], "records": 0, "by_kind": {}, "watermark": None}
+        kinds = {} # path -> feed kind, for the files worth handing to the workers
+        for path in paths:
+            try:
+                kinds[path] = detect_feed_kind(path)
+            except ValueError as e:
+                logger.error("Bulk feed %s skipped: %s", path, e)
+                summary["failed"].append(path)
+        paths = list(kinds)
+        if not paths:
+            logger.warning("No bulk feed files to ingest.")
+            return summary
+        logger.info("Ingesting %s bulk feed file(s) with %s worker(s).", len(paths), workers)
+
+        loop = asyncio.get_running_loop()
+        nvd_snapshots, nvd_failed = [], False
+        # Bounded: workers wait while the store catches up, so at most this many batches are in flight
+        feed_queue = SPAWN_CONTEXT.Queue(maxsize=2 * workers)
+        pool = spawn_process_pool(min(workers, len(paths)), initializer=init_feed_worker, initargs=(feed_queue,))
+        futures = {pool.submit(parse_feed_to_queue, path, batch_size): path for path in paths}
+        pending, finished = set(paths), False
+        try:
+            while pending:
+                message, path, payload = await loop.run_in_executor(None, next_feed_message, feed_queue, futures, pending)
+                kind = kinds[path]
+                if message == "records":
+                    if self.store is not None:
+                        await self._merge_into_store(RecordMerger(self.source_priority), payload)
+                    if on_records is not None:
+                        callback_result = on_records(payload)
+                        if asyncio.iscoroutine(callback_result):
+                            await callback_result
+                    summary["records"] += len(payload)
+                    summary["by_kind"][kind] = summary["by_kind"].get(kind, 0) + len(payload)
+                    continue
+                pending.discard(path)
+                if message == "failed":
+                    # Batches stored before the failure are kept; the watermark is not advanced
+                    logger.error("Bulk feed %s could not be ingested: %s", path, payload)
+                    summary["failed"].append(path)
+                    nvd_failed = nvd_failed or kind == "nvd_json"
+                    continue
+                if kind == "nvd_json":
+                    nvd_snapshots.append(payload["snapshot"])
+                logger.info(StructuredMessage("Ingested bulk feed", path=path, kind=kind, records=payload["count"]))
+            finished = True
+        finally:
+            if finished:
+                await loop.run_in_executor(None, pool.shutdown)
+            else:
+                # Never block the event loop on workers that may be stuck on the full queue
+                pool.shutdown(wait=False, cancel_futures=True)
+                threading.Thread(target=drain_feed_queue, args=(feed_queue, futures), name="bulk-feed-drain", daemon=True).start()
+
+        if update_watermark and nvd_snapshots and not nvd_failed and all(nvd_snapshots):
+            summary["watermark"] = self._advance_nvd_watermark(min(nvd_snapshots), summary)
+        logger.info("Bulk ingest finished: %s records from %s file(s), %s failed.", summary["records"], summary["files"], len(summary["failed"]))
+        return summary
+
+    def _advance_nvd_watermark(self, snapshot: str, summary: dict) -> str:
         """
-        Fetches data from a single source URL.
+        Sets the NVD sync watermark after a bulk ingest. An existing, older watermark is kept:
+        changes between it and the feeds' snapshot may concern CVEs the feeds did not cover.
         """
+        engine = NVDSyncEngine(self.config, fetch_page=None)
+        state = engine.load_state()
+        watermark = state.get("last_modified_watermark")
+        if watermark and datetime.datetime.fromisoformat(watermark) <= datetime.datetime.fromisoformat(snapshot):
+            logger.info("NVD sync watermark %s kept (older than the bulk feeds).", watermark)
+            return watermark
+        engine.save_state({
+            "last_modified_watermark": snapshot,
+            "last_sync_items": summary["by_kind"].get("nvd_json", 0),
+            "last_sync_pages": 0,
+            "bulk_ingest": True,
+        })
+        logger.info("NVD sync watermark set to %s from bulk feeds; later syncs fetch the delta only.", snapshot)
+        return snapshot
+
+    async def _crawl_source(self, source, session, keywords: list, max_results: int) -> tuple:
+        """Fetches and parses one source; failures are logged and yield no records."""
         try:
-            logger.debug(f"Fetching data from {source_name} at {url} with params {params}")
-            async with session.get(url, params=params, timeout=30) as response:
-                response.raise_for_status() # Raise an exception for HTTP errors
-                if "json" in response.content_type:
-                    return await response.json()
-                elif "xml" in response.content_type or "rss" in response.content_type:
-                    # For XML/RSS, you might parse it differently (e.g., using xml.etree.ElementTree or feedparser)
-                    return await response.text() # Placeholder, actual parsing needed
-                else:
-                    logger.warning(f"Unsupported content type {response.content_type} from {source_name}")
-                    return None
-        except aiohttp.ClientError as e:
-            logger.error(f"Error fetching from {source_name} ({url}): {e}")
-            return None
-        except asyncio.TimeoutError:
-            logger.error(f"Timeout fetching from {source_name} ({url})")
-            return None
+            data = await source.fetch(self, session, keywords, max_results)
+            records = await source.parse(data) if data else []
+        except Exception as e:
+            logger.error("Crawling %s failed: %s", source.name, e, exc_info=True)
+            records = []
+        return source, records
+
+    async def _merge_into_store(self, merger: RecordMerger, records: list) -> dict:
+        """
+        Merges records and writes the outcome to the store, if one is configured: changed merged
+        records are upserted and records absorbed into another one are deleted. The stored rows of
+        the vulnerabilities involved are merged in first, so a record from one source never wipes
+        out what another source contributed in an earlier crawl, sync or bulk ingest.
+
+        Returns:
+            The result of merger.merge.
+        """
+        if self.store is None:
+            return merger.merge(records)
+        loop = asyncio.get_running_loop()
+        related = merger.related_ids(records)
+        stored = await loop.run_in_executor(None, self.store.get_many, related) if related else None
+        merge = merger.merge(records, stored=stored)
+        if merge["changed"]:
+            await loop.run_in_executor(None, self.store.upsert_many, merge["changed"])
+        if merge["retired"]:
+            await loop.run_in_executor(None, self.store.delete_many, merge["retired"])
+        return merge
 
     async def crawl_vulnerabilities(self, keywords: list = None, max_results_per_source: int = 10) -> list:
         """
-        Crawls various sources for the latest vulnerabilities.
+        Crawls every registered source concurrently for the latest vulnerabilities. Each source's
+        records are filtered and merged as soon as that source finishes, without waiting for the others.
+        Records matching the keywords carry their matches under "keyword_matches".
+
+        Records of the same vulnerability from different sources (e.g. a CVE and the Exploit-DB
+        entries naming it) are consolidated by the crawler's RecordMerger, on top of what the store
+        already holds for them. Only merged records whose content changed are written to the store;
+        records absorbed into another one are deleted from it.
 
         Args:
             keywords: Optional list of keywords to filter vulnerabilities (e.g., product names, technologies).
-            max_results_per_source: Maximum number of results to fetch from each source (where applicable).
+            max_results_per_source: Maximum number of results to keep from each source.
 
         Returns:
-            A list of dictionaries, where each dictionary represents a found vulnerability.
+            A list of merged vulnerability records (one per canonical ID), with "sources", "aliases"
+            and per-field "provenance".
         """
-        logger.info(f"Starting vulnerability crawl. Keywords: {keywords}, Max results: {max_results_per_source}")
-        all_vulnerabilities = []
+        logger.info("Starting vulnerability crawl. Keywords: %s, Max results: %s", keywords, max_results_per_source)
+        crawled_ids = {} # Canonical IDs seen by this crawl, in arrival order
+        raw_count = 0
+        # Compiled once per crawl; watchlists can hold thousands of product keywords
+        matcher = KeywordMatcher(keywords) if keywords else None
 
-        async with aiohttp.ClientSession() as session:
-            tasks = []
-            # NVD CVE API Example (fetches recent CVEs)
-            if self.sources.get("nvd"):
-                # NVD API has its own pagination and filtering, e.g., by keyword
-                # For simplicity, fetching recent ones. A real implementation would handle pagination.
-                nvd_params = {"resultsPerPage": max_results_per_source}
-                if keywords:
-                    nvd_params["keyword"] = " ".join(keywords) # NVD API keyword search
-                tasks.append(self.fetch_from_source(session, "NVD", self.sources["nvd"], params=nvd_params))
-            
-            # Exploit-DB RSS feed example
-            if self.sources.get("exploit_db_rss"):
-                tasks.append(self.fetch_from_source(session, "Exploit-DB RSS", self.sources["exploit_db_rss"]))
-
-            # Add more source fetching tasks here
-
-            results = await asyncio.gather(*tasks)
-
-            for i, result_data in enumerate(results):
-                if result_data:
-                    source_name = list(self.sources.keys())[i] # Assuming order is maintained
-                    logger.info(f"Processing data from {source_name}")
-                    if source_name == "NVD" and isinstance(result_data, dict) and "result" in result_data:
-                        for cve_item in result_data.get("result", {}).get("CVE_Items", []):
-                            cve_id = cve_item.get("cve", {}).get("CVE_data_meta", {}).get("ID")
-                            description = "N/A"
-                            if cve_item.get("cve", {}).get("description", {}).get("description_data"):
-                                description = cve_item["cve"]["description"]["description_data"][0]["value"]
-                            published_date = cve_item.get("publishedDate")
-                            # Basic keyword filtering if API didn't do it or for refinement
-                            if not keywords or any(kw.lower() in description.lower() or kw.lower() in cve_id.lower() for kw in keywords):
-                                all_vulnerabilities.append({
-                                    "source": "NVD",
-                                    "id": cve_id,
-                                    "description": description,
-                                    "published_date": published_date,
-                                    "link": f"https://nvd.nist.gov/vuln/detail/{cve_id}"
-                                })
-                    elif source_name == "Exploit-DB RSS" and isinstance(result_data, str):
-                        # Placeholder: Actual RSS parsing needed here (e.g. using feedparser library)
-                        # For now, just log that we got the data
-                        logger.info(f"Received Exploit-DB RSS feed content. Length: {len(result_data)}. Parsing pending.")
-                        # Example of what a parsed item might look like:
-                        # all_vulnerabilities.append({
-                        #     "source": "Exploit-DB",
-                        #     "id": "EDB-ID:XXXXX", 
-                        #     "title": "Exploit Title",
-                        #     "published_date": "YYYY-MM-DD",
-                        #     "link": "https://www.exploit-db.com/exploits/XXXXX"
-                        # })
-                    # Add processing for other sources here
-
-        logger.info(f"Vulnerability crawl finished. Found {len(all_vulnerabilities)} potential vulnerabilities.")
+        async with self._session() as session:
+            crawls = [self._crawl_source(source, session, keywords, max_results_per_source)
+                      for source in self.sources.values() if source.url]
+            for crawl in asyncio.as_completed(crawls):
+                source, records = await crawl
+                # Keyword filtering for sources that cannot filter server-side, or for refinement
+                if matcher is not None:
+                    records = matcher.filter_records(records)
+                records = records[:max_results_per_source]
+                merge = await self._merge_into_store(self.merger, records)
+                logger.info(StructuredMessage("Processed source", source=source.name, records=len(records),
+                                              changed=len(merge["changed"]), retired=len(merge["retired"])))
+                raw_count += len(records)
+                crawled_ids.update(dict.fromkeys(merge["ids"]))
+
+        all_vulnerabilities = [record for record in map(self.merger.get, crawled_ids) if record is not None]
+        logger.info("Vulnerability crawl finished. Found %s potential vulnerabilities (%s records before merging).",
+                    len(all_vulnerabilities), raw_count)
         # The RAG/LLM part would take these raw_vulnerabilities and enrich/filter/summarize them.
         return all_vulnerabilities
 
 if __name__ == '__main__':
     # Example Usage (for testing purposes)
-    class MockConfig:
-        def get(self, section, key, default=None):
-            if key == "nvd_api_url": return "https://services.nvd.nist.gov/rest/json/cves/1.0"
-            if key == "exploit_db_rss": return "https://www.exploit-db.com/rss.xml"
-            return default
+    from ...core.config_manager import ConfigSnapshot, ConfigView
     class MockDataManager: pass
 
     logging.basicConfig(level=logging.INFO)
-    crawler = VulnerabilityCrawler(MockConfig(), MockDataManager())
+    # Unset settings fall back to the CONFIG_SCHEMA defaults, as with a ConfigManager
+    config = ConfigView(ConfigSnapshot(0, {"vulnerability_crawler": {
+        "nvd_api_url": "https://services.nvd.nist.gov/rest/json/cves/1.0",
+        "exploit_db_rss": "https://www.exploit-db.com/rss.xml",
+    }}))
+    crawler = VulnerabilityCrawler(config, MockDataManager())
     
     async def main():
         # vulnerabilities = await crawler.crawl_vulnerabilities(keywords=["apache"], max_results_per_source=5)
@@ -0,0 +1,453 @@
+# advanced_security_script/modules/intelligence/vulnerability_store.py
+
+import logging
+import datetime
+import json
+import os
+import re
+import sqlite3
+import threading
+from .cpe_index import CpeIndex, normalize_query, parse_cpe23
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS vulnerabilities (
+    id TEXT PRIMARY KEY,
+    source TEXT NOT NULL COLLATE NOCASE,
+    title TEXT,
+    description TEXT,
+    severity TEXT COLLATE NOCASE,
+    cvss_score REAL,
+    published_date TEXT,
+    last_modified_date TEXT,
+    link TEXT,
+    references_json TEXT,
+    merge_json TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_vulnerabilities_published ON vulnerabilities (published_date DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_vulnerabilities_modified ON vulnerabilities (last_modified_date DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_vulnerabilities_source ON vulnerabilities (source, published_date DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_vulnerabilities_severity ON vulnerabilities (severity, published_date DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_vulnerabilities_cvss ON vulnerabilities (cvss_score DESC);
+-- CPE applicability entries (one per vulnerable cpe_match of a record), looked up by product.
+CREATE TABLE IF NOT EXISTS vulnerability_cpes (
+    vuln_id TEXT NOT NULL,
+    part TEXT,
+    vendor TEXT NOT NULL,
+    product TEXT NOT NULL,
+    version TEXT,
+    version_start TEXT,
+    start_inclusive INTEGER NOT NULL DEFAULT 1,
+    version_end TEXT,
+    end_inclusive INTEGER NOT NULL DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS idx_vulnerability_cpes_product ON vulnerability_cpes (product, vendor);
+CREATE INDEX IF NOT EXISTS idx_vulnerability_cpes_vuln ON vulnerability_cpes (vuln_id);
+CREATE TRIGGER IF NOT EXISTS vulnerability_cpes_delete AFTER DELETE ON vulnerabilities BEGIN
+    DELETE FROM vulnerability_cpes WHERE vuln_id = old.id;
+END;
+"""
+
+# Full-text index over id, title and description. It is an external-content FTS5 table: it stores
+# only the inverted index, reads the text from `vulnerabilities` and is kept in sync by triggers,
+# so every upsert updates it incrementally. Descriptions are only re-indexed when they change.
+SEARCH_SCHEMA = """
+CREATE VIRTUAL TABLE vulnerabilities_fts USING fts5(
+    id, title, description,
+    content='vulnerabilities', content_rowid='rowid', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER vulnerabilities_fts_insert AFTER INSERT ON vulnerabilities BEGIN
+    INSERT INTO vulnerabilities_fts (rowid, id, title, description) VALUES (new.rowid, new.id, new.title, new.description);
+END;
+CREATE TRIGGER vulnerabilities_fts_delete AFTER DELETE ON vulnerabilities BEGIN
+    INSERT INTO vulnerabilities_fts (vulnerabilities_fts, rowid, id, title, description) VALUES ('delete', old.rowid, old.id, old.title, old.description);
+END;
+CREATE TRIGGER vulnerabilities_fts_update AFTER UPDATE OF title, description ON vulnerabilities
+WHEN old.title IS NOT new.title OR old.description IS NOT new.description BEGIN
+    INSERT INTO vulnerabilities_fts (vulnerabilities_fts, rowid, id, title, description) VALUES ('delete', old.rowid, old.id, old.title, old.description);
+    INSERT INTO vulnerabilities_fts (rowid, id, title, description) VALUES (new.rowid, new.id, new.title, new.description);
+END;
+-- Relevance: BM25 with matches in the ID weighing most, then the title, then the description.
+INSERT INTO vulnerabilities_fts (vulnerabilities_fts, rank) VALUES ('rank', 'bm25(10.0, 5.0, 1.0)');
+INSERT INTO vulnerabilities_fts (vulnerabilities_fts) VALUES ('rebuild');
+"""
+
+# Columns usable as keyset sort keys; both are always populated so (column, id) is a total order.
+SORTABLE_COLUMNS = ("published_date", "last_modified_date")
+# Sort keys of search(): the sortable columns plus "relevance" (best BM25 match first).
+SEARCH_SORTS = ("relevance",) + SORTABLE_COLUMNS
+
+COLUMNS = ("id", "source", "title", "description", "severity", "cvss_score",
+           "published_date", "last_modified_date", "link", "references_json", "merge_json")
+CPE_COLUMNS = ("vuln_id", "part", "vendor", "product", "version", "version_start", "start_inclusive", "version_end", "end_inclusive")
+# Columns an upsert only overwrites with a value: a record that lacks one (e.g. an Exploit-DB entry
+# without a CVSS score) keeps what an earlier record of the vulnerability stored.
+KEEP_IF_MISSING = ("description", "severity", "cvss_score", "link", "references_json", "merge_json")
+# Keys RecordMerger adds to merged records, stored in merge_json so later merges build on them
+MERGE_KEYS = ("sources", "aliases", "provenance")
+# Products or IDs per IN (...) lookup, well below SQLite's bound-parameter limit
+CPE_LOOKUP_CHUNK = 500
+
+# Stores opened through shared_store, keyed by absolute database path
+_shared_stores = {}
+_shared_stores_lock = threading.Lock()
+
+def normalize_timestamp(value):
+    """
+    Normalizes an ISO-8601-ish timestamp (e.g. NVD's "2021-08-04T13:15Z") to a UTC
+    ISO string with seconds, so that lexical order in the store matches chronological order.
+    Returns None for empty or unparseable values.
+    """
+    if not value:
+        return None
+    if isinstance(value, datetime.datetime):
+        parsed = value
+    else:
+        text = str(value).strip()
+        if text.endswith("Z"):
+            text = text[:-1] + "+00:00"
+        try:
+            parsed = datetime.datetime.fromisoformat(text)
+        except ValueError:
+            logger.warning("Unparseable timestamp %r; storing as NULL.", value)
+            return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=datetime.timezone.utc)
+    return parsed.astimezone(datetime.timezone.utc).isoformat()
+
+def build_match_query(text: str) -> str:
+    """
+    Turns free text into an FTS5 query that cannot raise a syntax error: every whitespace-separated
+    term becomes a quoted phrase and all terms must match. A trailing "*" keeps prefix matching
+    ("apach*"), and hyphenated terms such as CVE IDs match as phrases.
+
+    Returns:
+        The MATCH expression, or None if the text holds no searchable term.
+    """
+    phrases = []
+    for term in (text or "").split():
+        prefix = term.endswith("*")
+        term = term.rstrip("*").replace('"', '""')
+        if re.search(r"\w", term):
+            phrases.append(f'"{term}"' + ("*" if prefix else ""))
+    return " ".join(phrases) or None
+
+class VulnerabilityStore:
+    def __init__(self, db_path: str):
+        """
+        Initializes the VulnerabilityStore, an embedded SQLite store for crawled vulnerabilities.
+        Args:
+            db_path (str): Path of the SQLite database file (":memory:" for a transient store).
+        """
+        self.db_path = db_path
+        db_dir = os.path.dirname(db_path)
+        if db_path != ":memory:" and db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        # A single connection shared across threads; access is serialized by the lock.
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock:
+            if db_path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(SCHEMA)
+            columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(vulnerabilities)")}
+            if "merge_json" not in columns: # Databases created before merged records were stored
+                self._conn.execute("ALTER TABLE vulnerabilities ADD COLUMN merge_json TEXT")
+            exists = self._conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'vulnerabilities_fts'").fetchone()
+            if not exists:
+                # Indexes the records of databases created before the search index, too
+                self._conn.executescript(f"BEGIN; {SEARCH_SCHEMA} COMMIT;")
+        logger.info("VulnerabilityStore opened at %s", db_path)
+
+    @staticmethod
+    def _to_row(record: dict) -> tuple:
+        """
+        Returns the column values of a record and the date columns an update must keep because the
+        record does not carry them. Records without a publication date are treated as published
+        when first ingested.
+        """
+        published = normalize_timestamp(record.get("published_date"))
+        modified = normalize_timestamp(record.get("last_modified_date"))
+        kept = () if published else ("published_date",) if modified else ("published_date", "last_modified_date")
+        published = published or normalize_timestamp(datetime.datetime.now(datetime.timezone.utc))
+        severity = record.get("severity")
+        references = record.get("references")
+        merge = {key: record[key] for key in MERGE_KEYS if record.get(key)}
+        return (
+            record["id"],
+            record.get("source", "unknown"),
+            record.get("title") or record["id"],
+            record.get("description"),
+            severity.upper() if severity else None,
+            record.get("cvss_score"),
+            published,
+            modified or published,
+            record.get("link"),
+            json.dumps(references) if references else None,
+            json.dumps(merge) if merge else None,
+        ), kept
+
+    @staticmethod
+    def _upsert_sql(kept: tuple) -> str:
+        updates = []
+        for column in COLUMNS[1:]:
+            if column in kept:
+                continue
+            if column in KEEP_IF_MISSING:
+                updates.append(f"{column} = COALESCE(excluded.{column}, {column})")
+            elif column == "title":
+                # A title that merely repeats the ID is the fallback of records without one
+                updates.append("title = CASE WHEN excluded.title = excluded.id THEN title ELSE excluded.title END")
+            else:
+                updates.append(f"{column} = excluded.{column}")
+        placeholders = ", ".join("?" for _ in COLUMNS)
+        return f"INSERT INTO vulnerabilities ({', '.join(COLUMNS)}) VALUES ({placeholders}) ON CONFLICT(id) DO UPDATE SET {', '.join(updates)}"
+
+    @staticmethod
+    def _from_row(row: sqlite3.Row) -> dict:
+        record = dict(row)
+        record["references"] = json.loads(record.pop("references_json") or "[]")
+        record.update(json.loads(record.pop("merge_json") or "{}"))
+        return record
+
+    @staticmethod
+    def _cpe_rows(record: dict) -> list:
+        rows = []
+        for match in record["cpe_matches"]:
+            cpe = parse_cpe23(match.get("cpe"))
+            if cpe is not None:
+                rows.append((record["id"], cpe["part"], cpe["vendor"], cpe["product"], cpe["version"],
+                             match.get("version_start"), int(match.get("start_inclusive", True)),
+                             match.get("version_end"), int(match.get("end_inclusive", True))))
+        return rows
+
+    def upsert_many(self, records: list) -> int:
+        """
+        Inserts or updates vulnerability records in a single transaction.
+        An update never clears a stored value: fields the record lacks (no description, severity,
+        CVSS score, link, references, title or dates) keep what is stored.
+        Records carrying "cpe_matches" (see cpe_index.extract_cpe_matches) also replace the CPE
+        applicability entries of their vulnerability; records without the key leave them untouched.
+
+        Args:
+            records: Normalized records as produced by VulnerabilityCrawler (must carry an "id").
+
+        Returns:
+            The number of records written.
+        """
+        statements = {} # date columns kept -> rows
+        for record in records:
+            if record.get("id"):
+                row, kept = self._to_row(record)
+                statements.setdefault(kept, []).append(row)
+        if not statements:
+            return 0
+        with_cpes = [record for record in records if record.get("id") and record.get("cpe_matches") is not None]
+        cpe_rows = [row for record in with_cpes for row in self._cpe_rows(record)]
+        cpe_sql = f"INSERT INTO vulnerability_cpes ({', '.join(CPE_COLUMNS)}) VALUES ({', '.join('?' for _ in CPE_COLUMNS)})"
+        with self._lock, self._conn:
+            for kept, rows in statements.items():
+                self._conn.executemany(self._upsert_sql(kept), rows)
+            self._conn.executemany("DELETE FROM vulnerability_cpes WHERE vuln_id = ?", [(record["id"],) for record in with_cpes])
+            self._conn.executemany(cpe_sql, cpe_rows)
+        count = sum(len(rows) for rows in statements.values())
+        logger.debug("Upserted %s vulnerability records (%s CPE entries).", count, len(cpe_rows))
+        return count
+
+    def delete_many(self, vuln_ids: list) -> int:
+        """
+        Deletes vulnerabilities by ID in a single transaction (e.g. records merged into another one).
+
+        Returns:
+            The number of records deleted.
+        """
+        if not vuln_ids:
+            return 0
+        with self._lock, self._conn:
+            deleted = self._conn.executemany("DELETE FROM vulnerabilities WHERE id = ?", [(vuln_id,) for vuln_id in vuln_ids]).rowcount
+        logger.debug("Deleted %s vulnerability records.", deleted)
+        return deleted
+
+    def get(self, vuln_id: str) -> dict:
+        """
+        Retrieves a single vulnerability by its ID, or None if it is not stored.
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM vulnerabilities WHERE id = ?", (vuln_id,)).fetchone()
+        return self._from_row(row) if row else None
+
+    def get_many(self, vuln_ids) -> list:
+        """
+        Retrieves the stored vulnerabilities among the given IDs (in no particular order).
+        """
+        vuln_ids = sorted(set(vuln_ids))
+        records = []
+        with self._lock:
+            for start in range(0, len(vuln_ids), CPE_LOOKUP_CHUNK):
+                chunk = vuln_ids[start:start + CPE_LOOKUP_CHUNK]
+                rows = self._conn.execute(f"SELECT * FROM vulnerabilities WHERE id IN ({', '.join('?' for _ in chunk)})", chunk)
+                records.extend(self._from_row(row) for row in rows)
+        return records
+
+    def query(self, source: str = None, severity: str = None, min_cvss_score: float = None, limit: int = 10,
+              sort: str = "published_date", descending: bool = True, after: tuple = None) -> list:
+        """
+        Retrieves vulnerabilities matching the filters, ordered by (sort, id).
+        Filters are served from indexes; source and severity match case-insensitively.
+        Pagination is keyset-based: pass the (sort value, id) of the last record of the
+        previous page as `after`, so deep pages cost the same as the first one.
+
+        Args:
+            source: Filter by source (e.g. "NVD").
+            severity: Filter by severity (e.g. "CRITICAL").
+            min_cvss_score: Filter by minimum CVSS base score.
+            limit: Maximum number of records to return.
+            sort: Sort column, one of SORTABLE_COLUMNS.
+            descending: Newest first when True.
+            after: Optional (sort value, id) keyset position to continue from.
+
+        Returns:
+            A list of record dictionaries.
+        """
+        if sort not in SORTABLE_COLUMNS:
+            raise ValueError(f"Unsupported sort column: {sort}")
+        direction = "DESC" if descending else "ASC"
+        clauses, params = [], []
+        if after is not None:
+            clauses.append(f"({sort}, id) {'<' if descending else '>'} (?, ?)")
+            params.extend(after)
+        if source:
+            clauses.append("source = ?")
+            params.append(source)
+        if severity:
+            clauses.append("severity = ?")
+            params.append(severity)
+        if min_cvss_score is not None:
+            clauses.append("cvss_score >= ?")
+            params.append(min_cvss_score)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        sql = f"SELECT * FROM vulnerabilities {where} ORDER BY {sort} {direction}, id {direction} LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [self._from_row(row) for row in rows]
+
+    def search(self, text: str, source: str = None, severity: str = None, min_cvss_score: float = None, limit: int = 10,
+               sort: str = "relevance", descending: bool = True, after: tuple = None,
+               highlight: tuple = ("<mark>", "</mark>")) -> list:
+        """
+        Full-text search over vulnerability IDs, titles and descriptions, served by the FTS5 index.
+
+        Args:
+            text: Free-text query; every term must match (see build_match_query).
+            source, severity, min_cvss_score: Filters, as in query().
+            limit: Maximum number of records to return.
+            sort: One of SEARCH_SORTS. With "relevance", descending=True returns the best matches first.
+            descending: Sort direction.
+            after: Optional (sort value, id) keyset position of the last record of the previous page;
+                   for "relevance" the sort value is the record's "score".
+            highlight: Markers put around matched terms in the snippet.
+
+        Returns:
+            A list of record dictionaries with two extra keys: "score" (BM25; lower is more relevant)
+            and "snippet" (a short excerpt of the best-matching column with the matches highlighted).
+        """
+        if sort not in SEARCH_SORTS:
+            raise ValueError(f"Unsupported sort column: {sort}")
+        match = build_match_query(text)
+        if match is None:
+            return []
+        if sort == "relevance":
+            # Lower BM25 scores are better, so "descending" relevance is ascending score.
+            order_column, ascending = "vulnerabilities_fts.rank", descending
+        else:
+            order_column, ascending = f"v.{sort}", not descending
+        direction = "ASC" if ascending else "DESC"
+        clauses, params = ["vulnerabilities_fts MATCH ?"], [match]
+        if after is not None:
+            clauses.append(f"({order_column}, v.id) {'>' if ascending else '<'} (?, ?)")
+            params.extend(after)
+        if source:
+            clauses.append("v.source = ?")
+            params.append(source)
+        if severity:
+            clauses.append("v.severity = ?")
+            params.append(severity)
+        if min_cvss_score is not None:
+            clauses.append("v.cvss_score >= ?")
+            params.append(min_cvss_score)
+        sql = (
+            "SELECT v.*, vulnerabilities_fts.rank AS score, "
+            "snippet(vulnerabilities_fts, -1, ?, ?, '…', 24) AS snippet "
+            "FROM vulnerabilities_fts JOIN vulnerabilities v ON v.rowid = vulnerabilities_fts.rowid "
+            f"WHERE {' AND '.join(clauses)} ORDER BY {order_column} {direction}, v.id {direction} LIMIT ?"
+        )
+        params = [highlight[0], highlight[1]] + params + [limit]
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [self._from_row(row) for row in rows]
+
+    def match_cpes(self, queries: list) -> list:
+        """
+        Resolves products to the vulnerabilities affecting them, in bulk.
+        Only the CPE entries of the queried products are read (through the product index) into a
+        CpeIndex, which then answers every query with hash lookups and one sweep over each product's
+        version ranges.
+
+        Args:
+            queries (list): Dicts with "product" and optional "vendor" and "version", or CPE 2.3
+                            strings (see cpe_index.CpeIndex.match_many).
+
+        Returns:
+            The sorted list of matching vulnerability IDs of each query, in query order.
+        """
+        keys = [normalize_query(query) for query in queries]
+        products = sorted({key[1] for key in keys} - {""})
+        index = CpeIndex()
+        with self._lock:
+            for start in range(0, len(products), CPE_LOOKUP_CHUNK):
+                chunk = products[start:start + CPE_LOOKUP_CHUNK]
+                rows = self._conn.execute(
+                    f"SELECT vuln_id, vendor, product, version, version_start, start_inclusive, version_end, end_inclusive "
+                    f"FROM vulnerability_cpes WHERE product IN ({', '.join('?' for _ in chunk)})", chunk)
+                for row in rows:
+                    index.add(row[0], row[1], row[2], row[3], row[4], bool(row[5]), row[6], bool(row[7]))
+        return index.match_many(keys)
+
+    def rebuild_search_index(self):
+        """
+        Rebuilds the full-text index from the table. The index follows upserts and deletes on its own;
+        a rebuild is only needed after a VACUUM, which may renumber the rowids it refers to.
+        """
+        with self._lock, self._conn:
+            self._conn.execute("INSERT INTO vulnerabilities_fts (vulnerabilities_fts) VALUES ('rebuild')")
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM vulnerabilities").fetchone()[0]
+
+    def close(self):
+        with _shared_stores_lock:
+            if _shared_stores.get(_store_key(self.db_path)) is self:
+                del _shared_stores[_store_key(self.db_path)]
+        with self._lock:
+            self._conn.close()
+
+def _store_key(db_path: str) -> str:
+    return db_path if db_path == ":memory:" else os.path.abspath(db_path)
+
+def shared_store(db_path: str) -> VulnerabilityStore:
+    """
+    Returns the process-wide VulnerabilityStore of a database, opening it on first use, so the API
+    and the workflows writing crawled records share one connection and CPE index per file.
+    Closing it removes it; the next call opens the database again.
+    """
+    key = _store_key(db_path)
+    with _shared_stores_lock:
+        store = _shared_stores.get(key)
+        if store is None:
+            store = _shared_stores[key] = VulnerabilityStore(db_path)
+        return store
@@ -54,7 +54,7 @@ class LLMReportGenerator:
         if not findings:
             return "# Security Report\n\nNo significant findings to report."
 
-        logger.info(f"Generating report for target: {target_info.get('url', 'N/A')} with {len(findings)} findings.")
+        logger.info("Generating report for target: %s with %s findings.", target_info.get('url', 'N/A'), len(findings))
 
         # Basic summarization (to be replaced with LLM+RAG)
         report_sections = ["# Security Report"]
@@ -0,0 +1,19 @@
+# advanced_security_script/tests/unit/helpers.py
+
+from advanced_security_script.core.config_manager import CONFIG_SCHEMA
+
+class MockConfig:
+    """
+    Minimal stand-in for ConfigManager: serves `get` from a nested dict of sections and, like
+    ConfigManager, falls back to the CONFIG_SCHEMA default when the key is missing.
+    """
+    def __init__(self, config_data=None, config_path=None):
+        self.config_data = config_data or {}
+        self.config_path = config_path
+    def get(self, section, key, default=None):
+        section_values = self.config_data.get(section, {})
+        if key in section_values:
+            return section_values[key]
+        if default is None and f"{section}.{key}" in CONFIG_SCHEMA:
+            return CONFIG_SCHEMA[f"{section}.{key}"][1]
+        return default
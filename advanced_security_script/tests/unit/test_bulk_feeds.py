@@ -0,0 +1,190 @@
+# advanced_security_script/tests/unit/test_bulk_feeds.py
+
+import unittest
+import gzip
+import json
+import os
+import shutil
+import tempfile
+import zipfile
+from advanced_security_script.modules.intelligence.bulk_feeds import detect_feed_kind, expand_feed_paths, parse_feed_file
+from advanced_security_script.modules.intelligence.nvd_sync import NVDSyncEngine
+from advanced_security_script.modules.intelligence.vulnerability_crawler import VulnerabilityCrawler
+from advanced_security_script.modules.intelligence.vulnerability_store import VulnerabilityStore
+from advanced_security_script.tests.unit.helpers import MockConfig
+
+EXPLOITDB_CSV = (
+    "id,file,description,date_published,author,type,platform,port,date_added,date_updated,verified,codes\n"
+    "52101,exploits/php/webapps/52101.txt,\"Acme Portal 4.2 - SQL Injection, authenticated\",2025-03-01,a,webapps,php,,2025-03-01,2025-03-04,1,CVE-2025-1111;OSVDB-1\n"
+    "52102,exploits/linux/remote/52102.py,Widget HTTP Server 1.0 - Buffer Overflow,2025-03-02,b,remote,linux,80,2025-03-02,,0,\n"
+    "not-an-id,,broken row,,,,,,,,,\n"
+)
+
+def nvd_feed(year: int, count: int, timestamp="2025-06-01T07:00Z") -> bytes:
+    items = [{
+        "cve": {"CVE_data_meta": {"ID": f"CVE-{year}-{i:04d}"}, "description": {"description_data": [{"value": f"Flaw {i}"}]}},
+        "impact": {"baseMetricV3": {"cvssV3": {"baseScore": 7.5, "baseSeverity": "HIGH"}}},
+        "publishedDate": f"{year}-01-02T10:15Z",
+        "lastModifiedDate": f"{year}-02-0{1 + i % 9}T10:15Z",
+    } for i in range(count)]
+    feed = {"CVE_data_type": "CVE", "CVE_data_numberOfCVEs": str(count), "CVE_Items": items}
+    if timestamp:
+        feed = {"CVE_data_timestamp": timestamp, **feed}
+    return json.dumps(feed).encode("utf-8")
+
+class TestBulkFeeds(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def write(self, name: str, data: bytes) -> str:
+        path = os.path.join(self.temp_dir, name)
+        if name.endswith(".gz"):
+            with gzip.open(path, "wb") as f:
+                f.write(data)
+        elif name.endswith(".zip"):
+            with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+                archive.writestr(name[:-len(".zip")], data)
+        else:
+            with open(path, "wb") as f:
+                f.write(data)
+        return path
+
+    def test_detect_feed_kind(self):
+        self.assertEqual(detect_feed_kind("nvdcve-1.1-2021.json.gz"), "nvd_json")
+        self.assertEqual(detect_feed_kind("/x/nvdcve-1.1-2021.JSON.zip"), "nvd_json")
+        self.assertEqual(detect_feed_kind("files_exploits.csv"), "exploitdb_csv")
+        with self.assertRaises(ValueError):
+            detect_feed_kind("notes.txt.gz")
+
+    def test_nvd_feeds_in_every_container_parse_alike(self):
+        data = nvd_feed(2021, 25)
+        results = [parse_feed_file(self.write(name, data), batch_size=4)
+                   for name in ("a-2021.json", "b-2021.json.gz", "c-2021.json.zip")]
+        for result in results:
+            self.assertEqual(result["kind"], "nvd_json")
+            self.assertEqual(result["snapshot"], "2025-06-01T07:00:00+00:00")
+            self.assertEqual(result["records"], results[0]["records"])
+        self.assertEqual(len(results[0]["records"]), 25)
+        self.assertEqual(results[0]["records"][3]["id"], "CVE-2021-0003")
+        self.assertEqual(results[0]["records"][3]["severity"], "HIGH")
+
+    def test_on_records_receives_bounded_batches(self):
+        batches = []
+        result = parse_feed_file(self.write("2021.json.gz", nvd_feed(2021, 10)), batch_size=4, on_records=batches.append)
+        self.assertEqual([len(batch) for batch in batches], [4, 4, 2])
+        self.assertEqual(result["count"], 10)
+        self.assertNotIn("records", result)
+
+    def test_snapshot_falls_back_to_newest_modification(self):
+        result = parse_feed_file(self.write("2021.json.gz", nvd_feed(2021, 12, timestamp=None)))
+        self.assertEqual(result["snapshot"], "2021-02-09T10:15:00+00:00")
+
+    def test_truncated_feed_raises(self):
+        path = self.write("2021.json.gz", nvd_feed(2021, 10)[:-200])
+        with self.assertRaises(Exception):
+            parse_feed_file(path)
+
+    def test_exploitdb_csv(self):
+        result = parse_feed_file(self.write("files_exploits.csv.gz", EXPLOITDB_CSV.encode("utf-8")))
+        self.assertEqual(result["kind"], "exploitdb_csv")
+        self.assertIsNone(result["snapshot"])
+        first, second = result["records"]
+        self.assertEqual(first["id"], "EDB-ID:52101")
+        self.assertEqual(first["title"], "Acme Portal 4.2 - SQL Injection, authenticated")
+        self.assertEqual(first["cve_ids"], ["CVE-2025-1111"])
+        self.assertEqual(first["published_date"], "2025-03-01T00:00:00+00:00")
+        self.assertEqual(first["last_modified_date"], "2025-03-04T00:00:00+00:00")
+        self.assertEqual(second["last_modified_date"], second["published_date"])
+        self.assertEqual(second["exploit_type"], "remote")
+
+    def test_expand_feed_paths(self):
+        feed = self.write("2021.json.gz", nvd_feed(2021, 1))
+        csv_path = self.write("files_exploits.csv", EXPLOITDB_CSV.encode("utf-8"))
+        self.write("README.txt", b"")
+        self.assertEqual(expand_feed_paths([self.temp_dir]), [feed, csv_path])
+
+class TestIngestBulkFeeds(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.state_path = os.path.join(self.temp_dir, "nvd_state.json")
+        self.store = VulnerabilityStore(":memory:")
+        self.config = MockConfig({"vulnerability_crawler": {
+            "nvd_sync_state_path": self.state_path, "http_cache_enabled": False, "bulk_ingest_workers": 2,
+            "bulk_ingest_batch_size": 8,
+        }})
+        self.crawler = VulnerabilityCrawler(self.config, None, store=self.store)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def write_gz(self, name: str, data: bytes) -> str:
+        path = os.path.join(self.temp_dir, name)
+        with gzip.open(path, "wb") as f:
+            f.write(data)
+        return path
+
+    async def test_ingest_stores_records_and_sets_watermark(self):
+        self.write_gz("nvdcve-1.1-2021.json.gz", nvd_feed(2021, 30, timestamp="2025-06-01T07:00Z"))
+        self.write_gz("nvdcve-1.1-2022.json.gz", nvd_feed(2022, 20, timestamp="2025-06-01T06:00Z"))
+        self.write_gz("files_exploits.csv.gz", EXPLOITDB_CSV.encode("utf-8"))
+        summary = await self.crawler.ingest_bulk_feeds([self.temp_dir])
+        self.assertEqual(summary["records"], 52)
+        self.assertEqual(summary["by_kind"], {"nvd_json": 50, "exploitdb_csv": 2})
+        self.assertEqual(summary["failed"], [])
+        self.assertEqual(self.store.count(), 52)
+        # The oldest feed bounds the watermark: anything modified after it is fetched by the delta sync
+        self.assertEqual(summary["watermark"], "2025-06-01T06:00:00+00:00")
+        state = NVDSyncEngine(self.config, fetch_page=None).load_state()
+        self.assertEqual(state["last_modified_watermark"], "2025-06-01T06:00:00+00:00")
+
+    async def test_records_arrive_in_batches(self):
+        path = self.write_gz("nvdcve-1.1-2021.json.gz", nvd_feed(2021, 20))
+        batches = []
+        summary = await self.crawler.ingest_bulk_feeds([path], on_records=batches.append)
+        self.assertEqual(sorted(len(batch) for batch in batches), [4, 8, 8])
+        self.assertEqual(summary["records"], 20)
+        self.assertEqual(self.store.count(), 20)
+
+    async def test_exploits_join_the_cves_they_name(self):
+        self.write_gz("nvdcve-1.1-2021.json.gz", nvd_feed(2021, 5))
+        self.write_gz("files_exploits.csv.gz", EXPLOITDB_CSV.replace("CVE-2025-1111", "CVE-2021-0003").encode("utf-8"))
+        summary = await self.crawler.ingest_bulk_feeds([self.temp_dir])
+        self.assertEqual(summary["records"], 7)
+        self.assertEqual(self.store.count(), 6) # EDB-ID:52101 is merged into CVE-2021-0003
+        self.assertIsNone(self.store.get("EDB-ID:52101"))
+        merged = self.store.get("CVE-2021-0003")
+        self.assertEqual((merged["source"], merged["severity"]), ("NVD", "HIGH"))
+        self.assertEqual(merged["title"], "Acme Portal 4.2 - SQL Injection, authenticated")
+
+    async def test_older_watermark_is_kept(self):
+        NVDSyncEngine(self.config, fetch_page=None).save_state({"last_modified_watermark": "2025-01-01T00:00:00+00:00"})
+        path = self.write_gz("nvdcve-1.1-2021.json.gz", nvd_feed(2021, 3))
+        summary = await self.crawler.ingest_bulk_feeds([path], workers=1)
+        self.assertEqual(summary["watermark"], "2025-01-01T00:00:00+00:00")
+
+    async def test_failed_nvd_feed_leaves_watermark_alone(self):
+        good = self.write_gz("nvdcve-1.1-2021.json.gz", nvd_feed(2021, 3))
+        bad = self.write_gz("nvdcve-1.1-2022.json.gz", nvd_feed(2022, 3)[:-50])
+        summary = await self.crawler.ingest_bulk_feeds([good, bad])
+        self.assertEqual(summary["failed"], [bad])
+        self.assertEqual(summary["records"], 3)
+        self.assertIsNone(summary["watermark"])
+        self.assertFalse(os.path.exists(self.state_path))
+
+    async def test_unsupported_files_are_reported_as_failed(self):
+        feed = self.write_gz("nvdcve-1.1-2021.json.gz", nvd_feed(2021, 3))
+        notes = os.path.join(self.temp_dir, "notes.txt")
+        with open(notes, "w") as f:
+            f.write("not a feed")
+        summary = await self.crawler.ingest_bulk_feeds([feed, notes])
+        self.assertEqual(summary["failed"], [notes])
+        self.assertEqual((summary["files"], summary["records"]), (2, 3))
+        self.assertIsNotNone(summary["watermark"]) # Not an NVD feed: the NVD ingest is still complete
+        summary = await self.crawler.ingest_bulk_feeds([notes])
+        self.assertEqual((summary["failed"], summary["records"]), ([notes], 0))
+
+if __name__ == "__main__":
+    unittest.main()
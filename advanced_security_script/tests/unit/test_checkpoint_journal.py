@@ -0,0 +1,97 @@
+# advanced_security_script/tests/unit/test_checkpoint_journal.py
+
+import unittest
+import os
+import shutil
+import tempfile
+import yaml
+from advanced_security_script.core.checkpoint_journal import CheckpointJournal
+from advanced_security_script.core.workflow_graph import WorkflowGraph, WorkflowStep
+from advanced_security_script.core.workflow_orchestrator import WorkflowOrchestrator
+
+class TestCheckpointJournal(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.journal = CheckpointJournal(os.path.join(self.temp_dir, "checkpoints"))
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_records_and_loads_completed_steps(self):
+        self.journal.start_run("run1", {"task_name": "wf", "target": "a.com"})
+        self.assertTrue(self.journal.record_step("run1", "crawl", [{"id": "CVE-1"}]))
+        task_config, completed = self.journal.load_run("run1")
+        self.assertEqual(task_config, {"task_name": "wf", "target": "a.com"})
+        self.assertEqual(completed, {"crawl": [{"id": "CVE-1"}]})
+        self.assertEqual(self.journal.incomplete_runs(), ["run1"])
+
+    def test_finished_runs_are_not_incomplete(self):
+        self.journal.start_run("run1", {"task_name": "wf"})
+        self.journal.finish_run("run1")
+        self.assertEqual(self.journal.incomplete_runs(), [])
+
+    def test_torn_last_line_is_ignored(self):
+        self.journal.start_run("run1", {"task_name": "wf"})
+        self.journal.record_step("run1", "a", 1)
+        with open(os.path.join(self.journal.journal_dir, "run1.jsonl"), "a") as f:
+            f.write('{"event":"step_completed","step":"b","out') # Crash mid-write
+        _, completed = self.journal.load_run("run1")
+        self.assertEqual(completed, {"a": 1})
+
+    def test_unserializable_output_is_not_checkpointed(self):
+        self.journal.start_run("run1", {"task_name": "wf"})
+        self.assertFalse(self.journal.record_step("run1", "a", object()))
+        self.assertEqual(self.journal.load_run("run1")[1], {})
+
+class TestOrchestratorResume(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.config_path = os.path.join(self.temp_dir, "config.yaml")
+        with open(self.config_path, "w") as f:
+            yaml.dump({
+                "global": {"log_file_path": os.path.join(self.temp_dir, "test.log")},
+                "workflow_settings": {
+                    "step_cache_enabled": False,
+                    "checkpoint_dir": os.path.join(self.temp_dir, "checkpoints"),
+                },
+            }, f)
+        self.calls = []
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _build(self, task_config):
+        def step(name):
+            def run(ctx, inputs):
+                self.calls.append(name)
+                return f"{name}({','.join(str(v) for v in inputs.values())})"
+            return run
+        return WorkflowGraph("pipeline", [
+            WorkflowStep("discover", step("discover")),
+            WorkflowStep("crawl", step("crawl")),
+            WorkflowStep("report", step("report"), depends_on=["discover", "crawl"]),
+        ])
+
+    def test_restarted_orchestrator_resumes_from_last_completed_step(self):
+        # Simulate a process that died after "discover" completed.
+        first = WorkflowOrchestrator(config_path=self.config_path)
+        first.checkpoint_journal.start_run("run42", {"task_name": "pipeline", "target": "a.com"})
+        first.checkpoint_journal.record_step("run42", "discover", "discover()")
+
+        restarted = WorkflowOrchestrator(config_path=self.config_path)
+        restarted.register_workflow("pipeline", self._build)
+        results = restarted.resume_incomplete_workflows()
+        self.assertEqual(results["run42"]["status"], "success")
+        self.assertEqual(results["run42"]["outputs"]["report"], "report(discover(),crawl())")
+        self.assertEqual(sorted(self.calls), ["crawl", "report"])
+        self.assertEqual(restarted.checkpoint_journal.incomplete_runs(), [])
+
+    def test_completed_run_leaves_no_journal(self):
+        orchestrator = WorkflowOrchestrator(config_path=self.config_path)
+        orchestrator.register_workflow("pipeline", self._build)
+        self.assertEqual(orchestrator.run_workflow({"task_name": "pipeline", "task_id": "t1"})["status"], "success")
+        self.assertEqual(orchestrator.checkpoint_journal.incomplete_runs(), [])
+        self.assertEqual(orchestrator.resume_incomplete_workflows(), {})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,7 +3,11 @@
 import unittest
 import os
 import yaml
-from advanced_security_script.core.config_manager import ConfigManager
+import shutil
+import tempfile
+import time
+from unittest import mock
+from advanced_security_script.core.config_manager import ConfigManager, ConfigSnapshot, config_cache_path
 
 # Ensure the test runs from the project root or paths are adjusted accordingly
 # For simplicity, this assumes paths are relative from where pytest might be run (project root)
@@ -72,7 +76,7 @@ class TestConfigManager(unittest.TestCase):
     def test_load_empty_config(self):
         cm = ConfigManager(config_path=self.empty_config_path)
         self.assertEqual(cm.get_all_config(), {})
-        self.assertIsNone(cm.get("global", "log_level"))
+        self.assertEqual(cm.get("global", "log_level"), "INFO") # Built-in default
 
     def test_load_invalid_yaml_config(self):
         # Suppress error logs during this specific test if desired, or check logs
@@ -106,6 +110,206 @@ class TestConfigManager(unittest.TestCase):
         if not os.listdir(temp_default_dir):
             os.rmdir(temp_default_dir)
 
+class TestConfigHotReload(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.config_path = os.path.join(self.temp_dir, "config.yaml")
+        create_temp_config_file(self.config_path, {"global": {"log_level": "INFO"}, "vulnerability_crawler": {"max_results_per_source": 10}})
+        self.cm = ConfigManager(config_path=self.config_path)
+        self.changes = []
+
+    def tearDown(self):
+        self.cm.stop_watching()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _edit(self, content):
+        create_temp_config_file(self.config_path, content)
+        # Make the change visible even on filesystems with coarse timestamps.
+        stat = os.stat(self.config_path)
+        os.utime(self.config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    def test_reload_only_on_change(self):
+        self.assertEqual(self.cm.version, 1)
+        self.assertFalse(self.cm.reload())
+        self._edit({"global": {"log_level": "INFO"}, "vulnerability_crawler": {"max_results_per_source": 50}})
+        self.assertTrue(self.cm.reload())
+        self.assertEqual(self.cm.version, 2)
+        self.assertEqual(self.cm.get("vulnerability_crawler", "max_results_per_source"), 50)
+
+    def test_snapshots_are_not_mutated(self):
+        before = self.cm.snapshot()
+        self._edit({"global": {"log_level": "DEBUG"}})
+        self.cm.reload()
+        self.assertEqual(before.config["global"]["log_level"], "INFO")
+        self.assertEqual(self.cm.snapshot().config["global"]["log_level"], "DEBUG")
+
+    def test_subscribers_are_notified_for_their_sections(self):
+        self.cm.subscribe(lambda old, new: self.changes.append(("crawler", new["vulnerability_crawler"])), sections=["vulnerability_crawler"])
+        self.cm.subscribe(lambda old, new: self.changes.append(("any", None)))
+        self._edit({"global": {"log_level": "DEBUG"}, "vulnerability_crawler": {"max_results_per_source": 10}})
+        self.cm.reload()
+        self.assertEqual(self.changes, [("any", None)])
+        self._edit({"global": {"log_level": "DEBUG"}, "vulnerability_crawler": {"max_results_per_source": 5}})
+        self.cm.reload()
+        self.assertIn(("crawler", {"max_results_per_source": 5}), self.changes)
+
+    def test_invalid_edit_keeps_current_config(self):
+        with open(self.config_path, "w") as f:
+            f.write("global: [invalid_yaml")
+        self.assertFalse(self.cm.reload())
+        self.assertEqual(self.cm.get("global", "log_level"), "INFO")
+        self.assertEqual(self.cm.version, 1)
+
+    def test_update_persists_and_publishes(self):
+        self.cm.subscribe(lambda old, new: self.changes.append(new["global"]["max_threads"]))
+        self.assertEqual(self.cm.update("global", "max_threads", 8), 2)
+        self.assertEqual(self.changes, [8])
+        self.assertFalse(self.cm.reload()) # The write is not seen as an external change
+        self.assertEqual(ConfigManager(config_path=self.config_path).get("global", "max_threads"), 8)
+
+    def test_watcher_picks_up_changes(self):
+        self.cm.start_watching(interval=0.01)
+        self._edit({"global": {"log_level": "WARNING"}})
+        deadline = time.monotonic() + 2
+        while self.cm.get("global", "log_level") != "WARNING" and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(self.cm.get("global", "log_level"), "WARNING")
+
+class TestConfigSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.config_path = os.path.join(self.temp_dir, "config.yaml")
+        create_temp_config_file(self.config_path, {
+            "global": {"max_threads": "8", "json_log_format": "yes", "log_queue_size": "many"},
+            "llm_report_generator": {"rag": {"top_k": 5}},
+            "scalar_section": "value",
+        })
+        self.cm = ConfigManager(config_path=self.config_path)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_dotted_path_lookup(self):
+        self.assertEqual(self.cm.lookup("llm_report_generator.rag.top_k"), 5)
+        self.assertEqual(self.cm.lookup("llm_report_generator.rag"), {"top_k": 5})
+        self.assertEqual(self.cm.lookup("llm_report_generator.missing", "fallback"), "fallback")
+        self.assertEqual(self.cm.get("scalar_section", "key", "default"), "default")
+
+    def test_schema_values_are_validated_at_load(self):
+        self.assertEqual(self.cm.get("global", "max_threads"), 8)
+        self.assertIs(self.cm.get("global", "json_log_format"), True)
+        self.assertEqual(self.cm.get("global", "log_queue_size"), 10000) # Invalid: schema default
+        self.assertEqual(len(self.cm.snapshot().errors), 1)
+
+    def test_typed_accessors(self):
+        self.assertEqual(self.cm.get_int("llm_report_generator.rag.top_k"), 5)
+        self.assertEqual(self.cm.get_float("llm_report_generator.rag.top_k"), 5.0)
+        self.assertEqual(self.cm.get_int("task_executor.queue_size"), 100) # Schema default
+        self.assertEqual(self.cm.get_int("llm_report_generator.missing", 3), 3)
+        self.assertEqual(self.cm.get_int("scalar_section", 7), 7) # Not convertible
+        self.assertEqual(self.cm.get_str("scalar_section"), "value")
+
+    def test_snapshot_is_immutable(self):
+        snapshot = self.cm.snapshot()
+        with self.assertRaises(AttributeError):
+            snapshot.version = 99
+        self.assertIsInstance(snapshot, ConfigSnapshot)
+
+class TestLayeredConfig(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.config_path = os.path.join(self.temp_dir, "config.yaml")
+        create_temp_config_file(self.config_path, {
+            "global": {"max_threads": 4},
+            "vulnerability_crawler": {"max_results_per_source": 10, "sources": ["NVD"]},
+            "rl_agent": {"episodes": 100, "learning_rate": 0.01},
+        })
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_environment_overrides_file(self):
+        env = {"ADVANCED_SECURITY__VULNERABILITY_CRAWLER__MAX_RESULTS_PER_SOURCE": "50", "ADVANCED_SECURITY__EASM__PORTS": "[22, 443]"}
+        with mock.patch.dict(os.environ, env):
+            cm = ConfigManager(config_path=self.config_path)
+            self.assertEqual(cm.get("vulnerability_crawler", "max_results_per_source"), 50)
+            self.assertEqual(cm.get("vulnerability_crawler", "sources"), ["NVD"])
+            self.assertEqual(cm.lookup("easm.ports"), [22, 443])
+            cm.update("global", "max_threads", 8)
+        with open(self.config_path) as f:
+            persisted = yaml.safe_load(f)
+        self.assertEqual(persisted["vulnerability_crawler"]["max_results_per_source"], 10) # Env values are not written back
+        self.assertNotIn("easm", persisted)
+
+    def test_builtin_defaults_back_dotted_lookups(self):
+        cm = ConfigManager(config_path=self.config_path)
+        self.assertEqual(cm.lookup("task_executor.queue_size"), 100)
+        self.assertEqual(cm.get("task_executor", "queue_size"), 100)
+        self.assertEqual(cm.get("task_executor", "queue_size", 5), 5) # An explicit default wins
+        self.assertIsNone(cm.get("task_executor", "unknown_key"))
+
+    def test_overrides_are_layered_and_memoized(self):
+        cm = ConfigManager(config_path=self.config_path)
+        view = cm.with_overrides({"rl_agent": {"episodes": 10}})
+        self.assertEqual(view.get_section("rl_agent"), {"episodes": 10, "learning_rate": 0.01})
+        self.assertEqual(cm.get("rl_agent", "episodes"), 100)
+        # Identical overrides (in any spelling or key order) share one merged view.
+        self.assertIs(cm.with_overrides({"rl_agent.episodes": 10}), cm.with_overrides({"rl_agent": {"episodes": 10}}))
+        self.assertIs(view, cm.with_overrides({"rl_agent": {"episodes": 10}}))
+        # Sections that are not overridden are shared, not copied.
+        self.assertIs(view.get_section("vulnerability_crawler"), cm.get_section("vulnerability_crawler"))
+
+    def test_overrides_follow_new_versions(self):
+        cm = ConfigManager(config_path=self.config_path)
+        before = cm.with_overrides({"rl_agent": {"episodes": 10}})
+        cm.update("rl_agent", "learning_rate", 0.5, persist=False)
+        after = cm.with_overrides({"rl_agent": {"episodes": 10}})
+        self.assertIsNot(before, after)
+        self.assertEqual(after.get("rl_agent", "learning_rate"), 0.5)
+
+    def test_invalid_override_is_rejected(self):
+        cm = ConfigManager(config_path=self.config_path)
+        with self.assertRaises(ValueError):
+            cm.with_overrides({"global": {"max_threads": "lots"}})
+
+class TestConfigBinaryCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.config_path = os.path.join(self.temp_dir, "config.yaml")
+        self.content = {"vulnerability_crawler": {"keywords": [f"product-{i}" for i in range(50)]}}
+        create_temp_config_file(self.config_path, self.content)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_unchanged_file_is_served_from_cache(self):
+        ConfigManager(config_path=self.config_path)
+        self.assertTrue(os.path.exists(config_cache_path(self.config_path)))
+        with mock.patch("advanced_security_script.core.config_manager.yaml.load", side_effect=AssertionError("parsed")):
+            cm = ConfigManager(config_path=self.config_path)
+        self.assertEqual(cm.get_all_config(), self.content)
+
+    def test_changed_file_invalidates_cache(self):
+        ConfigManager(config_path=self.config_path)
+        create_temp_config_file(self.config_path, {"global": {"log_level": "DEBUG"}})
+        self.assertEqual(ConfigManager(config_path=self.config_path).get("global", "log_level"), "DEBUG")
+
+    def test_corrupt_cache_falls_back_to_yaml(self):
+        with open(config_cache_path(self.config_path), "wb") as f:
+            f.write(b"not marshal data")
+        self.assertEqual(ConfigManager(config_path=self.config_path).get_all_config(), self.content)
+        self.assertEqual(ConfigManager(config_path=self.config_path).get_all_config(), self.content) # Cache rewritten
+
+    def test_uncacheable_values_and_disabled_cache(self):
+        with open(self.config_path, "w") as f:
+            f.write("global:\n  release_date: 2024-01-31\n")
+        cm = ConfigManager(config_path=self.config_path)
+        self.assertEqual(str(cm.get("global", "release_date")), "2024-01-31")
+        self.assertFalse(os.path.exists(config_cache_path(self.config_path)))
+        create_temp_config_file(self.config_path, self.content)
+        ConfigManager(config_path=self.config_path, binary_cache=False)
+        self.assertFalse(os.path.exists(config_cache_path(self.config_path)))
+
 if __name__ == "__main__":
     unittest.main()
 
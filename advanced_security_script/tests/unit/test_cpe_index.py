@@ -0,0 +1,120 @@
+# advanced_security_script/tests/unit/test_cpe_index.py
+
+import unittest
+from advanced_security_script.modules.intelligence.cpe_index import (
+    CpeIndex, extract_cpe_matches, normalize_query, parse_cpe23, version_key,
+)
+from advanced_security_script.modules.intelligence.nvd_sync import normalize_nvd_item
+from advanced_security_script.modules.intelligence.vulnerability_store import VulnerabilityStore
+
+def cve_item(cve_id: str, *cpe_matches, children=()) -> dict:
+    return {
+        "cve": {"CVE_data_meta": {"ID": cve_id}},
+        "configurations": {"nodes": [{"operator": "OR", "cpe_match": list(cpe_matches), "children": list(children)}]},
+        "publishedDate": "2021-10-05T09:15Z",
+    }
+
+HTTPD_RANGE = {"vulnerable": True, "cpe23Uri": "cpe:2.3:a:apache:http_server:*:*:*:*:*:*:*:*",
+               "versionStartIncluding": "2.4.0", "versionEndExcluding": "2.4.50"}
+HTTPD_EXACT = {"vulnerable": True, "cpe23Uri": "cpe:2.3:a:apache:http_server:2.4.49:*:*:*:*:*:*:*"}
+WINDOWS_PLATFORM = {"vulnerable": False, "cpe23Uri": "cpe:2.3:o:microsoft:windows:-:*:*:*:*:*:*:*"}
+
+class TestCpeParsing(unittest.TestCase):
+    def test_parse_cpe23(self):
+        self.assertEqual(parse_cpe23("cpe:2.3:a:Apache:HTTP_Server:2.4.49:*:*:*:*:*:*:*"),
+                         {"part": "a", "vendor": "apache", "product": "http_server", "version": "2.4.49"})
+        self.assertEqual(parse_cpe23(r"cpe:2.3:a:acme:portal\:pro:1.0")["product"], "portal:pro")
+        self.assertIsNone(parse_cpe23("cpe:/a:apache:http_server:2.4.49"))
+        self.assertIsNone(parse_cpe23("cpe:2.3:a:apache"))
+
+    def test_version_key_orders_numerically(self):
+        self.assertLess(version_key("2.4.9"), version_key("2.4.10"))
+        self.assertLess(version_key("1.0rc1"), version_key("1.0.1"))
+        self.assertEqual(version_key("8.2p1"), ((1, 8), (1, 2), (0, "p"), (1, 1), (0, "")))
+
+    def test_version_key_sorts_pre_releases_below_the_release(self):
+        ordered = ["1.0dev1", "1.0alpha", "1.0beta2", "1.0rc1", "1.0", "1.0a", "1.0p1", "1.0.1"]
+        self.assertEqual(sorted(ordered, key=version_key), ordered)
+        self.assertEqual(version_key("1.0-RC1"), version_key("1.0rc1"))
+
+    def test_pre_releases_fall_inside_ranges_ending_at_the_release(self):
+        index = CpeIndex()
+        index.add("CVE-BEFORE-2", "acme", "portal", version_start="1.0", version_end="2.0", end_inclusive=False)
+        self.assertEqual(index.match("portal", "2.0rc1", vendor="acme"), ["CVE-BEFORE-2"])
+        self.assertEqual(index.match("portal", "1.0rc1", vendor="acme"), [])
+
+    def test_normalize_query(self):
+        self.assertEqual(normalize_query({"product": "HTTP Server", "vendor": "Apache", "version": " 2.4.49 "}),
+                         ("apache", "http_server", "2.4.49"))
+        self.assertEqual(normalize_query("cpe:2.3:a:apache:http_server:*:*"), ("apache", "http_server", ""))
+
+    def test_extract_cpe_matches_keeps_vulnerable_entries_of_all_nodes(self):
+        item = cve_item("CVE-2021-41773", HTTPD_RANGE, HTTPD_RANGE,
+                        children=[{"operator": "AND", "cpe_match": [HTTPD_EXACT, WINDOWS_PLATFORM]}])
+        matches = extract_cpe_matches(item)
+        self.assertEqual(len(matches), 2)
+        self.assertIn({"cpe": HTTPD_RANGE["cpe23Uri"], "version_start": "2.4.0", "start_inclusive": True,
+                       "version_end": "2.4.50", "end_inclusive": False}, matches)
+        self.assertEqual(extract_cpe_matches({"cve": {}}), [])
+
+    def test_normalized_nvd_records_carry_cpe_matches(self):
+        record = normalize_nvd_item(cve_item("CVE-2021-41773", HTTPD_EXACT))
+        self.assertEqual([match["cpe"] for match in record["cpe_matches"]], [HTTPD_EXACT["cpe23Uri"]])
+
+class TestCpeIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = CpeIndex()
+        self.index.add_record("CVE-RANGE", extract_cpe_matches(cve_item("CVE-RANGE", HTTPD_RANGE)))
+        self.index.add_record("CVE-EXACT", extract_cpe_matches(cve_item("CVE-EXACT", HTTPD_EXACT)))
+        self.index.add("CVE-ANY", "apache", "http_server")
+        self.index.add("CVE-OPEN-START", "apache", "http_server", version_end="2.2.34")
+        self.index.add("CVE-EXCL-START", "apache", "http_server", version_start="2.4.49", start_inclusive=False)
+        self.index.add("CVE-OTHER-VENDOR", "acme", "http_server", "2.4.49")
+
+    def test_version_ranges(self):
+        self.assertEqual(self.index.match("http_server", "2.4.49", vendor="apache"), ["CVE-ANY", "CVE-EXACT", "CVE-RANGE"])
+        self.assertEqual(self.index.match("http_server", "2.4.50", vendor="apache"), ["CVE-ANY", "CVE-EXCL-START"])
+        self.assertEqual(self.index.match("http_server", "2.4.0", vendor="apache"), ["CVE-ANY", "CVE-RANGE"])
+        self.assertEqual(self.index.match("http_server", "2.2.34", vendor="apache"), ["CVE-ANY", "CVE-OPEN-START"])
+        self.assertEqual(self.index.match("http_server", "2.3", vendor="apache"), ["CVE-ANY"])
+
+    def test_missing_vendor_or_version_widens_the_match(self):
+        self.assertEqual(self.index.match("HTTP Server", "2.4.49"), ["CVE-ANY", "CVE-EXACT", "CVE-OTHER-VENDOR", "CVE-RANGE"])
+        self.assertEqual(len(self.index.match("http_server", vendor="apache")), 5)
+        self.assertEqual(self.index.match("nginx", "1.18.0"), [])
+
+    def test_match_many_preserves_order_and_reuses_results(self):
+        queries = [{"vendor": "apache", "product": "http_server", "version": "2.4.50"}, "cpe:2.3:a:acme:http_server:2.4.49",
+                   {"product": ""}, {"vendor": "Apache", "product": "http_server", "version": "2.4.50"}]
+        results = self.index.match_many(queries)
+        self.assertEqual(results[0], ["CVE-ANY", "CVE-EXCL-START"])
+        self.assertEqual(results[1], ["CVE-OTHER-VENDOR"])
+        self.assertEqual(results[2], [])
+        self.assertIs(results[3], results[0])
+
+class TestStoreCpeMatching(unittest.TestCase):
+    def setUp(self):
+        self.store = VulnerabilityStore(":memory:")
+        self.store.upsert_many([
+            normalize_nvd_item(cve_item("CVE-2021-41773", HTTPD_EXACT)),
+            normalize_nvd_item(cve_item("CVE-2021-42013", HTTPD_RANGE)),
+        ])
+
+    def tearDown(self):
+        self.store.close()
+
+    def test_match_cpes(self):
+        results = self.store.match_cpes([{"vendor": "apache", "product": "http_server", "version": "2.4.49"},
+                                         {"product": "http_server", "version": "2.4.50"}, {"product": "nginx"}])
+        self.assertEqual(results, [["CVE-2021-41773", "CVE-2021-42013"], [], []])
+
+    def test_upsert_replaces_and_delete_removes_entries(self):
+        self.store.upsert_many([normalize_nvd_item(cve_item("CVE-2021-41773", HTTPD_RANGE))])
+        # Records without cpe_matches (e.g. Exploit-DB) leave the entries alone
+        self.store.upsert_many([{"id": "CVE-2021-42013", "source": "Exploit-DB", "title": "PoC"}])
+        self.assertEqual(self.store.match_cpes(["cpe:2.3:a:apache:http_server:2.4.10"]), [["CVE-2021-41773", "CVE-2021-42013"]])
+        self.store.delete_many(["CVE-2021-41773"])
+        self.assertEqual(self.store.match_cpes(["cpe:2.3:a:apache:http_server:2.4.10"]), [["CVE-2021-42013"]])
+
+if __name__ == "__main__":
+    unittest.main()
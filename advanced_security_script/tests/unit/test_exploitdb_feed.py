@@ -0,0 +1,47 @@
+# advanced_security_script/tests/unit/test_exploitdb_feed.py
+
+import unittest
+import os
+import xml.etree.ElementTree as ET
+from advanced_security_script.modules.intelligence.exploitdb_feed import iter_exploitdb_records, iter_exploitdb_file, parse_exploitdb_feed
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "..", "fixtures", "exploitdb_rss.xml")
+
+class TestExploitDBFeed(unittest.TestCase):
+    def setUp(self):
+        with open(FIXTURE, "rb") as f:
+            self.feed = f.read()
+
+    def test_items_are_normalized(self):
+        records = parse_exploitdb_feed(self.feed)
+        self.assertEqual([record["id"] for record in records], ["EDB-ID:52101", "EDB-ID:52102", "EDB-ID:52103", "EDB-ID:52104"])
+        first = records[0]
+        self.assertEqual(first["source"], "Exploit-DB")
+        self.assertEqual(first["title"], "Acme Portal 4.2 - SQL Injection")
+        self.assertEqual(first["exploit_type"], "webapps")
+        self.assertEqual(first["link"], "https://www.exploit-db.com/exploits/52101")
+        self.assertEqual(first["published_date"], "2024-06-04T00:00:00+00:00")
+        self.assertEqual(first["cve_ids"], ["CVE-2024-31337"])
+        self.assertEqual(records[1]["published_date"], "2024-06-05T08:30:00+00:00") # Converted to UTC
+        self.assertEqual(records[1]["cve_ids"], ["CVE-2024-0042"])
+        self.assertEqual(records[3]["title"], "Sample Media Player 3.1 - Denial of Service & Crash")
+        self.assertEqual(records[3]["description"], records[3]["title"]) # Empty description
+        self.assertIsNone(records[3]["published_date"])
+
+    def test_chunk_boundaries_do_not_matter(self):
+        expected = parse_exploitdb_feed(self.feed)
+        self.assertEqual(parse_exploitdb_feed(self.feed, chunk_size=3), expected)
+        self.assertEqual(parse_exploitdb_feed(self.feed.decode("utf-8"), chunk_size=50), expected)
+        self.assertEqual(list(iter_exploitdb_file(FIXTURE, chunk_size=64)), expected)
+
+    def test_records_are_yielded_before_the_feed_ends(self):
+        head = self.feed[:self.feed.index(b"</item>") + len(b"</item>")]
+        records = iter_exploitdb_records(iter([head]))
+        self.assertEqual(next(records)["id"], "EDB-ID:52101")
+
+    def test_malformed_feed_raises(self):
+        with self.assertRaises(ET.ParseError):
+            parse_exploitdb_feed(b"<rss><channel><item><title>x</item></channel></rss>")
+
+if __name__ == "__main__":
+    unittest.main()
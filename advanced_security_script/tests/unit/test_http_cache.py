@@ -0,0 +1,40 @@
+# advanced_security_script/tests/unit/test_http_cache.py
+
+import unittest
+import shutil
+import tempfile
+from advanced_security_script.core.http_cache import HttpCache
+
+class TestHttpCache(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def test_stores_only_responses_with_validators(self):
+        cache = HttpCache(self.cache_dir)
+        self.assertFalse(cache.store("https://a/feed", None, {}, "application/rss+xml", "utf-8", b"<rss/>"))
+        self.assertFalse(cache.store("https://a/feed", None, {"ETag": '"1"', "Cache-Control": "no-store"}, "text/xml", None, b"x"))
+        self.assertTrue(cache.store("https://a/feed", None, {"ETag": '"v1"'}, "application/rss+xml", "utf-8", b"<rss/>"))
+        entry = cache.lookup("https://a/feed")
+        self.assertEqual(entry["body"], b"<rss/>")
+        self.assertEqual(HttpCache.conditional_headers(entry), {"If-None-Match": '"v1"'})
+        self.assertEqual(HttpCache.conditional_headers(None), {})
+
+    def test_key_depends_on_params_not_their_order(self):
+        cache = HttpCache(self.cache_dir)
+        cache.store("https://a/cves", {"a": 1, "b": 2}, {"Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"}, "application/json", None, b"{}")
+        self.assertIsNotNone(cache.lookup("https://a/cves", {"b": 2, "a": 1}))
+        self.assertIsNone(cache.lookup("https://a/cves", {"a": 2, "b": 2}))
+
+    def test_size_bound_evicts_least_recently_used(self):
+        cache = HttpCache(self.cache_dir, max_bytes=3000)
+        for i in range(3):
+            cache.store(f"https://a/{i}", None, {"ETag": str(i)}, "text/xml", None, b"x" * 1000)
+        self.assertLessEqual(cache.total_bytes, 3000)
+        self.assertIsNone(cache.lookup("https://a/0"))
+        self.assertIsNotNone(cache.lookup("https://a/2"))
+
+if __name__ == "__main__":
+    unittest.main()
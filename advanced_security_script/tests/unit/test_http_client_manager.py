@@ -0,0 +1,46 @@
+# advanced_security_script/tests/unit/test_http_client_manager.py
+
+import unittest
+import asyncio
+from advanced_security_script.core.http_client_manager import HttpClientManager
+from advanced_security_script.tests.unit.helpers import MockConfig
+
+class TestHttpClientManager(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.manager = HttpClientManager(MockConfig({"http_client": {"max_connections_per_host": 4, "dns_cache_ttl": 60}}))
+
+    async def asyncTearDown(self):
+        await self.manager.close()
+
+    async def test_session_is_shared_until_closed(self):
+        session = await self.manager.get_session()
+        self.assertIs(await self.manager.get_session(), session)
+        await self.manager.close()
+        self.assertTrue(session.closed)
+        reopened = await self.manager.get_session()
+        self.assertIsNot(reopened, session)
+        self.assertFalse(reopened.closed)
+
+    async def test_connector_uses_configured_limits(self):
+        connector = (await self.manager.get_session()).connector
+        self.assertEqual(connector.limit_per_host, 4)
+        self.assertEqual(connector.limit, 100)
+        self.assertTrue(connector.use_dns_cache)
+
+    async def test_session_is_bound_to_its_event_loop(self):
+        await self.manager.get_session()
+        # Another loop (in another thread) must not use the session while its own loop is alive.
+        with self.assertRaisesRegex(RuntimeError, "another event loop"):
+            await asyncio.to_thread(asyncio.run, self.manager.get_session())
+
+    def test_session_of_a_closed_loop_is_replaced(self):
+        manager = HttpClientManager(MockConfig())
+        first = asyncio.run(manager.get_session()) # Leaves the session open on a loop that is now closed
+        async def reopen():
+            session = await manager.get_session()
+            await manager.close()
+            return session
+        self.assertIsNot(asyncio.run(reopen()), first)
+
+if __name__ == "__main__":
+    unittest.main()
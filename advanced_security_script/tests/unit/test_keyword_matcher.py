@@ -0,0 +1,61 @@
+# advanced_security_script/tests/unit/test_keyword_matcher.py
+
+import unittest
+import random
+import re
+from advanced_security_script.modules.intelligence.keyword_matcher import KeywordMatcher, _trie_pattern
+
+class TestKeywordMatcher(unittest.TestCase):
+    def setUp(self):
+        self.records = [
+            {"id": "CVE-2025-0001", "title": "Apache HTTP Server flaw", "description": "Request smuggling in Apache httpd."},
+            {"id": "CVE-2025-0002", "title": "WordPress plugin XSS", "description": "Stored XSS in a WordPress plugin."},
+            {"id": "EDB-ID:52101", "title": "Acme Portal 4.2 - SQL Injection", "description": ""},
+        ]
+
+    def test_trie_pattern_matches_exactly_the_keywords(self):
+        words = ["apache", "apex", "api", "ap", "a.b", "[x]"]
+        pattern = re.compile(_trie_pattern(words))
+        for word in words:
+            self.assertTrue(pattern.fullmatch(word), word)
+        for other in ["a", "apach", "axb", "apis"]:
+            self.assertFalse(pattern.fullmatch(other), other)
+        self.assertEqual(pattern.match("apachex").group(), "apache") # Longest keyword first
+
+    def test_filter_records_records_spans(self):
+        matcher = KeywordMatcher(["apache", "sql injection", "APACHE", " "])
+        self.assertEqual(len(matcher), 2)
+        records = matcher.filter_records(self.records)
+        self.assertEqual([record["id"] for record in records], ["CVE-2025-0001", "EDB-ID:52101"])
+        self.assertEqual(records[0]["keyword_matches"], [
+            {"keyword": "apache", "field": "title", "start": 0, "end": 6},
+            {"keyword": "apache", "field": "description", "start": 21, "end": 27},
+        ])
+        match = records[1]["keyword_matches"][0]
+        self.assertEqual(records[1]["title"][match["start"]:match["end"]], "SQL Injection")
+        self.assertNotIn("keyword_matches", self.records[1])
+
+    def test_matches_do_not_span_fields(self):
+        matcher = KeywordMatcher(["0001 apache"])
+        self.assertEqual(matcher.match_batch(self.records), [[], [], []])
+
+    def test_spans_survive_case_folding_that_changes_length(self):
+        matcher = KeywordMatcher(["apache"])
+        record = {"id": "\u0130stanbul APACHE"} # "\u0130".lower() is two characters long
+        match = matcher.match_batch([record])[0][0]
+        self.assertEqual(record["id"][match["start"]:match["end"]], "APACHE")
+
+    def test_without_keywords_everything_is_kept(self):
+        self.assertEqual(KeywordMatcher([]).filter_records(self.records), self.records)
+
+    def test_agrees_with_substring_search(self):
+        rng = random.Random(7)
+        alphabet = "abcde -."
+        keywords = ["".join(rng.choice(alphabet) for _ in range(rng.randint(1, 4))).strip() or "a" for _ in range(200)]
+        records = [{"id": str(i), "title": "".join(rng.choice(alphabet) for _ in range(30)), "description": None} for i in range(300)]
+        matcher = KeywordMatcher(keywords)
+        expected = [r["id"] for r in records if any(kw.lower() in f"{r['id']}\x00{r['title']}".lower() for kw in keywords)]
+        self.assertEqual([r["id"] for r in matcher.filter_records(records, batch_size=16)], expected)
+
+if __name__ == "__main__":
+    unittest.main()
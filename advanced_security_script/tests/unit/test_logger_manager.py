@@ -4,9 +4,14 @@ import unittest
 import os
 import logging
 import json
-from advanced_security_script.core.logger_manager import LoggerManager
+import queue
+import shutil
+import tempfile
+import logging.handlers
+from advanced_security_script.core.logger_manager import LoggerManager, BoundedQueueHandler, FastJsonFormatter, StructuredMessage
 # Assuming ConfigManager is in core, or use a mock for isolated testing
 from advanced_security_script.core.config_manager import ConfigManager 
+from advanced_security_script.tests.unit.helpers import MockConfig
 
 class TestLoggerManager(unittest.TestCase):
     def setUp(self):
@@ -37,11 +42,7 @@ class TestLoggerManager(unittest.TestCase):
         with open(file_path, "r") as f:
             return f.readlines()
 
-    class MockConfigManager:
-        def __init__(self, config_data):
-            self.config_data = config_data
-        def get(self, section, key, default=None):
-            return self.config_data.get(section, {}).get(key, default)
+    class MockConfigManager(MockConfig):
         def get_all_config(self):
             return self.config_data
 
@@ -76,12 +77,6 @@ class TestLoggerManager(unittest.TestCase):
         self.assertFalse(any("{\"message\": \"This is a standard debug message.\"}" in line for line in log_content)) # Ensure not JSON
 
     def test_initialization_with_json_config(self):
-        # Requires python-json-logger to be installed in the environment
-        try:
-            import pythonjsonlogger.jsonlogger
-        except ImportError:
-            self.skipTest("python-json-logger is not installed, skipping JSON logging test.")
-
         config_data = {
             "global": {
                 "log_level": "INFO",
@@ -121,6 +116,36 @@ class TestLoggerManager(unittest.TestCase):
         self.assertEqual(logger1.name, "module1")
         self.assertEqual(logger2.name, "module2")
 
+    def test_log_level_follows_config_changes(self):
+        temp_dir = tempfile.mkdtemp()
+        try:
+            config_path = os.path.join(temp_dir, "config.yaml")
+            with open(config_path, "w") as f:
+                json.dump({"global": {"log_level": "INFO", "log_file_path": os.path.join(temp_dir, "app.log")}}, f)
+            cm = ConfigManager(config_path=config_path)
+            LoggerManager(config_manager=cm)
+            self.assertEqual(logging.getLogger().level, logging.INFO)
+            cm.update("global", "log_level", "DEBUG")
+            self.assertEqual(logging.getLogger().level, logging.DEBUG)
+            self.assertTrue(all(h.level == logging.DEBUG for h in logging.getLogger().handlers))
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def test_close_stops_following_config_changes(self):
+        temp_dir = tempfile.mkdtemp()
+        try:
+            config_path = os.path.join(temp_dir, "config.yaml")
+            with open(config_path, "w") as f:
+                json.dump({"global": {"log_level": "INFO", "log_file_path": os.path.join(temp_dir, "app.log")}}, f)
+            cm = ConfigManager(config_path=config_path)
+            lm = LoggerManager(config_manager=cm)
+            lm.close()
+            self.assertEqual(cm._subscribers, [])
+            cm.update("global", "log_level", "DEBUG")
+            self.assertEqual(logging.getLogger().level, logging.INFO)
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
     def test_log_directory_creation_failure(self):
         # This test is a bit tricky as it involves filesystem permissions or invalid paths.
         # We can simulate by providing a path that's hard/impossible to create.
@@ -145,6 +170,105 @@ class TestLoggerManager(unittest.TestCase):
         except Exception as e:
             self.fail(f"LoggerManager raised an unexpected exception during fallback: {e}")
 
+class TestAsyncLogging(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.log_file = os.path.join(self.temp_dir, "async.log")
+
+    def tearDown(self):
+        LoggerManager.shutdown()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _record(self, level, msg, *args):
+        return logging.LogRecord("async_test", level, __file__, 1, msg, args, None)
+
+    def test_records_are_written_by_the_listener(self):
+        config_data = {"global": {"log_level": "INFO", "log_file_path": self.log_file, "async_logging": True}}
+        lm = LoggerManager(config_manager=TestLoggerManager.MockConfigManager(config_data))
+        root_handlers = logging.getLogger().handlers
+        self.assertEqual(len(root_handlers), 1)
+        self.assertIsInstance(root_handlers[0], logging.handlers.QueueHandler)
+
+        lm.get_logger("async_logger").info("queued message %s", 42)
+        LoggerManager.shutdown() # Drains the queue
+        with open(self.log_file) as f:
+            self.assertIn("queued message 42", f.read())
+        # Logging continues synchronously on the original handlers.
+        self.assertFalse(any(isinstance(h, logging.handlers.QueueHandler) for h in logging.getLogger().handlers))
+
+    def test_drop_debug_policy(self):
+        log_queue = queue.Queue(maxsize=1)
+        handler = BoundedQueueHandler(log_queue, "drop_debug")
+        handler.handle(self._record(logging.INFO, "first"))
+        handler.handle(self._record(logging.DEBUG, "noise"))
+        self.assertEqual(handler.dropped, 1)
+        self.assertEqual(log_queue.get_nowait().getMessage(), "first")
+
+    def test_drop_oldest_policy(self):
+        log_queue = queue.Queue(maxsize=2)
+        handler = BoundedQueueHandler(log_queue, "drop_oldest")
+        for i in range(4):
+            handler.handle(self._record(logging.INFO, "message %d", i))
+        self.assertEqual(handler.dropped, 2)
+        self.assertEqual([log_queue.get_nowait().getMessage() for _ in range(2)], ["message 2", "message 3"])
+
+    def test_unknown_overflow_policy(self):
+        with self.assertRaises(ValueError):
+            BoundedQueueHandler(queue.Queue(maxsize=1), "discard_everything")
+
+class TestFastJsonFormatter(unittest.TestCase):
+    def _record(self, msg, *args, exc_info=None, **extra):
+        record = logging.LogRecord("json_test", logging.WARNING, __file__, 12, msg, args, exc_info, func="handler")
+        record.__dict__.update(extra)
+        return record
+
+    def test_fields_static_fields_and_extras(self):
+        formatter = FastJsonFormatter(service="scanner")
+        entry = json.loads(formatter.format(self._record("found %d assets", 3, target="example.com")))
+        self.assertEqual(entry["message"], "found 3 assets")
+        self.assertEqual(entry["name"], "json_test")
+        self.assertEqual(entry["levelname"], "WARNING")
+        self.assertEqual(entry["funcName"], "handler")
+        self.assertEqual(entry["lineno"], 12)
+        self.assertEqual(entry["service"], "scanner")
+        self.assertEqual(entry["pid"], os.getpid())
+        self.assertIn("host", entry)
+        self.assertEqual(entry["target"], "example.com")
+        self.assertNotIn("args", entry) # Standard LogRecord attributes are not treated as extras
+
+    def test_field_selection_and_time_format(self):
+        formatter = FastJsonFormatter(fields=("asctime", "message"))
+        record = self._record("hello")
+        entry = json.loads(formatter.format(record))
+        self.assertEqual(entry["asctime"], logging.Formatter().formatTime(record))
+        self.assertNotIn("levelname", entry)
+
+    def test_exception_and_unserializable_extras(self):
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            import sys
+            record = self._record("failed", exc_info=sys.exc_info(), payload={1: object()})
+        entry = json.loads(FastJsonFormatter().format(record))
+        self.assertIn("ValueError: boom", entry["exc_info"])
+        self.assertIn("1", entry["payload"])
+
+    def test_structured_message_fields(self):
+        record = self._record(StructuredMessage("Fetched %d items", 20, source="NVD", page=3))
+        self.assertEqual(record.getMessage(), "Fetched 20 items source=NVD page=3")
+        entry = json.loads(FastJsonFormatter().format(record))
+        self.assertEqual(entry["message"], "Fetched 20 items")
+        self.assertEqual((entry["source"], entry["page"]), ("NVD", 3))
+
+    def test_structured_message_is_not_rendered_when_level_is_disabled(self):
+        class Exploding:
+            def __str__(self):
+                raise AssertionError("rendered")
+        logger = logging.getLogger("structured_disabled")
+        logger.setLevel(logging.WARNING)
+        logger.debug(StructuredMessage("never rendered", value=Exploding()))
+        logger.setLevel(logging.NOTSET)
+
 if __name__ == "__main__":
     unittest.main()
 
@@ -0,0 +1,66 @@
+# advanced_security_script/tests/unit/test_logging_style.py
+
+import unittest
+import ast
+import os
+
+PACKAGE_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+CHECKED_PACKAGES = ("core", "modules")
+LOG_METHODS = {"debug", "info", "warning", "warn", "error", "exception", "critical", "log"}
+
+def _is_logger(node) -> bool:
+    receiver = ast.unparse(node)
+    return receiver == "logging" or receiver.endswith("logger")
+
+def _is_eager(node) -> bool:
+    """True for messages formatted before the logging call: f-strings, % / + on strings, str.format()."""
+    if isinstance(node, ast.JoinedStr):
+        return True
+    if isinstance(node, ast.BinOp) and isinstance(node.op, (ast.Mod, ast.Add)):
+        return True
+    return isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute) and node.func.attr == "format"
+
+def find_eager_log_calls(source: str, filename: str = "<string>") -> list:
+    """
+    Returns (line, source) for every logging call in `source` whose message is formatted eagerly.
+    """
+    violations = []
+    for node in ast.walk(ast.parse(source, filename)):
+        if not (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)):
+            continue
+        if node.func.attr not in LOG_METHODS or not _is_logger(node.func.value):
+            continue
+        args = node.args[1:] if node.func.attr == "log" else node.args
+        if args and _is_eager(args[0]):
+            violations.append((node.lineno, ast.unparse(node)))
+    return violations
+
+class TestLoggingStyle(unittest.TestCase):
+    def test_detects_eager_formatting(self):
+        source = (
+            "logger.debug(f'loaded {config}')\n"
+            "self.logger.info('a %s' % b)\n"
+            "logging.warning('{}'.format(x))\n"
+            "logger.log(10, 'x' + y)\n"
+            "logger.debug('loaded %s', config)\n"
+            "print(f'not a log call {x}')\n"
+        )
+        self.assertEqual([line for line, _ in find_eager_log_calls(source)], [1, 2, 3, 4])
+
+    def test_core_and_modules_log_lazily(self):
+        # Log messages must be rendered by logging itself (%-style arguments or StructuredMessage),
+        # so disabled levels cost no formatting.
+        violations = []
+        for package in CHECKED_PACKAGES:
+            for root, _, files in os.walk(os.path.join(PACKAGE_ROOT, package)):
+                for filename in files:
+                    if not filename.endswith(".py"):
+                        continue
+                    path = os.path.join(root, filename)
+                    with open(path, "r", encoding="utf-8") as f:
+                        for line, call in find_eager_log_calls(f.read(), path):
+                            violations.append(f"{os.path.relpath(path, PACKAGE_ROOT)}:{line}: {call}")
+        self.assertEqual(violations, [], "Eagerly formatted log messages:\n" + "\n".join(violations))
+
+if __name__ == "__main__":
+    unittest.main()
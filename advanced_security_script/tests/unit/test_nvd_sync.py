@@ -0,0 +1,142 @@
+# advanced_security_script/tests/unit/test_nvd_sync.py
+
+import unittest
+import asyncio
+import datetime
+import json
+import os
+import shutil
+import tempfile
+from advanced_security_script.modules.intelligence import nvd_sync
+from advanced_security_script.modules.intelligence.nvd_sync import NVDSyncEngine, stream_cve_items
+from advanced_security_script.tests.unit.helpers import MockConfig
+
+def make_page(total_results, start_index, count):
+    items = [{"cve": {"CVE_data_meta": {"ID": f"CVE-2025-{start_index + i:05d}"}}} for i in range(count)]
+    return {"totalResults": total_results, "startIndex": start_index, "result": {"CVE_Items": items}}
+
+class FakeNVD:
+    """Serves pages from an in-memory dataset and records every request."""
+    def __init__(self, total_results, failing_indexes=()):
+        self.total_results = total_results
+        self.failing_indexes = set(failing_indexes)
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def fetch_page(self, params):
+        self.requests.append(dict(params))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0)
+        self.in_flight -= 1
+        start = params["startIndex"]
+        if start in self.failing_indexes:
+            return None
+        count = max(0, min(params["resultsPerPage"], self.total_results - start))
+        return make_page(self.total_results, start, count)
+
+    async def stream_page(self, params, on_items):
+        page = await self.fetch_page(params)
+        if page is None:
+            return None
+        items = page.pop("result")["CVE_Items"]
+        for i in range(0, len(items), 4): # Delivered in batches, as stream_cve_items does
+            await on_items(items[i:i + 4])
+        return dict(page, itemCount=len(items))
+
+class ChunkedReader:
+    """Async reader over a byte string, returning at most chunk_size bytes per read."""
+    def __init__(self, data: bytes, chunk_size: int = 7):
+        self.data = data
+        self.chunk_size = chunk_size
+    async def read(self, n=-1):
+        size = self.chunk_size if n < 0 else min(n, self.chunk_size)
+        chunk, self.data = self.data[:size], self.data[size:]
+        return chunk
+
+class TestNVDSyncEngine(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.state_path = os.path.join(self.temp_dir, "nvd_sync_state.json")
+        self.config = MockConfig({"vulnerability_crawler": {"nvd_results_per_page": 10, "nvd_max_concurrent_pages": 3}})
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _run_sync(self, nvd, full=False, streaming=False):
+        received = []
+        engine = NVDSyncEngine(self.config, nvd.fetch_page, state_path=self.state_path,
+                               stream_page=nvd.stream_page if streaming else None)
+        summary = asyncio.run(engine.sync(on_page=received.extend, full=full))
+        return summary, received
+
+    def test_full_sync_walks_every_page(self):
+        nvd = FakeNVD(total_results=95)
+        summary, received = self._run_sync(nvd)
+        self.assertEqual(summary["items"], 95)
+        self.assertEqual(summary["pages"], 10)
+        self.assertTrue(summary["complete"])
+        self.assertFalse(summary["delta"])
+        self.assertEqual(len({item["cve"]["CVE_data_meta"]["ID"] for item in received}), 95)
+        self.assertLessEqual(nvd.max_in_flight, 3)
+        self.assertTrue(all("modStartDate" not in params for params in nvd.requests))
+
+    def test_second_run_only_fetches_delta(self):
+        self._run_sync(FakeNVD(total_results=25))
+        with open(self.state_path) as f:
+            state = json.load(f)
+        # Pretend the previous sync ran an hour ago so the delta window is non-empty.
+        watermark = (datetime.datetime.fromisoformat(state["last_modified_watermark"]) - datetime.timedelta(hours=1)).isoformat()
+        with open(self.state_path, "w") as f:
+            json.dump({"last_modified_watermark": watermark}, f)
+
+        nvd = FakeNVD(total_results=3)
+        summary, received = self._run_sync(nvd)
+        self.assertTrue(summary["delta"])
+        self.assertEqual(len(received), 3)
+        self.assertEqual(len(nvd.requests), 1)
+        self.assertIn("modStartDate", nvd.requests[0])
+        self.assertIn("modEndDate", nvd.requests[0])
+        self.assertGreaterEqual(summary["watermark"], watermark)
+
+    def test_failed_page_does_not_advance_watermark(self):
+        summary, _ = self._run_sync(FakeNVD(total_results=30, failing_indexes={20}))
+        self.assertFalse(summary["complete"])
+        self.assertFalse(os.path.exists(self.state_path))
+
+    def test_long_gap_is_split_into_date_windows(self):
+        with open(self.state_path, "w") as f:
+            json.dump({"last_modified_watermark": "2020-01-01T00:00:00+00:00"}, f)
+        nvd = FakeNVD(total_results=0)
+        summary, _ = self._run_sync(nvd)
+        self.assertTrue(summary["delta"])
+        self.assertGreater(len(nvd.requests), 1)
+        self.assertEqual(nvd.requests[0]["modStartDate"], "2020-01-01T00:00:00:000 UTC-00:00")
+
+    def test_streamed_pages(self):
+        nvd = FakeNVD(total_results=35, failing_indexes={20})
+        summary, received = self._run_sync(nvd, streaming=True)
+        self.assertEqual(summary["items"], 25)
+        self.assertEqual(summary["pages"], 3)
+        self.assertFalse(summary["complete"])
+        self.assertEqual(len({item["cve"]["CVE_data_meta"]["ID"] for item in received}), 25)
+
+@unittest.skipIf(nvd_sync.ijson is None, "ijson is not installed")
+class TestStreamCveItems(unittest.IsolatedAsyncioTestCase):
+    async def test_items_are_delivered_in_batches(self):
+        page = make_page(total_results=120, start_index=100, count=5)
+        page["result"]["CVE_Items"][0]["impact"] = {"baseMetricV3": {"cvssV3": {"baseScore": 9.8}}}
+        batches = []
+        fields = await stream_cve_items(ChunkedReader(json.dumps(page).encode()), batches.append, batch_size=2)
+        self.assertEqual([len(batch) for batch in batches], [2, 2, 1])
+        self.assertEqual([item for batch in batches for item in batch], page["result"]["CVE_Items"])
+        self.assertIsInstance(batches[0][0]["impact"]["baseMetricV3"]["cvssV3"]["baseScore"], float)
+        self.assertEqual(fields, {"totalResults": 120, "startIndex": 100, "itemCount": 5})
+
+    async def test_invalid_json_raises(self):
+        with self.assertRaises(nvd_sync.ijson.JSONError):
+            await stream_cve_items(ChunkedReader(b'{"totalResults": 3, "result": {"CVE_Items": [{"cve": '), lambda items: None)
+
+if __name__ == "__main__":
+    unittest.main()
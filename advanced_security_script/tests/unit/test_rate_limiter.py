@@ -0,0 +1,87 @@
+# advanced_security_script/tests/unit/test_rate_limiter.py
+
+import unittest
+import asyncio
+import email.utils
+import time
+from advanced_security_script.core.rate_limiter import TokenBucket, AdaptiveConcurrencyLimiter, SourceThrottle, parse_retry_after
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+    def __call__(self):
+        return self.now
+
+class TestTokenBucket(unittest.TestCase):
+    def test_burst_then_sustained_rate(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2, burst=3, clock=clock)
+        self.assertEqual([bucket.reserve() for _ in range(3)], [0, 0, 0])
+        self.assertAlmostEqual(bucket.reserve(), 0.5)
+        self.assertAlmostEqual(bucket.reserve(), 1.0) # Queued behind the previous reservation
+        clock.now += 10
+        self.assertEqual(bucket.reserve(), 0) # Refilled, but never beyond the burst size
+        self.assertEqual(bucket.reserve(), 0)
+        self.assertEqual(bucket.reserve(), 0)
+        self.assertAlmostEqual(bucket.reserve(), 0.5)
+
+    def test_pause_delays_tokens_and_drops_the_burst(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=1, burst=5, clock=clock)
+        bucket.pause(30)
+        self.assertAlmostEqual(bucket.reserve(), 31) # Resumes at the sustained rate after the pause
+        clock.now += 31
+        self.assertAlmostEqual(bucket.reserve(), 1)
+
+    def test_no_rate_means_no_limit(self):
+        bucket = TokenBucket(rate=None)
+        self.assertEqual(sum(bucket.reserve() for _ in range(100)), 0)
+
+class TestAdaptiveConcurrencyLimiter(unittest.IsolatedAsyncioTestCase):
+    async def test_limit_bounds_concurrency(self):
+        limiter = AdaptiveConcurrencyLimiter(2)
+        peak = 0
+        async def request():
+            nonlocal peak
+            async with limiter:
+                peak = max(peak, limiter.in_flight)
+                await asyncio.sleep(0.01)
+        await asyncio.gather(*(request() for _ in range(6)))
+        self.assertEqual(peak, 2)
+
+    def test_additive_increase_multiplicative_decrease(self):
+        clock = FakeClock()
+        limiter = AdaptiveConcurrencyLimiter(8, minimum=1, maximum=8, clock=clock)
+        limiter.record_throttled()
+        self.assertEqual(limiter.limit, 4)
+        limiter.record_throttled() # Same burst of throttling responses: no further decrease
+        self.assertEqual(limiter.limit, 4)
+        clock.now += 5
+        limiter.record_throttled()
+        self.assertEqual(limiter.limit, 2)
+        for _ in range(3):
+            limiter.record_success()
+        self.assertGreaterEqual(limiter.limit, 3)
+        for _ in range(100):
+            limiter.record_success()
+        self.assertEqual(limiter.limit, 8)
+
+class TestRetryPolicy(unittest.TestCase):
+    def test_parse_retry_after(self):
+        self.assertEqual(parse_retry_after("120"), 120)
+        self.assertIsNone(parse_retry_after(None))
+        self.assertIsNone(parse_retry_after("soon"))
+        future = email.utils.formatdate(time.time() + 60, usegmt=True)
+        self.assertAlmostEqual(parse_retry_after(future), 60, delta=2)
+        past = email.utils.formatdate(time.time() - 60, usegmt=True)
+        self.assertEqual(parse_retry_after(past), 0)
+
+    def test_backoff_is_jittered_exponential_and_honors_retry_after(self):
+        throttle = SourceThrottle("test", backoff_base=1.0, backoff_max=8.0)
+        for attempt in range(6):
+            self.assertLessEqual(throttle.backoff_delay(attempt), min(8.0, 2 ** attempt))
+        self.assertGreater(len({throttle.backoff_delay(3) for _ in range(20)}), 1)
+        self.assertGreaterEqual(throttle.backoff_delay(0, retry_after=30), 30)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+# advanced_security_script/tests/unit/test_record_merger.py
+
+import unittest
+from advanced_security_script.modules.intelligence.record_merger import RecordMerger
+from advanced_security_script.modules.intelligence.vulnerability_store import VulnerabilityStore
+
+def nvd(cve_id, description="Overflow in Widget", references=(), modified="2025-01-01T00:00Z"):
+    return {"source": "NVD", "id": cve_id, "title": cve_id, "description": description, "severity": "HIGH",
+            "cvss_score": 8.1, "references": list(references), "published_date": "2025-01-01T00:00Z",
+            "last_modified_date": modified, "link": f"https://nvd.nist.gov/vuln/detail/{cve_id}"}
+
+def edb(edb_id, cve_ids=(), modified="2025-03-01T00:00:00+00:00"):
+    link = f"https://www.exploit-db.com/exploits/{edb_id}"
+    return {"source": "Exploit-DB", "id": f"EDB-ID:{edb_id}", "title": f"Widget exploit {edb_id}", "description": "PoC",
+            "severity": None, "cvss_score": None, "references": [link], "published_date": modified,
+            "last_modified_date": modified, "link": link, "exploit_type": "remote", "cve_ids": list(cve_ids)}
+
+class TestRecordMerger(unittest.TestCase):
+    def setUp(self):
+        self.merger = RecordMerger()
+
+    def test_exploit_naming_a_cve_is_merged_with_provenance(self):
+        result = self.merger.merge([nvd("CVE-2025-0001"), edb(52101, ["cve-2025-0001"])])
+        self.assertEqual(result["ids"], ["CVE-2025-0001"])
+        merged, = result["changed"]
+        self.assertEqual(merged["id"], "CVE-2025-0001")
+        self.assertEqual(merged["source"], "NVD")
+        self.assertEqual(merged["sources"], ["NVD", "Exploit-DB"])
+        self.assertEqual(merged["aliases"], ["EDB-ID:52101"])
+        self.assertEqual(merged["description"], "Overflow in Widget")
+        self.assertEqual(merged["title"], "Widget exploit 52101") # NVD titles only repeat the ID
+        self.assertEqual(merged["exploit_type"], "remote")
+        self.assertEqual(merged["last_modified_date"], "2025-03-01T00:00:00+00:00") # Newest of the two
+        self.assertEqual(merged["references"], ["https://www.exploit-db.com/exploits/52101"])
+        self.assertEqual(merged["provenance"], {
+            "source": "NVD", "title": "Exploit-DB", "description": "NVD", "severity": "NVD", "cvss_score": "NVD",
+            "published_date": "NVD", "last_modified_date": "Exploit-DB", "link": "NVD", "exploit_type": "Exploit-DB",
+        })
+        self.assertEqual(len(self.merger), 1)
+
+    def test_unchanged_records_are_not_emitted_again(self):
+        self.merger.merge([nvd("CVE-2025-0001"), edb(52101, ["CVE-2025-0001"])])
+        result = self.merger.merge([nvd("CVE-2025-0001")])
+        self.assertEqual(result["changed"], [])
+        self.assertEqual(result["ids"], ["CVE-2025-0001"])
+        changed = self.merger.merge([nvd("CVE-2025-0001", description="Updated")])["changed"]
+        self.assertEqual([record["description"] for record in changed], ["Updated"])
+
+    def test_nvd_reference_pulls_in_a_standalone_exploit(self):
+        first = self.merger.merge([edb(52103)])
+        self.assertEqual([record["id"] for record in first["changed"]], ["EDB-ID:52103"])
+        second = self.merger.merge([nvd("CVE-2025-0002", references=["https://www.exploit-db.com/exploits/52103"])])
+        self.assertEqual([record["id"] for record in second["changed"]], ["CVE-2025-0002"])
+        self.assertEqual(second["retired"], ["EDB-ID:52103"])
+        self.assertIsNone(self.merger.get("EDB-ID:52103"))
+        self.assertEqual(self.merger.get("cve-2025-0002")["aliases"], ["EDB-ID:52103"])
+        # Later versions of the exploit go straight to the CVE
+        self.assertEqual(self.merger.merge([edb(52103, modified="2025-04-01T00:00:00+00:00")])["ids"], ["CVE-2025-0002"])
+
+    def test_distinct_cves_are_never_merged(self):
+        result = self.merger.merge([nvd("CVE-2025-0001"), nvd("CVE-2025-0002"), edb(52104, ["CVE-2025-0001", "CVE-2025-0002"])])
+        self.assertEqual(sorted(result["ids"]), ["CVE-2025-0001", "CVE-2025-0002"])
+        for cve_id in ("CVE-2025-0001", "CVE-2025-0002"):
+            self.assertEqual(self.merger.get(cve_id)["aliases"], ["EDB-ID:52104"])
+
+    def test_stored_records_seed_a_new_merger(self):
+        store = VulnerabilityStore(":memory:")
+        store.upsert_many(RecordMerger().merge([nvd("CVE-2025-0001"), edb(52105)])["changed"])
+        # A later crawl, e.g. by a new crawler, sees only an exploit naming the CVE
+        merger, records = RecordMerger(), [edb(52101, ["CVE-2025-0001"])]
+        self.assertEqual(merger.related_ids(records), {"CVE-2025-0001", "EDB-ID:52101"})
+        merged, = merger.merge(records, stored=store.get_many(merger.related_ids(records)))["changed"]
+        self.assertEqual((merged["severity"], merged["cvss_score"]), ("HIGH", 8.1))
+        self.assertEqual(merged["published_date"], "2025-01-01T00:00:00+00:00")
+        self.assertEqual(merged["sources"], ["NVD", "Exploit-DB"])
+        # Stored groups are not emitted again unless they change; absorbed ones are retired
+        records = [nvd("CVE-2025-0003", references=["https://www.exploit-db.com/exploits/52105"])]
+        result = RecordMerger().merge(records, stored=store.get_many({"CVE-2025-0001", "EDB-ID:52105"}))
+        self.assertEqual([record["id"] for record in result["changed"]], ["CVE-2025-0003"])
+        self.assertEqual(result["retired"], ["EDB-ID:52105"])
+        self.assertEqual(result["ids"], ["CVE-2025-0003"])
+        store.close()
+
+    def test_source_priority(self):
+        merger = RecordMerger(source_priority=["Exploit-DB", "NVD"])
+        merged, = merger.merge([nvd("CVE-2025-0001"), edb(52101, ["CVE-2025-0001"])])["changed"]
+        self.assertEqual(merged["source"], "Exploit-DB")
+        self.assertEqual(merged["description"], "PoC")
+        self.assertEqual(merged["severity"], "HIGH") # Exploit-DB has none
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+# advanced_security_script/tests/unit/test_step_cache.py
+
+import unittest
+import os
+import shutil
+import tempfile
+import time
+import yaml
+from advanced_security_script.core.step_cache import StepCache
+from advanced_security_script.core.workflow_graph import WorkflowGraph, WorkflowStep
+from advanced_security_script.core.workflow_orchestrator import WorkflowOrchestrator
+
+class TestStepCache(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def test_key_is_stable_and_input_sensitive(self):
+        key = StepCache.make_key("crawl", "1", {"a": [1, 2]}, {"target": "x", "keywords": ["k"]}, {"max": 5})
+        self.assertEqual(key, StepCache.make_key("crawl", "1", {"a": [1, 2]}, {"keywords": ["k"], "target": "x"}, {"max": 5}))
+        self.assertNotEqual(key, StepCache.make_key("crawl", "2", {"a": [1, 2]}, {"target": "x", "keywords": ["k"]}, {"max": 5}))
+        self.assertNotEqual(key, StepCache.make_key("crawl", "1", {"a": [1, 3]}, {"target": "x", "keywords": ["k"]}, {"max": 5}))
+        self.assertNotEqual(key, StepCache.make_key("crawl", "1", {"a": [1, 2]}, {"target": "x", "keywords": ["k"]}, {"max": 6}))
+
+    def test_set_get_and_persistence(self):
+        cache = StepCache(self.cache_dir)
+        self.assertEqual(cache.get("k1"), (False, None))
+        cache.set("k1", {"findings": [1, 2, 3]})
+        self.assertEqual(cache.get("k1"), (True, {"findings": [1, 2, 3]}))
+        reopened = StepCache(self.cache_dir)
+        self.assertEqual(reopened.get("k1"), (True, {"findings": [1, 2, 3]}))
+
+    def test_ttl_expiry(self):
+        cache = StepCache(self.cache_dir)
+        cache.set("short", "value", ttl=0.01)
+        time.sleep(0.02)
+        self.assertEqual(cache.get("short"), (False, None))
+        self.assertEqual(len(cache), 0)
+
+    def test_lru_eviction_by_size(self):
+        cache = StepCache(self.cache_dir, max_bytes=3000)
+        for i in range(3):
+            cache.set(f"k{i}", "x" * 900)
+        cache.get("k0") # k0 becomes most recently used; k1 is now the eviction candidate
+        cache.set("k3", "x" * 900)
+        self.assertFalse(cache.get("k1")[0])
+        self.assertTrue(cache.get("k0")[0])
+        self.assertTrue(cache.get("k3")[0])
+        self.assertLessEqual(cache.total_bytes, 3000)
+
+    def test_unpicklable_values_are_skipped(self):
+        cache = StepCache(self.cache_dir)
+        cache.set("lambda", lambda: None)
+        self.assertEqual(cache.get("lambda"), (False, None))
+
+class TestOrchestratorStepCaching(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.config_path = os.path.join(self.temp_dir, "config.yaml")
+        with open(self.config_path, "w") as f:
+            yaml.dump({
+                "global": {"log_file_path": os.path.join(self.temp_dir, "test.log")},
+                "workflow_settings": {"step_cache_dir": os.path.join(self.temp_dir, "step_cache")},
+            }, f)
+        self.calls = []
+        self.fail_report = True
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _build(self, task_config):
+        def crawl(ctx, inputs):
+            self.calls.append("crawl")
+            return ["CVE-1", "CVE-2"]
+        def report(ctx, inputs):
+            self.calls.append("report")
+            if self.fail_report:
+                raise RuntimeError("report failed")
+            return f"{len(inputs['crawl'])} findings"
+        return WorkflowGraph("cached", [
+            WorkflowStep("crawl", crawl, cache=True),
+            WorkflowStep("report", report, depends_on=["crawl"], cache=True),
+        ])
+
+    def test_rerun_after_failure_skips_completed_steps(self):
+        orchestrator = WorkflowOrchestrator(config_path=self.config_path)
+        orchestrator.register_workflow("cached", self._build)
+        self.assertEqual(orchestrator.run_workflow({"task_name": "cached", "task_id": "first"})["status"], "error")
+        self.fail_report = False
+        result = orchestrator.run_workflow({"task_name": "cached", "task_id": "second"})
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(result["outputs"]["report"], "2 findings")
+        self.assertEqual(self.calls, ["crawl", "report", "report"])
+
+    def test_changed_task_inputs_miss_the_cache(self):
+        self.fail_report = False
+        orchestrator = WorkflowOrchestrator(config_path=self.config_path)
+        orchestrator.register_workflow("cached", self._build)
+        orchestrator.run_workflow({"task_name": "cached", "target": "a.com"})
+        orchestrator.run_workflow({"task_name": "cached", "target": "b.com"})
+        self.assertEqual(self.calls.count("crawl"), 2)
+
+if __name__ == "__main__":
+    unittest.main()
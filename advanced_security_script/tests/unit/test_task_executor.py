@@ -0,0 +1,121 @@
+# advanced_security_script/tests/unit/test_task_executor.py
+
+import unittest
+import asyncio
+import threading
+import time
+from advanced_security_script.core.task_executor import TaskExecutor
+from advanced_security_script.tests.unit.helpers import MockConfig
+
+class MockOrchestrator:
+    """Records concurrency and returns canned results per task name."""
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.active = 0
+        self.max_active = 0
+
+    def run_workflow(self, task_config):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(0.02)
+            if task_config["task_name"] == "explode":
+                raise ValueError("boom")
+            if task_config["task_name"] == "unknown":
+                return {"status": "error", "message": "Unknown task: unknown"}
+            return {"status": "success", "message": f"{task_config['task_name']} done"}
+        finally:
+            with self.lock:
+                self.active -= 1
+
+class TestTaskExecutor(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.orchestrator = MockOrchestrator()
+        config = MockConfig({"global": {"max_threads": 2}, "task_executor": {"queue_size": 20}})
+        self.executor = TaskExecutor(config, orchestrator_factory=lambda: self.orchestrator)
+        self.transitions = {}
+        await self.executor.start()
+
+    async def asyncTearDown(self):
+        await self.executor.shutdown()
+
+    def _record(self, task_id, status, **fields):
+        self.transitions.setdefault(task_id, []).append((status, fields))
+
+    async def test_status_transitions_and_timestamps(self):
+        self.executor.submit("t1", {"task_name": "test_setup"}, on_status=self._record)
+        await self.executor.join()
+        statuses = [status for status, _ in self.transitions["t1"]]
+        self.assertEqual(statuses, ["pending", "running", "completed"])
+        self.assertIn("started_at", self.transitions["t1"][1][1])
+        final = self.transitions["t1"][2][1]
+        self.assertIn("completed_at", final)
+        self.assertEqual(final["result_summary"], "test_setup done")
+
+    async def test_workflows_run_on_the_thread_pool_by_default(self):
+        self.assertEqual(self.executor.cpu_bound_modules, set())
+        self.executor.submit("t1", {"task_name": "full_assessment"}, on_status=self._record)
+        await self.executor.join()
+        self.assertIsNone(self.executor._process_pool)
+        self.assertEqual(self.transitions["t1"][-1][0], "completed")
+
+    async def test_failures_are_recorded(self):
+        self.executor.submit("t_err", {"task_name": "unknown"}, on_status=self._record)
+        self.executor.submit("t_exc", {"task_name": "explode"}, on_status=self._record)
+        await self.executor.join()
+        self.assertEqual(self.transitions["t_err"][-1][0], "failed")
+        self.assertEqual(self.transitions["t_exc"][-1][0], "failed")
+        self.assertIn("boom", self.transitions["t_exc"][-1][1]["result_summary"])
+
+    async def test_concurrency_is_bounded_by_max_threads(self):
+        for i in range(8):
+            self.executor.submit(f"t{i}", {"task_name": "test_setup"}, on_status=self._record)
+        await self.executor.join()
+        self.assertEqual(self.orchestrator.max_active, 2)
+        self.assertTrue(all(self.transitions[f"t{i}"][-1][0] == "completed" for i in range(8)))
+
+    async def test_submit_does_not_block_event_loop(self):
+        started = time.monotonic()
+        for i in range(5):
+            self.executor.submit(f"t{i}", {"task_name": "test_setup"})
+        self.assertLess(time.monotonic() - started, 0.02)
+        await self.executor.join()
+
+    async def test_queue_full_and_not_running(self):
+        small = TaskExecutor(MockConfig({"global": {"max_threads": 1}, "task_executor": {"queue_size": 1}}),
+                             orchestrator_factory=lambda: self.orchestrator)
+        with self.assertRaises(RuntimeError):
+            small.submit("t0", {"task_name": "test_setup"})
+        await small.start()
+        small.submit("t1", {"task_name": "test_setup"})
+        with self.assertRaises(asyncio.QueueFull):
+            small.submit("t2", {"task_name": "test_setup"})
+        await small.shutdown()
+
+    async def test_resize_changes_concurrency(self):
+        self.executor.resize(4)
+        for i in range(8):
+            self.executor.submit(f"t{i}", {"task_name": "test_setup"})
+        await self.executor.join()
+        self.assertEqual(self.orchestrator.max_active, 4)
+
+        self.executor.resize(1)
+        self.orchestrator.max_active = 0
+        for i in range(4):
+            self.executor.submit(f"u{i}", {"task_name": "test_setup"})
+        await self.executor.join()
+        self.assertEqual(self.orchestrator.max_active, 1)
+        self.assertEqual(len(self.executor._workers), 1)
+
+    async def test_resize_while_busy_lets_running_tasks_finish(self):
+        for i in range(2):
+            self.executor.submit(f"t{i}", {"task_name": "test_setup"}, on_status=self._record)
+        await asyncio.sleep(0.005) # Both workers are now running a task
+        self.executor.resize(1)
+        await self.executor.join()
+        self.assertTrue(all(self.transitions[f"t{i}"][-1][0] == "completed" for i in range(2)))
+        self.assertEqual(len(self.executor._workers), 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,300 @@
+# advanced_security_script/tests/unit/test_vulnerability_crawler.py
+
+import unittest
+import aiohttp
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from advanced_security_script.modules.intelligence.sources import VulnerabilitySource
+from advanced_security_script.modules.intelligence.vulnerability_crawler import VulnerabilityCrawler, source_key
+from advanced_security_script.modules.intelligence.vulnerability_store import VulnerabilityStore
+from advanced_security_script.tests.unit.helpers import MockConfig
+
+FEED_FIXTURE = os.path.join(os.path.dirname(__file__), "..", "fixtures", "exploitdb_rss.xml")
+
+class TestFetchFromSource(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.responses = [] # (status, headers) served before the final 200, in order
+        self.requests = 0
+
+        async def handler(request):
+            self.requests += 1
+            if self.responses:
+                status, headers = self.responses.pop(0)
+                return web.Response(status=status, headers=headers)
+            return web.json_response({"totalResults": 0})
+
+        self.feed_requests = []
+
+        async def feed(request):
+            self.feed_requests.append(dict(request.headers))
+            if request.headers.get("If-None-Match") == '"v1"':
+                return web.Response(status=304, headers={"ETag": '"v1"'})
+            return web.Response(body=b"<rss><channel/></rss>", content_type="application/rss+xml", headers={"ETag": '"v1"'})
+
+        async def nvd(request):
+            start, per_page = int(request.query["startIndex"]), int(request.query["resultsPerPage"])
+            items = [{"cve": {"CVE_data_meta": {"ID": f"CVE-2025-{i:04d}"}}} for i in range(start, min(start + per_page, 25))]
+            return web.json_response({"totalResults": 25, "startIndex": start, "result": {"CVE_Items": items}})
+
+        self.broken_requests = 0
+
+        async def nvd_broken(request):
+            # Sends the first half of a page, then drops the connection
+            self.broken_requests += 1
+            items = [{"cve": {"CVE_data_meta": {"ID": f"CVE-2025-{i:04d}"}}} for i in range(25)]
+            body = json.dumps({"totalResults": 25, "startIndex": 0, "result": {"CVE_Items": items}}).encode()
+            response = web.StreamResponse(headers={"Content-Type": "application/json"})
+            response.content_length = len(body)
+            await response.prepare(request)
+            await response.write(body[:len(body) // 2])
+            request.transport.close()
+            return response
+
+        app = web.Application()
+        app.router.add_get("/cves", handler)
+        app.router.add_get("/nvd", nvd)
+        app.router.add_get("/nvd_broken", nvd_broken)
+        app.router.add_get("/rss.xml", feed)
+        self.server = TestServer(app)
+        await self.server.start_server()
+        self.url = str(self.server.make_url("/cves"))
+        self.session = aiohttp.ClientSession()
+        self.cache_dir = tempfile.mkdtemp()
+        self.crawler = VulnerabilityCrawler(MockConfig({"vulnerability_crawler": {
+            "max_retries": 2, "retry_backoff_base": 0.01, "http_cache_dir": self.cache_dir,
+            "rate_limits": {"nvd": {"requests_per_second": None}},
+        }}), None)
+
+    async def asyncTearDown(self):
+        await self.session.close()
+        await self.server.close()
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def test_source_key(self):
+        self.assertEqual(source_key("Exploit-DB RSS"), "exploit_db_rss")
+        self.assertEqual(source_key("NVD"), "nvd")
+
+    async def test_throttling_response_is_retried(self):
+        self.responses = [(403, {"Retry-After": "0"}), (503, {})]
+        result = await self.crawler.fetch_from_source(self.session, "NVD", self.url)
+        self.assertEqual(result, {"totalResults": 0})
+        self.assertEqual(self.requests, 3)
+        self.assertLess(self.crawler._throttle("NVD").concurrency.limit, 4) # 403 counts as throttling for NVD
+
+    async def test_crawlers_share_the_budget_of_a_source(self):
+        # Workflows build a crawler per crawl step; they must not each start with a full burst
+        config = MockConfig({"vulnerability_crawler": {"rate_limits": {"nvd": {"requests_per_second": 1, "burst": 1}}}})
+        first, second = VulnerabilityCrawler(config, None), VulnerabilityCrawler(config, None)
+        self.assertIs(first._throttle("NVD"), second._throttle("nvd"))
+        self.assertEqual(first._throttle("NVD").bucket.reserve(), 0)
+        self.assertGreater(second._throttle("NVD").bucket.reserve(), 0.5)
+
+    async def test_gives_up_after_max_retries(self):
+        self.responses = [(429, {})] * 5
+        self.assertIsNone(await self.crawler.fetch_from_source(self.session, "NVD", self.url))
+        self.assertEqual(self.requests, 3)
+
+    async def test_client_errors_are_not_retried(self):
+        self.responses = [(404, {})]
+        self.assertIsNone(await self.crawler.fetch_from_source(self.session, "Exploit-DB RSS", self.url))
+        self.assertEqual(self.requests, 1)
+
+    async def test_unchanged_feed_is_served_from_cache(self):
+        url = str(self.server.make_url("/rss.xml"))
+        first = await self.crawler.fetch_from_source(self.session, "Exploit-DB RSS", url)
+        second = await self.crawler.fetch_from_source(self.session, "Exploit-DB RSS", url)
+        self.assertEqual(first, "<rss><channel/></rss>")
+        self.assertEqual(second, first)
+        self.assertNotIn("If-None-Match", self.feed_requests[0])
+        self.assertEqual(self.feed_requests[1]["If-None-Match"], '"v1"') # Answered with an empty 304
+
+    async def test_responses_without_validators_are_not_cached(self):
+        await self.crawler.fetch_from_source(self.session, "NVD", self.url)
+        self.assertEqual(len(self.crawler.http_cache), 0)
+
+    async def test_sync_nvd_streams_pages(self):
+        crawler = VulnerabilityCrawler(MockConfig({"vulnerability_crawler": {
+            "nvd_api_url": str(self.server.make_url("/nvd")), "nvd_results_per_page": 10, "nvd_stream_batch_size": 4,
+            "nvd_sync_state_path": f"{self.cache_dir}/nvd_state.json", "http_cache_dir": self.cache_dir,
+            "rate_limits": {"nvd": {"requests_per_second": None}},
+        }}), None)
+        batches = []
+        summary = await crawler.sync_nvd(on_records=batches.append)
+        self.assertTrue(summary["complete"])
+        self.assertEqual(summary["items"], 25)
+        self.assertLessEqual(max(len(batch) for batch in batches), 4)
+        self.assertEqual(sorted(record["id"] for batch in batches for record in batch), [f"CVE-2025-{i:04d}" for i in range(25)])
+
+    async def test_broken_stream_is_not_retried_after_delivering_items(self):
+        crawler = VulnerabilityCrawler(MockConfig({"vulnerability_crawler": {
+            "nvd_api_url": str(self.server.make_url("/nvd_broken")), "nvd_stream_batch_size": 4,
+            "nvd_sync_state_path": f"{self.cache_dir}/nvd_state.json", "http_cache_dir": self.cache_dir,
+            "max_retries": 2, "retry_backoff_base": 0.01, "rate_limits": {"nvd": {"requests_per_second": None}},
+        }}), None)
+        batches = []
+        summary = await crawler.sync_nvd(on_records=batches.append)
+        ids = [record["id"] for batch in batches for record in batch]
+        self.assertFalse(summary["complete"])
+        self.assertEqual(self.broken_requests, 1)
+        self.assertGreater(len(ids), 0)
+        self.assertEqual(len(ids), len(set(ids)))
+
+class StaticSource(VulnerabilitySource):
+    """Serves fixed records after a delay, or fails, without any HTTP."""
+    def __init__(self, key, records, delay=0.0, error=None):
+        super().__init__(f"static://{key}")
+        self.key = self.name = key
+        self.records, self.delay, self.error = records, delay, error
+
+    async def fetch(self, crawler, session, keywords, max_results):
+        await asyncio.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return self.records
+
+    async def parse(self, data):
+        return list(data)
+
+class RecordingStore:
+    def __init__(self):
+        self.batches = []
+        self.deleted = []
+    def upsert_many(self, records):
+        self.batches.append([record["id"] for record in records])
+    def delete_many(self, vuln_ids):
+        self.deleted.extend(vuln_ids)
+    def get_many(self, vuln_ids):
+        return []
+
+class TestCrawlVulnerabilities(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        with open(FEED_FIXTURE, "rb") as f:
+            feed_body = f.read()
+
+        async def nvd(request):
+            items = [{"cve": {"CVE_data_meta": {"ID": "CVE-2025-0001"},
+                              "description": {"description_data": [{"value": "SQL injection in Acme Portal"}]}},
+                      "impact": {"baseMetricV3": {"cvssV3": {"baseScore": 9.8, "baseSeverity": "CRITICAL"}}}}]
+            return web.json_response({"totalResults": 1, "result": {"CVE_Items": items}})
+
+        async def feed(request):
+            return web.Response(body=feed_body, content_type="application/rss+xml")
+
+        app = web.Application()
+        app.router.add_get("/nvd", nvd)
+        app.router.add_get("/rss.xml", feed)
+        self.server = TestServer(app)
+        await self.server.start_server()
+        self.store = RecordingStore()
+        self.crawler = VulnerabilityCrawler(MockConfig({"vulnerability_crawler": {
+            "nvd_api_url": str(self.server.make_url("/nvd")), "exploit_db_rss": str(self.server.make_url("/rss.xml")),
+            "http_cache_enabled": False, "rate_limits": {"nvd": {"requests_per_second": None}},
+        }}), None, store=self.store)
+
+    async def asyncTearDown(self):
+        await self.server.close()
+
+    async def test_records_are_attributed_to_their_source(self):
+        records = await self.crawler.crawl_vulnerabilities(max_results_per_source=3)
+        by_source = {}
+        for record in records:
+            by_source.setdefault(record["source"], []).extend([record["id"]] + record["aliases"])
+        self.assertEqual(by_source["NVD"], ["CVE-2025-0001"])
+        # Exploits naming a CVE are keyed on it, with their EDB-ID as an alias
+        self.assertEqual(sorted(by_source["Exploit-DB"]), ["CVE-2024-0042", "CVE-2024-31337", "EDB-ID:52101", "EDB-ID:52102", "EDB-ID:52103"])
+        self.assertEqual(sorted(len(batch) for batch in self.store.batches), [1, 3])
+
+    async def test_keywords_filter_every_source(self):
+        records = await self.crawler.crawl_vulnerabilities(keywords=["acme"])
+        self.assertEqual(sorted(record["id"] for record in records), ["CVE-2024-31337", "CVE-2025-0001"])
+        self.assertEqual(self.crawler.merger.get("CVE-2024-31337")["aliases"], ["EDB-ID:52101"])
+
+    async def test_registered_source_is_crawled(self):
+        self.crawler.register_source(StaticSource("custom", [{"id": "X-1", "source": "custom", "title": "t", "description": ""}]))
+        records = await self.crawler.crawl_vulnerabilities()
+        self.assertIn("X-1", [record["id"] for record in records])
+
+    async def test_slow_or_failing_sources_do_not_hold_up_others(self):
+        self.crawler.sources = {}
+        self.crawler.register_source(StaticSource("slow", [{"id": "S-1", "title": "", "description": ""}], delay=0.2))
+        self.crawler.register_source(StaticSource("broken", [], error=RuntimeError("boom")))
+        self.crawler.register_source(StaticSource("fast", [{"id": "F-1", "title": "", "description": ""}]))
+        records = await self.crawler.crawl_vulnerabilities()
+        self.assertEqual([record["id"] for record in records], ["F-1", "S-1"]) # In completion order
+        self.assertEqual(self.store.batches, [["F-1"], ["S-1"]])
+
+    async def test_sources_reporting_one_vulnerability_are_merged(self):
+        self.crawler.sources = {}
+        nvd = StaticSource("nvd", [{"id": "CVE-2024-9999", "source": "NVD", "title": "CVE-2024-9999", "description": "Overflow",
+                                    "cvss_score": 9.1, "references": ["https://www.exploit-db.com/exploits/52103"]}], delay=0.1)
+        edb = StaticSource("edb", [{"id": "EDB-ID:52103", "source": "Exploit-DB", "title": "ExampleOS 12 - Privilege Escalation",
+                                    "description": "PoC", "references": ["https://www.exploit-db.com/exploits/52103"], "cve_ids": []}])
+        self.crawler.register_source(nvd)
+        self.crawler.register_source(edb)
+        records = await self.crawler.crawl_vulnerabilities()
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0]["id"], "CVE-2024-9999")
+        self.assertEqual(records[0]["sources"], ["NVD", "Exploit-DB"])
+        self.assertEqual(records[0]["provenance"]["title"], "Exploit-DB")
+        # The exploit was stored on its own first, then replaced by the merged record
+        self.assertEqual(self.store.batches, [["EDB-ID:52103"], ["CVE-2024-9999"]])
+        self.assertEqual(self.store.deleted, ["EDB-ID:52103"])
+        # Nothing changed on the next crawl, so nothing is written
+        self.assertEqual(len(await self.crawler.crawl_vulnerabilities()), 1)
+        self.assertEqual(len(self.store.batches), 2)
+
+    async def test_later_crawls_build_on_the_stored_record(self):
+        # Each workflow run crawls with a new crawler; the store carries the merged record between them
+        store = VulnerabilityStore(":memory:")
+        config = MockConfig({"vulnerability_crawler": {"http_cache_enabled": False}})
+        first = VulnerabilityCrawler(config, None, store=store)
+        first.sources = {}
+        first.register_source(StaticSource("nvd", [{"id": "CVE-2024-9999", "source": "NVD", "title": "CVE-2024-9999", "description": "Overflow",
+                                                    "severity": "CRITICAL", "cvss_score": 9.1, "published_date": "2024-05-01T10:00Z"}]))
+        await first.crawl_vulnerabilities()
+        second = VulnerabilityCrawler(config, None, store=store)
+        second.sources = {}
+        second.register_source(StaticSource("edb", [{"id": "EDB-ID:52103", "source": "Exploit-DB", "title": "ExampleOS 12 - Overflow",
+                                                     "description": "PoC", "cve_ids": ["CVE-2024-9999"]}]))
+        records = await second.crawl_vulnerabilities()
+        self.assertEqual(records[0]["sources"], ["NVD", "Exploit-DB"])
+        stored = store.get("CVE-2024-9999")
+        self.assertEqual((stored["source"], stored["description"], stored["title"]), ("NVD", "Overflow", "ExampleOS 12 - Overflow"))
+        self.assertEqual((stored["severity"], stored["cvss_score"]), ("CRITICAL", 9.1))
+        self.assertEqual(stored["published_date"], "2024-05-01T10:00:00+00:00")
+        self.assertEqual(store.count(), 1)
+        store.close()
+
+    async def test_fresh_record_of_a_source_keeps_what_other_sources_stored(self):
+        store = VulnerabilityStore(":memory:")
+        config = MockConfig({"vulnerability_crawler": {"http_cache_enabled": False}})
+        nvd_ref, edb_link = "https://example.com/advisory", "https://www.exploit-db.com/exploits/52103"
+        first = VulnerabilityCrawler(config, None, store=store)
+        first.sources = {}
+        first.register_source(StaticSource("nvd", [{"id": "CVE-2024-0001", "source": "NVD", "title": "CVE-2024-0001",
+                                                    "description": "Overflow", "references": [nvd_ref]}]))
+        first.register_source(StaticSource("edb", [{"id": "EDB-ID:52103", "source": "Exploit-DB", "title": "Widget - Overflow",
+                                                    "description": "PoC", "references": [edb_link], "cve_ids": ["CVE-2024-0001"]}]))
+        await first.crawl_vulnerabilities()
+        self.assertEqual(store.get("CVE-2024-0001")["references"], [nvd_ref, edb_link])
+        # A later crawl only sees the updated NVD record
+        second = VulnerabilityCrawler(config, None, store=store)
+        second.sources = {}
+        second.register_source(StaticSource("nvd", [{"id": "CVE-2024-0001", "source": "NVD", "title": "CVE-2024-0001",
+                                                     "description": "Heap overflow", "references": [nvd_ref]}]))
+        merged, = await second.crawl_vulnerabilities()
+        self.assertEqual(merged["sources"], ["NVD", "Exploit-DB"])
+        self.assertEqual(merged["aliases"], ["EDB-ID:52103"])
+        stored = store.get("CVE-2024-0001")
+        self.assertEqual((stored["description"], stored["title"]), ("Heap overflow", "Widget - Overflow"))
+        self.assertEqual(stored["references"], [nvd_ref, edb_link])
+        self.assertEqual(stored["provenance"]["title"], "Exploit-DB")
+        store.close()
+
+if __name__ == "__main__":
+    unittest.main()
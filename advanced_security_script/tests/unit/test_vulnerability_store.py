@@ -0,0 +1,212 @@
+# advanced_security_script/tests/unit/test_vulnerability_store.py
+
+import unittest
+import os
+import shutil
+import sqlite3
+import tempfile
+from advanced_security_script.modules.intelligence.vulnerability_store import (
+    SCHEMA, VulnerabilityStore, build_match_query, normalize_timestamp, shared_store,
+)
+
+def make_record(vuln_id, source="NVD", severity="HIGH", cvss_score=7.5, published="2025-01-01T00:00Z"):
+    return {
+        "id": vuln_id,
+        "source": source,
+        "description": f"Description of {vuln_id}",
+        "severity": severity,
+        "cvss_score": cvss_score,
+        "published_date": published,
+        "references": [f"https://nvd.nist.gov/vuln/detail/{vuln_id}"],
+    }
+
+class TestVulnerabilityStore(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.store = VulnerabilityStore(os.path.join(self.temp_dir, "vulns.db"))
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_update_keeps_values_the_record_lacks(self):
+        self.store.upsert_many([dict(make_record("CVE-2025-0001"), title="Portal SQL injection", link="https://nvd.example/1")])
+        self.store.upsert_many([{"id": "CVE-2025-0001", "source": "Exploit-DB", "description": "PoC", "references": []}])
+        record = self.store.get("CVE-2025-0001")
+        self.assertEqual((record["source"], record["description"]), ("Exploit-DB", "PoC"))
+        self.assertEqual((record["severity"], record["cvss_score"], record["title"]), ("HIGH", 7.5, "Portal SQL injection"))
+        self.assertEqual(record["published_date"], "2025-01-01T00:00:00+00:00")
+        self.assertEqual(record["link"], "https://nvd.example/1")
+        self.assertEqual(record["references"], ["https://nvd.nist.gov/vuln/detail/CVE-2025-0001"])
+        self.store.upsert_many([{"id": "CVE-2025-0001", "source": "NVD", "last_modified_date": "2025-02-01T00:00Z"}])
+        record = self.store.get("CVE-2025-0001")
+        self.assertEqual(record["published_date"], "2025-01-01T00:00:00+00:00")
+        self.assertEqual(record["last_modified_date"], "2025-02-01T00:00:00+00:00")
+
+    def test_merge_keys_are_stored(self):
+        merged = dict(make_record("CVE-2025-0001"), sources=["NVD", "Exploit-DB"], aliases=["EDB-ID:52101"],
+                      provenance={"title": "Exploit-DB"})
+        self.store.upsert_many([merged])
+        self.store.upsert_many([make_record("CVE-2025-0001")]) # A record without them keeps them
+        record = self.store.get("CVE-2025-0001")
+        self.assertEqual((record["sources"], record["aliases"]), (["NVD", "Exploit-DB"], ["EDB-ID:52101"]))
+        self.assertEqual(record["provenance"], {"title": "Exploit-DB"})
+
+    def test_databases_without_merge_column_are_migrated(self):
+        path = os.path.join(self.temp_dir, "old.db")
+        conn = sqlite3.connect(path)
+        conn.execute("CREATE TABLE vulnerabilities (id TEXT PRIMARY KEY, source TEXT NOT NULL, title TEXT, description TEXT, "
+                     "severity TEXT, cvss_score REAL, published_date TEXT, last_modified_date TEXT, link TEXT, references_json TEXT)")
+        conn.close()
+        store = VulnerabilityStore(path)
+        store.upsert_many([dict(make_record("CVE-2025-0001"), sources=["NVD"])])
+        self.assertEqual(store.get("CVE-2025-0001")["sources"], ["NVD"])
+        store.close()
+
+    def test_get_many(self):
+        self.store.upsert_many([make_record(f"CVE-2025-{i:04d}") for i in range(3)])
+        records = self.store.get_many(["CVE-2025-0002", "CVE-2025-0000", "CVE-2025-9999"])
+        self.assertEqual(sorted(record["id"] for record in records), ["CVE-2025-0000", "CVE-2025-0002"])
+
+    def test_shared_store_is_opened_once_per_file(self):
+        path = os.path.join(self.temp_dir, "shared.db")
+        store = shared_store(path)
+        self.assertIs(shared_store(os.path.relpath(path)), store)
+        store.close()
+        reopened = shared_store(path)
+        self.assertIsNot(reopened, store)
+        reopened.close()
+
+    def test_upsert_and_get(self):
+        self.assertEqual(self.store.upsert_many([make_record("CVE-2025-0001")]), 1)
+        record = self.store.get("CVE-2025-0001")
+        self.assertEqual(record["source"], "NVD")
+        self.assertEqual(record["title"], "CVE-2025-0001") # Falls back to the ID
+        self.assertEqual(record["published_date"], "2025-01-01T00:00:00+00:00")
+        self.assertEqual(record["last_modified_date"], record["published_date"])
+        self.assertEqual(record["references"], ["https://nvd.nist.gov/vuln/detail/CVE-2025-0001"])
+        self.assertIsNone(self.store.get("CVE-0000-0000"))
+
+    def test_delete_many(self):
+        self.store.upsert_many([make_record("CVE-2025-0001"), make_record("EDB-ID:1", source="Exploit-DB")])
+        self.assertEqual(self.store.delete_many(["EDB-ID:1", "EDB-ID:2"]), 1)
+        self.assertEqual(self.store.delete_many([]), 0)
+        self.assertIsNone(self.store.get("EDB-ID:1"))
+        self.assertEqual(self.store.count(), 1)
+
+    def test_upsert_updates_existing_record(self):
+        self.store.upsert_many([make_record("CVE-2025-0001", severity="medium", cvss_score=5.0)])
+        self.store.upsert_many([make_record("CVE-2025-0001", severity="critical", cvss_score=9.8)])
+        self.assertEqual(self.store.count(), 1)
+        record = self.store.get("CVE-2025-0001")
+        self.assertEqual(record["severity"], "CRITICAL")
+        self.assertEqual(record["cvss_score"], 9.8)
+
+    def test_query_filters_and_orders_newest_first(self):
+        self.store.upsert_many([
+            make_record("CVE-2025-0001", published="2025-01-01T00:00Z"),
+            make_record("CVE-2025-0002", severity="CRITICAL", cvss_score=9.8, published="2025-01-03T00:00Z"),
+            make_record("EDB-ID-1", source="Exploit-DB", published="2025-01-02T00:00Z"),
+        ])
+        self.assertEqual([r["id"] for r in self.store.query(limit=10)], ["CVE-2025-0002", "EDB-ID-1", "CVE-2025-0001"])
+        self.assertEqual([r["id"] for r in self.store.query(source="nvd")], ["CVE-2025-0002", "CVE-2025-0001"])
+        self.assertEqual([r["id"] for r in self.store.query(severity="critical")], ["CVE-2025-0002"])
+        self.assertEqual([r["id"] for r in self.store.query(min_cvss_score=9.0)], ["CVE-2025-0002"])
+        self.assertEqual(len(self.store.query(limit=1)), 1)
+
+    def test_filtered_queries_use_indexes(self):
+        for column, value in (("source", "NVD"), ("severity", "HIGH")):
+            plan = self.store._conn.execute(
+                f"EXPLAIN QUERY PLAN SELECT * FROM vulnerabilities WHERE {column} = ? AND (published_date, id) < (?, ?) "
+                "ORDER BY published_date DESC, id DESC LIMIT 10", (value, "2025-01-02", "CVE-2025-0001")
+            ).fetchall()
+            details = " ".join(row[-1] for row in plan)
+            self.assertIn(f"idx_vulnerabilities_{column}", details)
+            self.assertNotIn("TEMP B-TREE", details)
+
+    def test_keyset_pagination_visits_every_record_once(self):
+        # Several records share a publication date, so the id tie-breaker matters.
+        self.store.upsert_many([make_record(f"CVE-2025-{i:04d}", published=f"2025-01-{1 + i // 4:02d}T00:00Z") for i in range(30)])
+        for descending in (True, False):
+            seen, after = [], None
+            while True:
+                page = self.store.query(limit=7, descending=descending, after=after)
+                if not page:
+                    break
+                seen.extend(r["id"] for r in page)
+                after = (page[-1]["published_date"], page[-1]["id"])
+            self.assertEqual(len(seen), 30)
+            self.assertEqual(len(set(seen)), 30)
+        with self.assertRaises(ValueError):
+            self.store.query(sort="description")
+
+    def add_search_corpus(self):
+        records = [make_record(f"CVE-2025-{i:04d}", published=f"2025-01-{1 + i % 28:02d}T00:00Z") for i in range(40)]
+        records[3]["description"] = "Apache Log4j JNDI lookups allow remote code execution."
+        records[3]["title"] = "Log4j Log4Shell"
+        records[7]["description"] = "Remote code execution in Apache Struts and a log4j appender."
+        records[9].update(description="Denial of service in Apache HTTP Server.", source="Exploit-DB", severity="LOW")
+        self.store.upsert_many(records)
+
+    def test_search_ranks_and_highlights(self):
+        self.add_search_corpus()
+        results = self.store.search("log4j")
+        self.assertEqual([r["id"] for r in results], ["CVE-2025-0003", "CVE-2025-0007"]) # Title match ranks first
+        self.assertLess(results[0]["score"], results[1]["score"])
+        self.assertIn("<mark>", results[1]["snippet"])
+        self.assertEqual([r["id"] for r in self.store.search("apache remote")], ["CVE-2025-0003", "CVE-2025-0007"])
+        self.assertEqual([r["id"] for r in self.store.search("APACH*", source="exploit-db")], ["CVE-2025-0009"])
+        self.assertEqual([r["id"] for r in self.store.search("CVE-2025-0009")], ["CVE-2025-0009"])
+        self.assertEqual(self.store.search("apache", sort="published_date", limit=1)[0]["id"], "CVE-2025-0009")
+        self.assertEqual(self.store.search('" *'), [])
+        with self.assertRaises(ValueError):
+            self.store.search("apache", sort="cvss_score")
+
+    def test_search_index_follows_updates_and_deletes(self):
+        self.add_search_corpus()
+        self.store.upsert_many([dict(make_record("CVE-2025-0003"), title="Resolver overflow", description="Nginx resolver overflow.")])
+        self.assertEqual([r["id"] for r in self.store.search("nginx")], ["CVE-2025-0003"])
+        self.assertEqual([r["id"] for r in self.store.search("log4j")], ["CVE-2025-0007"])
+        self.store.delete_many(["CVE-2025-0003"])
+        self.assertEqual(self.store.search("nginx"), [])
+        self.store.rebuild_search_index()
+        self.assertEqual([r["id"] for r in self.store.search("log4j")], ["CVE-2025-0007"])
+
+    def test_search_keyset_pagination(self):
+        self.add_search_corpus()
+        for sort, key in (("relevance", "score"), ("published_date", "published_date")):
+            seen, after = [], None
+            while True:
+                page = self.store.search("description", sort=sort, limit=6, after=after)
+                if not page:
+                    break
+                seen.extend(r["id"] for r in page)
+                after = (page[-1][key], page[-1]["id"])
+            self.assertEqual(len(seen), 37) # Every record except the three rewritten above
+            self.assertEqual(len(set(seen)), 37)
+
+    def test_existing_database_is_indexed_on_open(self):
+        path = os.path.join(self.temp_dir, "old.db")
+        conn = sqlite3.connect(path)
+        conn.executescript(SCHEMA)
+        conn.execute("INSERT INTO vulnerabilities (id, source, title, description) VALUES ('CVE-2020-0001', 'NVD', 'x', 'Samba flaw')")
+        conn.commit()
+        conn.close()
+        store = VulnerabilityStore(path)
+        try:
+            self.assertEqual([r["id"] for r in store.search("samba")], ["CVE-2020-0001"])
+        finally:
+            store.close()
+
+    def test_build_match_query(self):
+        self.assertEqual(build_match_query('apache log4j* "quoted'), '"apache" "log4j"* """quoted"')
+        self.assertIsNone(build_match_query(" * - "))
+
+    def test_normalize_timestamp(self):
+        self.assertEqual(normalize_timestamp("2021-08-04T13:15Z"), "2021-08-04T13:15:00+00:00")
+        self.assertEqual(normalize_timestamp("2021-08-04T15:15:00+02:00"), "2021-08-04T13:15:00+00:00")
+        self.assertIsNone(normalize_timestamp("not a date"))
+        self.assertIsNone(normalize_timestamp(None))
+
+if __name__ == "__main__":
+    unittest.main()
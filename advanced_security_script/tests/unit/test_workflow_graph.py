@@ -0,0 +1,112 @@
+# advanced_security_script/tests/unit/test_workflow_graph.py
+
+import unittest
+import asyncio
+import time
+from advanced_security_script.core.workflow_graph import (
+    WorkflowGraph, WorkflowStep, WorkflowDefinitionError, WorkflowExecutionError
+)
+
+def constant(value):
+    def step(context, inputs):
+        return value
+    return step
+
+class TestWorkflowGraphDefinition(unittest.TestCase):
+    def test_topological_order_respects_dependencies(self):
+        graph = WorkflowGraph("wf", [
+            WorkflowStep("report", constant(None), depends_on=["enrich", "assets"]),
+            WorkflowStep("crawl", constant(None)),
+            WorkflowStep("enrich", constant(None), depends_on=["crawl"]),
+            WorkflowStep("assets", constant(None)),
+        ])
+        order = graph.order
+        self.assertLess(order.index("crawl"), order.index("enrich"))
+        self.assertLess(order.index("enrich"), order.index("report"))
+        self.assertLess(order.index("assets"), order.index("report"))
+
+    def test_invalid_graphs_are_rejected(self):
+        with self.assertRaises(WorkflowDefinitionError):
+            WorkflowGraph("dup", [WorkflowStep("a", constant(1)), WorkflowStep("a", constant(2))])
+        with self.assertRaises(WorkflowDefinitionError):
+            WorkflowGraph("unknown", [WorkflowStep("a", constant(1), depends_on=["missing"])])
+        with self.assertRaises(WorkflowDefinitionError):
+            WorkflowGraph("cycle", [WorkflowStep("a", constant(1), depends_on=["b"]), WorkflowStep("b", constant(2), depends_on=["a"])])
+        with self.assertRaises(WorkflowDefinitionError):
+            WorkflowStep("a", constant(1), depends_on=["b"], map_over="c")
+
+class TestWorkflowGraphExecution(unittest.TestCase):
+    def test_outputs_flow_between_steps(self):
+        graph = WorkflowGraph("wf", [
+            WorkflowStep("crawl", lambda ctx, inputs: [1, 2, 3]),
+            WorkflowStep("enrich", lambda ctx, inputs: [x * ctx["factor"] for x in inputs["crawl"]], depends_on=["crawl"]),
+            WorkflowStep("report", lambda ctx, inputs: sum(inputs["enrich"]), depends_on=["enrich"]),
+        ])
+        outputs = asyncio.run(graph.run({"factor": 10}))
+        self.assertEqual(outputs["report"], 60)
+
+    def test_independent_branches_run_concurrently(self):
+        async def slow(ctx, inputs):
+            await asyncio.sleep(0.1)
+            return "done"
+        graph = WorkflowGraph("wf", [WorkflowStep(f"branch_{i}", slow) for i in range(5)]
+                              + [WorkflowStep("join", lambda ctx, inputs: len(inputs), depends_on=[f"branch_{i}" for i in range(5)])])
+        started = time.monotonic()
+        outputs = asyncio.run(graph.run({}))
+        self.assertLess(time.monotonic() - started, 0.3)
+        self.assertEqual(outputs["join"], 5)
+
+    def test_sync_steps_run_off_the_event_loop(self):
+        def blocking(ctx, inputs):
+            time.sleep(0.1)
+            return True
+        graph = WorkflowGraph("wf", [WorkflowStep("a", blocking), WorkflowStep("b", blocking)])
+        started = time.monotonic()
+        asyncio.run(graph.run({}))
+        self.assertLess(time.monotonic() - started, 0.19)
+
+    def test_map_over_fans_out_per_item(self):
+        async def check(ctx, inputs, asset):
+            await asyncio.sleep(0.05)
+            return asset.upper()
+        graph = WorkflowGraph("wf", [
+            WorkflowStep("discover", lambda ctx, inputs: ["a.com", "b.com", "c.com"]),
+            WorkflowStep("check", check, depends_on=["discover"], map_over="discover"),
+        ])
+        started = time.monotonic()
+        outputs = asyncio.run(graph.run({}))
+        self.assertEqual(outputs["check"], ["A.COM", "B.COM", "C.COM"])
+        self.assertLess(time.monotonic() - started, 0.14)
+
+    def test_failure_skips_dependents_but_not_independent_branches(self):
+        def fail(ctx, inputs):
+            raise RuntimeError("crawl failed")
+        graph = WorkflowGraph("wf", [
+            WorkflowStep("crawl", fail),
+            WorkflowStep("enrich", constant("enriched"), depends_on=["crawl"]),
+            WorkflowStep("report", constant("report"), depends_on=["enrich"]),
+            WorkflowStep("assets", constant(["a.com"])),
+        ])
+        with self.assertRaises(WorkflowExecutionError) as ctx:
+            asyncio.run(graph.run({}))
+        self.assertEqual(list(ctx.exception.failed_steps), ["crawl"])
+        self.assertEqual(sorted(ctx.exception.skipped_steps), ["enrich", "report"])
+        self.assertEqual(ctx.exception.outputs, {"assets": ["a.com"]})
+
+    def test_completed_steps_are_not_rerun(self):
+        calls = []
+        def record(name):
+            def step(ctx, inputs):
+                calls.append(name)
+                return name
+            return step
+        graph = WorkflowGraph("wf", [
+            WorkflowStep("a", record("a")),
+            WorkflowStep("b", record("b"), depends_on=["a"]),
+        ])
+        outputs = asyncio.run(graph.run({}, completed={"a": "restored"}))
+        self.assertEqual(calls, ["b"])
+        self.assertEqual(outputs["a"], "restored")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,11 @@
 # advanced_security_script/tests/unit/test_workflow_orchestrator.py
 
 import unittest
+import asyncio
 import os
 import yaml
 from advanced_security_script.core.workflow_orchestrator import WorkflowOrchestrator
+from advanced_security_script.core.workflow_graph import WorkflowGraph, WorkflowStep
 # We will mock other managers and modules for this unit test
 
 # Helper to create a temporary config file
@@ -84,6 +86,92 @@ class TestWorkflowOrchestrator(unittest.TestCase):
         self.assertEqual(result["status"], "pending_integration")
         self.assertTrue("VulnerabilityCrawler test pending full integration" in result["message"])
 
+    def test_registered_graph_workflow(self):
+        orchestrator = WorkflowOrchestrator(config_path=self.default_config_path)
+        orchestrator.register_workflow("graph_test", lambda task_config: WorkflowGraph("graph_test", [
+            WorkflowStep("collect", lambda ctx, inputs: ctx["targets"]),
+            WorkflowStep("check", lambda ctx, inputs, target: f"checked {target}", depends_on=["collect"], map_over="collect"),
+        ]))
+        result = orchestrator.run_workflow({"task_name": "graph_test", "targets": ["a.com", "b.com"]})
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(result["outputs"]["check"], ["checked a.com", "checked b.com"])
+
+    def test_graph_workflow_step_failure(self):
+        def fail(ctx, inputs):
+            raise RuntimeError("module crashed")
+        orchestrator = WorkflowOrchestrator(config_path=self.default_config_path)
+        orchestrator.register_workflow("failing", lambda task_config: WorkflowGraph("failing", [
+            WorkflowStep("a", fail), WorkflowStep("b", lambda ctx, inputs: None, depends_on=["a"]),
+        ]))
+        result = orchestrator.run_workflow({"task_name": "failing"})
+        self.assertEqual(result["status"], "error")
+        self.assertEqual(result["failed_steps"], ["a"])
+        self.assertEqual(result["skipped_steps"], ["b"])
+
+    def test_task_config_overrides(self):
+        orchestrator = WorkflowOrchestrator(config_path=self.default_config_path)
+        read_timeout = lambda ctx, inputs: orchestrator.config_for_task(ctx).get("workflow_settings", "default_timeout")
+        orchestrator.register_workflow("override_test", lambda task_config: WorkflowGraph("override_test", [
+            WorkflowStep("timeout", read_timeout),
+        ]))
+        result = orchestrator.run_workflow({"task_name": "override_test", "config_overrides": {"workflow_settings.default_timeout": 5}})
+        self.assertEqual(result["outputs"]["timeout"], 5)
+        result = orchestrator.run_workflow({"task_name": "override_test"})
+        self.assertEqual(result["outputs"]["timeout"], 60) # The shared configuration is untouched
+
+    def test_workflows_share_one_event_loop(self):
+        orchestrator = WorkflowOrchestrator(config_path=self.default_config_path)
+        async def current_loop(ctx, inputs):
+            return id(asyncio.get_running_loop())
+        orchestrator.register_workflow("loop_test", lambda task_config: WorkflowGraph("loop_test", [WorkflowStep("loop", current_loop)]))
+        first = orchestrator.run_workflow({"task_name": "loop_test"})["outputs"]["loop"]
+        second = orchestrator.run_workflow({"task_name": "loop_test"})["outputs"]["loop"]
+        self.assertEqual(first, second) # Loop-bound resources such as the HTTP session are reused
+        thread = orchestrator._loop_thread
+        orchestrator.close()
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(orchestrator.run_workflow({"task_name": "loop_test"})["status"], "success") # A new loop is started
+        orchestrator.close()
+
+    def test_close_detaches_logger_manager(self):
+        orchestrator = WorkflowOrchestrator(config_path=self.default_config_path)
+        self.assertEqual(len(orchestrator.config_manager._subscribers), 1)
+        orchestrator.close()
+        self.assertEqual(orchestrator.config_manager._subscribers, [])
+
+    def test_crawled_records_go_to_the_shared_store(self):
+        from advanced_security_script.modules.intelligence.vulnerability_store import shared_store
+        orchestrator = WorkflowOrchestrator(config_path=self.default_config_path)
+        db_path = os.path.join(self.test_configs_dir, "vulnerabilities.db")
+        store = orchestrator.vulnerability_store(orchestrator.config_manager.with_overrides({"vulnerability_store.db_path": db_path}))
+        self.assertIs(store, shared_store(db_path))
+        store.close()
+        os.remove(db_path)
+        orchestrator.close()
+
+    def test_check_asset_probes_ports_and_closes_connections(self):
+        orchestrator = WorkflowOrchestrator(config_path=self.default_config_path)
+        async def probe():
+            accepted = []
+            server = await asyncio.start_server(lambda reader, writer: accepted.append((reader, writer)), "127.0.0.1", 0)
+            open_port = server.sockets[0].getsockname()[1]
+            closed_server = await asyncio.start_server(lambda reader, writer: None, "127.0.0.1", 0)
+            closed_port = closed_server.sockets[0].getsockname()[1]
+            closed_server.close()
+            await closed_server.wait_closed()
+            result = await orchestrator._step_check_asset({"ports": [open_port, closed_port]}, {}, {"identifier": "127.0.0.1"})
+            # The probe closed its side of the connection: the server reads EOF
+            reader, writer = accepted[0]
+            self.assertEqual(await asyncio.wait_for(reader.read(), 5), b"")
+            writer.close()
+            server.close()
+            await server.wait_closed()
+            return result, open_port
+        result, open_port = asyncio.run(probe())
+        self.assertEqual(result["addresses"], ["127.0.0.1"])
+        self.assertEqual(result["open_ports"], [open_port])
+        orchestrator.close()
+
     # Add more tests here as modules get integrated into the orchestrator:
     # - Mocking module dependencies (e.g., VulnerabilityCrawler, LLMReportGenerator)
     # - Testing data flow between mocked modules via the orchestrator
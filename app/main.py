@@ -11,6 +11,7 @@ from app.routers import (
     ai_security_router,
     config_router
 )
+from app.services import get_config_manager, get_task_executor
 
 app = FastAPI(
     title="Shadow Evil Security Dashboard API",
@@ -43,9 +44,21 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],         # Izinkan semua metode (GET, POST, dll. )
     allow_headers=["*"],         # Izinkan semua header
+    expose_headers=["X-Next-Cursor"], # Cursor halaman berikutnya untuk endpoint daftar
 )
 
 
+@app.on_event("startup")
+async def start_task_executor():
+    get_config_manager().start_watching()
+    await get_task_executor().start()
+
+@app.on_event("shutdown")
+async def stop_task_executor():
+    await get_task_executor().shutdown()
+    get_config_manager().stop_watching()
+
+
 @app.get("/health", tags=["System Status"], summary="Health Check")
 async def health_check():
     """
@@ -0,0 +1,97 @@
+import base64
+import binascii
+import datetime
+import heapq
+import json
+from typing import Any, Dict, Iterable, List, Tuple
+
+from fastapi import HTTPException, Response
+
+# Keyset (cursor) pagination shared by the list endpoints.
+# List responses stay plain JSON arrays; the opaque cursor for the next page is returned
+# in the X-Next-Cursor header and passed back through the `cursor` query parameter.
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+def _sort_value(value: Any) -> tuple:
+    """Maps a field value to a totally ordered key (None sorts first, datetimes by ISO string)."""
+    if value is None:
+        return (0, "")
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return (1, value.isoformat())
+    return (1, value)
+
+def _json_value(value: Any) -> Any:
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    return value
+
+def encode_cursor(sort: str, order: str, values: Iterable[Any]) -> str:
+    """
+    Encodes the sort position of the last returned item into an opaque, URL-safe cursor.
+    """
+    payload = json.dumps([sort, order, [_json_value(v) for v in values]], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str, sort: str, order: str) -> list:
+    """
+    Decodes a cursor produced by encode_cursor. A cursor is only valid for the sort field and
+    order it was issued for, and holds the (sort value, id) pair of the last item; anything else
+    is rejected with HTTP 400.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort, cursor_order, values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, TypeError, binascii.Error):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor.")
+    if cursor_sort != sort or cursor_order != order or not isinstance(values, list):
+        raise HTTPException(status_code=400, detail="Pagination cursor does not match the requested sort order.")
+    if len(values) != 2 or any(isinstance(value, (list, dict)) for value in values):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor.")
+    return values
+
+def validate_sort(sort: str, order: str, allowed_sorts: Iterable[str]):
+    if sort not in allowed_sorts:
+        raise HTTPException(status_code=400, detail=f"Unsupported sort field '{sort}'. Allowed: {', '.join(allowed_sorts)}.")
+    if order not in ("asc", "desc"):
+        raise HTTPException(status_code=400, detail="Order must be 'asc' or 'desc'.")
+
+def paginate(items: Iterable[Dict[str, Any]], *, sort: str, order: str, limit: int, cursor: str | None,
+             id_field: str, allowed_sorts: Iterable[str]) -> Tuple[List[Dict[str, Any]], str | None]:
+    """
+    Returns one page of `items` ordered by (sort, id_field), which is a stable total order.
+
+    Only the items after the cursor are considered and a bounded heap selects the page, so the
+    cost is O(n log limit) rather than a full sort, and the response size is bounded by `limit`.
+
+    Returns:
+        A tuple (page, next_cursor); next_cursor is None on the last page.
+    """
+    validate_sort(sort, order, allowed_sorts)
+    descending = order == "desc"
+
+    def key(item):
+        return (_sort_value(item.get(sort)), _sort_value(item.get(id_field)))
+
+    candidates = items
+    if cursor:
+        last_sort_value, last_id = decode_cursor(cursor, sort, order)
+        boundary = (_sort_value(last_sort_value), _sort_value(last_id))
+        if descending:
+            candidates = (item for item in items if key(item) < boundary)
+        else:
+            candidates = (item for item in items if key(item) > boundary)
+
+    select = heapq.nlargest if descending else heapq.nsmallest
+    page = select(limit + 1, candidates, key=key)
+    next_cursor = None
+    if len(page) > limit:
+        page = page[:limit]
+        last = page[-1]
+        next_cursor = encode_cursor(sort, order, (last.get(sort), last.get(id_field)))
+    return page, next_cursor
+
+def set_next_cursor(response: Response, next_cursor: str | None):
+    """Exposes the next-page cursor on the response, if there is a next page."""
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
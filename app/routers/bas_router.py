@@ -1,9 +1,13 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from pydantic import BaseModel
 from typing import List, Dict, Any
 import datetime
 import uuid
 
+from advanced_security_script.core.config_manager import ConfigManager
+from app.pagination import paginate, set_next_cursor
+from app.services import get_config_manager
+
 router = APIRouter(
     prefix="/bas",
     tags=["Breach and Attack Simulation"],
@@ -31,9 +35,10 @@ class BASSimulationStatus(BaseModel):
     submitted_at: datetime.datetime
     started_at: datetime.datetime | None = None
     completed_at: datetime.datetime | None = None
+    rl_agent_config: Dict[str, Any] | None = None # Effective RL agent settings (config layered with the request's overrides)
 
 @router.post("/simulations", response_model=BASSimulationStatus, status_code=202, summary="Launch a New BAS Simulation")
-async def launch_bas_simulation(config: BASSimulationConfig):
+async def launch_bas_simulation(config: BASSimulationConfig, config_manager: ConfigManager = Depends(get_config_manager)):
     """
     Launches a new Breach and Attack Simulation based on the provided configuration.
 
@@ -44,6 +49,11 @@ async def launch_bas_simulation(config: BASSimulationConfig):
     """
     simulation_id = "bas_sim_" + str(uuid.uuid4())
     current_time = datetime.datetime.now()
+    # rl_agent_config overrides the configured rl_agent section for this simulation only.
+    try:
+        rl_agent_config = config_manager.with_overrides({"rl_agent": config.rl_agent_config or {}}).get_section("rl_agent")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
     new_simulation = BASSimulationStatus(
         simulation_id=simulation_id,
@@ -52,7 +62,8 @@ async def launch_bas_simulation(config: BASSimulationConfig):
         target_scope=config.target_scope,
         attack_scenarios_total=len(config.attack_scenarios),
         attack_scenarios_completed=0,
-        submitted_at=current_time
+        submitted_at=current_time,
+        rl_agent_config=rl_agent_config
     )
     bas_simulations_db[simulation_id] = new_simulation.dict()
     
@@ -76,12 +87,23 @@ async def get_bas_simulation_status(simulation_id: str):
          bas_simulations_db[simulation_id]["started_at"] = datetime.datetime.now()
     return bas_simulations_db[simulation_id]
 
+BAS_SORT_FIELDS = ("submitted_at", "started_at", "completed_at", "simulation_name", "status")
+
 @router.get("/simulations", response_model=List[BASSimulationStatus], summary="List All BAS Simulations")
-async def list_all_bas_simulations():
+async def list_all_bas_simulations(response: Response, limit: int = Query(100, ge=1, le=1000), cursor: str | None = None,
+                                   sort: str = "submitted_at", order: str = "desc"):
     """
-    Retrieves a list of all submitted BAS simulations and their current status.
+    Retrieves a page of submitted BAS simulations and their current status.
+
+    - **limit**: Maximum number of simulations to return.
+    - **cursor**: Opaque cursor from the `X-Next-Cursor` header of the previous page.
+    - **sort**: Sort field (submitted_at, started_at, completed_at, simulation_name, status).
+    - **order**: "asc" or "desc".
     """
-    return list(bas_simulations_db.values())
+    page, next_cursor = paginate(bas_simulations_db.values(), sort=sort, order=order, limit=limit, cursor=cursor,
+                                 id_field="simulation_id", allowed_sorts=BAS_SORT_FIELDS)
+    set_next_cursor(response, next_cursor)
+    return page
 
 # Further endpoints could include:
 # - GET /simulations/{simulation_id}/results - Detailed report of findings
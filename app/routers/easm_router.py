@@ -1,8 +1,13 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from pydantic import BaseModel
 from typing import List, Dict, Any
+import asyncio
 import datetime
 
+from advanced_security_script.modules.intelligence.vulnerability_store import VulnerabilityStore
+from app.pagination import paginate, set_next_cursor
+from app.services import get_vulnerability_store
+
 router = APIRouter(
     prefix="/easm",
     tags=["External Attack Surface Management"],
@@ -12,6 +17,11 @@ router = APIRouter(
 # Placeholder for EASM data
 easm_assets_db: List[Dict[str, Any]] = []
 
+class Technology(BaseModel):
+    product: str # e.g., "http_server"
+    vendor: str | None = None # e.g., "apache"
+    version: str | None = None # e.g., "2.4.49"
+
 class Asset(BaseModel):
     id: str
     asset_type: str # e.g., "domain", "ip_address", "s3_bucket"
@@ -19,17 +29,39 @@ class Asset(BaseModel):
     discovered_at: datetime.datetime
     last_seen: datetime.datetime
     risk_score: float | None = None
-    vulnerabilities_found: int = 0
+    technologies: List[Technology] = []
+    vulnerabilities_found: int = 0 # Distinct vulnerabilities affecting the asset's technologies
     status: str # e.g., "active", "inactive", "unverified"
 
+ASSET_SORT_FIELDS = ("last_seen", "discovered_at", "risk_score", "identifier")
+
+def count_asset_vulnerabilities(assets: List[Dict[str, Any]], store: VulnerabilityStore):
+    """
+    Sets each asset's vulnerabilities_found to the number of distinct vulnerabilities affecting its
+    technologies, resolving the technologies of all assets in one bulk CPE match.
+    """
+    queries = [technology for asset in assets for technology in asset.get("technologies", [])]
+    matches = iter(store.match_cpes(queries))
+    for asset in assets:
+        found = set()
+        for _ in asset.get("technologies", []):
+            found.update(next(matches))
+        asset["vulnerabilities_found"] = len(found)
+
 @router.get("/assets", response_model=List[Asset], summary="Get Discovered External Assets")
-async def get_discovered_assets(limit: int = 100, asset_type: str | None = None, min_risk_score: float | None = None):
+async def get_discovered_assets(response: Response, limit: int = Query(100, ge=1, le=1000), asset_type: str | None = None,
+                                min_risk_score: float | None = None, cursor: str | None = None,
+                                sort: str = "last_seen", order: str = "desc",
+                                store: VulnerabilityStore = Depends(get_vulnerability_store)):
     """
-    Retrieves a list of discovered external assets, with optional filtering.
+    Retrieves a page of discovered external assets, with optional filtering.
 
     - **limit**: Maximum number of assets to return.
     - **asset_type**: Filter by asset type (e.g., "domain", "ip_address").
     - **min_risk_score**: Filter by minimum risk score.
+    - **cursor**: Opaque cursor from the `X-Next-Cursor` header of the previous page.
+    - **sort**: Sort field (last_seen, discovered_at, risk_score, identifier).
+    - **order**: "asc" or "desc".
     """
     # This is a placeholder. In a real implementation, this would query
     # the EASM module (expanded VulnerabilityCrawler) or a database populated by it.
@@ -41,7 +73,8 @@ async def get_discovered_assets(limit: int = 100, asset_type: str | None = None,
             "discovered_at": datetime.datetime.now() - datetime.timedelta(days=10),
             "last_seen": datetime.datetime.now(),
             "risk_score": 8.5,
-            "vulnerabilities_found": 3,
+            "technologies": [{"vendor": "apache", "product": "http_server", "version": "2.4.49"},
+                             {"vendor": "php", "product": "php", "version": "7.4.21"}],
             "status": "active"
         },
         {
@@ -51,7 +84,7 @@ async def get_discovered_assets(limit: int = 100, asset_type: str | None = None,
             "discovered_at": datetime.datetime.now() - datetime.timedelta(days=5),
             "last_seen": datetime.datetime.now() - datetime.timedelta(days=1),
             "risk_score": 6.2,
-            "vulnerabilities_found": 1,
+            "technologies": [{"vendor": "openbsd", "product": "openssh", "version": "8.2"}],
             "status": "active"
         }
     ]
@@ -60,8 +93,13 @@ async def get_discovered_assets(limit: int = 100, asset_type: str | None = None,
         results = [a for a in results if a["asset_type"].lower() == asset_type.lower()]
     if min_risk_score is not None:
         results = [a for a in results if a["risk_score"] is not None and a["risk_score"] >= min_risk_score]
-    
-    return results[:limit]
+
+    page, next_cursor = paginate(results, sort=sort, order=order, limit=limit, cursor=cursor,
+                                 id_field="id", allowed_sorts=ASSET_SORT_FIELDS)
+    set_next_cursor(response, next_cursor)
+    # Matching a page of assets reads the CPE entries of their products; keep it off the event loop
+    await asyncio.to_thread(count_asset_vulnerabilities, page, store)
+    return page
 
 @router.post("/discover", status_code=202, summary="Trigger EASM Discovery Task")
 async def trigger_easm_discovery(targets: List[str] | None = ["initial_seed_domain.com"]):
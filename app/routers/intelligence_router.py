@@ -1,72 +1,118 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from pydantic import BaseModel
-from typing import List, Dict, Any
+from typing import List
+import asyncio
 import datetime
 
+from advanced_security_script.modules.intelligence.cpe_index import normalize_query
+from advanced_security_script.modules.intelligence.vulnerability_store import SEARCH_SORTS, VulnerabilityStore
+from app.pagination import decode_cursor, encode_cursor, set_next_cursor, validate_sort
+from app.services import get_vulnerability_store
+
 router = APIRouter(
     prefix="/intelligence",
     tags=["Threat Intelligence"],
     responses={404: {"description": "Not found"}},
 )
 
-# Placeholder for in-memory storage or database interaction
-vulnerabilities_db: List[Dict[str, Any]] = []
+VULNERABILITY_SORT_FIELDS = ("published_date", "last_modified_date")
+# Enough for a full EASM inventory in one request
+MAX_PRODUCT_QUERIES = 50000
 
 class Vulnerability(BaseModel):
     id: str
     source: str # e.g., NVD, Exploit-DB
     title: str
-    description: str
+    description: str | None = None
     severity: str | None = None # e.g., CRITICAL, HIGH, MEDIUM, LOW
     cvss_score: float | None = None
     references: List[str] | None = []
     published_date: datetime.datetime
     last_modified_date: datetime.datetime
+    score: float | None = None # BM25 relevance of a search result (lower is more relevant)
+    snippet: str | None = None # Excerpt of a search result with the matched terms in <mark> tags
+
+class ProductQuery(BaseModel):
+    product: str | None = None # e.g., "http_server" or "HTTP Server"
+    vendor: str | None = None # e.g., "apache"; any vendor when omitted
+    version: str | None = None # e.g., "2.4.49"; every version when omitted
+    cpe: str | None = None # A CPE 2.3 string, instead of the fields above
+
+class ProductMatch(BaseModel):
+    vendor: str
+    product: str
+    version: str
+    vulnerability_ids: List[str]
 
 @router.get("/vulnerabilities", response_model=List[Vulnerability], summary="Get Latest Vulnerabilities")
-async def get_latest_vulnerabilities(limit: int = 10, source: str | None = None, severity: str | None = None):
+async def get_latest_vulnerabilities(response: Response, limit: int = Query(10, ge=1, le=500), q: str | None = None,
+                                     source: str | None = None, severity: str | None = None, min_cvss_score: float | None = None,
+                                     cursor: str | None = None, sort: str | None = None, order: str = "desc",
+                                     store: VulnerabilityStore = Depends(get_vulnerability_store)):
     """
-    Retrieves a list of the latest vulnerabilities, with optional filtering.
+    Retrieves a page of the latest vulnerabilities, with optional filtering.
+    Results are served from the persistent store populated by the VulnerabilityCrawler.
 
     - **limit**: Maximum number of vulnerabilities to return.
+    - **q**: Full-text search over IDs, titles and descriptions (e.g. a product or vendor name). All terms
+      must match; a trailing `*` matches prefixes. Results carry a `score` and a highlighted `snippet`
+      and are ranked by relevance unless another sort is requested.
     - **source**: Filter by vulnerability source (e.g., "NVD").
     - **severity**: Filter by severity level (e.g., "CRITICAL").
+    - **min_cvss_score**: Filter by minimum CVSS base score.
+    - **cursor**: Opaque cursor from the `X-Next-Cursor` header of the previous page.
+    - **sort**: Sort field (published_date, last_modified_date; also relevance, the default, with `q`).
+    - **order**: "asc" or "desc".
+    """
+    if q:
+        sort = sort or "relevance"
+        validate_sort(sort, order, SEARCH_SORTS)
+    else:
+        sort = sort or "published_date"
+        validate_sort(sort, order, VULNERABILITY_SORT_FIELDS)
+    after = tuple(decode_cursor(cursor, sort, order)) if cursor else None
+    # The store serializes access, and crawls hold it for whole write transactions; wait off the event loop
+    if q:
+        rows = await asyncio.to_thread(store.search, q, source=source, severity=severity, min_cvss_score=min_cvss_score,
+                                       limit=limit + 1, sort=sort, descending=order == "desc", after=after)
+    else:
+        rows = await asyncio.to_thread(store.query, source=source, severity=severity, min_cvss_score=min_cvss_score,
+                                       limit=limit + 1, sort=sort, descending=order == "desc", after=after)
+    if len(rows) > limit:
+        rows = rows[:limit]
+        sort_key = "score" if sort == "relevance" else sort
+        set_next_cursor(response, encode_cursor(sort, order, (rows[-1][sort_key], rows[-1]["id"])))
+    return rows
+
+@router.get("/vulnerabilities/{vuln_id}", response_model=Vulnerability, summary="Get Vulnerability Details")
+async def get_vulnerability(vuln_id: str, store: VulnerabilityStore = Depends(get_vulnerability_store)):
+    """
+    Retrieves a single vulnerability by its ID (e.g., "CVE-2025-0001").
+    """
+    vulnerability = await asyncio.to_thread(store.get, vuln_id)
+    if vulnerability is None:
+        raise HTTPException(status_code=404, detail="Vulnerability not found")
+    return vulnerability
+
+@router.post("/products/match", response_model=List[ProductMatch], summary="Match Products to Vulnerabilities")
+async def match_products(queries: List[ProductQuery], store: VulnerabilityStore = Depends(get_vulnerability_store)):
+    """
+    Resolves product versions (e.g. the technologies detected on EASM assets) to the vulnerabilities
+    whose NVD CPE configurations cover them, in bulk. Returns one match per query, in query order.
+
+    Each query names a **product** with an optional **vendor** and **version**, or gives a **cpe** string
+    (e.g. "cpe:2.3:a:apache:http_server:2.4.49"). Up to 50,000 queries per request.
     """
-    # This is a placeholder. In a real implementation, this would query
-    # the VulnerabilityCrawler module or a database populated by it.
-    # Simulating some data for now:
-    simulated_data = [
-        {
-            "id": "CVE-2025-0001",
-            "source": "NVD",
-            "title": "Example Critical Vulnerability in WebServerX",
-            "description": "A remote code execution vulnerability exists in WebServerX due to improper input validation.",
-            "severity": "CRITICAL",
-            "cvss_score": 9.8,
-            "references": ["http://nvd.nist.gov/vuln/detail/CVE-2025-0001"],
-            "published_date": datetime.datetime.now() - datetime.timedelta(days=1),
-            "last_modified_date": datetime.datetime.now()
-        },
-        {
-            "id": "EDB-ID-2025-0002",
-            "source": "Exploit-DB",
-            "title": "WebServerY - SQL Injection PoC",
-            "description": "Proof of concept for SQL injection in WebServerY login page.",
-            "severity": "HIGH",
-            "cvss_score": 7.5,
-            "references": ["http://exploit-db.com/exploits/20250002"],
-            "published_date": datetime.datetime.now() - datetime.timedelta(days=2),
-            "last_modified_date": datetime.datetime.now() - datetime.timedelta(days=1)
-        }
-    ]
-    
-    results = simulated_data
-    if source:
-        results = [v for v in results if v["source"].lower() == source.lower()]
-    if severity:
-        results = [v for v in results if v["severity"].lower() == severity.lower()]
-    
-    return results[:limit]
+    if len(queries) > MAX_PRODUCT_QUERIES:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_PRODUCT_QUERIES} queries per request.")
+    keys = [query.cpe or query.dict() for query in queries]
+    # Large batches take a while; keep them off the event loop
+    matches = await asyncio.to_thread(store.match_cpes, keys)
+    results = []
+    for key, vulnerability_ids in zip(keys, matches):
+        vendor, product, version = normalize_query(key)
+        results.append({"vendor": vendor, "product": product, "version": version, "vulnerability_ids": vulnerability_ids})
+    return results
 
 @router.post("/vulnerabilities/crawl", status_code=202, summary="Trigger Vulnerability Crawling Task")
 async def trigger_vulnerability_crawl(sources: List[str] | None = ["NVD", "Exploit-DB"]):
@@ -1,9 +1,11 @@
-from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Query, Response
 from pydantic import BaseModel
 from typing import List, Dict, Any
 import datetime
 import uuid
 
+from app.pagination import paginate, set_next_cursor
+
 router = APIRouter(
     prefix="/reporting",
     tags=["Reporting & Analytics"],
@@ -87,12 +89,23 @@ async def get_report_status(report_id: str):
         raise HTTPException(status_code=404, detail="Report not found")
     return reports_db[report_id]
 
+REPORT_SORT_FIELDS = ("created_at", "completed_at", "report_name", "status")
+
 @router.get("/", response_model=List[ReportStatus], summary="List All Generated Reports")
-async def list_all_reports():
+async def list_all_reports(response: Response, limit: int = Query(100, ge=1, le=1000), cursor: str | None = None,
+                           sort: str = "created_at", order: str = "desc"):
     """
-    Retrieves a list of all generated reports and their current status.
+    Retrieves a page of generated reports and their current status.
+
+    - **limit**: Maximum number of reports to return.
+    - **cursor**: Opaque cursor from the `X-Next-Cursor` header of the previous page.
+    - **sort**: Sort field (created_at, completed_at, report_name, status).
+    - **order**: "asc" or "desc".
     """
-    return list(reports_db.values())
+    page, next_cursor = paginate(reports_db.values(), sort=sort, order=order, limit=limit, cursor=cursor,
+                                 id_field="report_id", allowed_sorts=REPORT_SORT_FIELDS)
+    set_next_cursor(response, next_cursor)
+    return page
 
 # A mock download endpoint
 @router.get("/download/{report_id}/{filename}", summary="Download Generated Report (Mock)")
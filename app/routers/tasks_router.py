@@ -1,7 +1,13 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from pydantic import BaseModel
+import asyncio
+import datetime
 import uuid
 
+from advanced_security_script.core.task_executor import TaskExecutor
+from app.pagination import paginate, set_next_cursor
+from app.services import get_task_executor
+
 router = APIRouter(
     prefix="/tasks",
     tags=["Task Management"],
@@ -17,6 +23,7 @@ class TaskCreate(BaseModel):
     module_to_run: str # e.g., "vulnerability_scan", "easm_discovery"
     target: str | None = None # e.g., a URL, IP range, or domain
     parameters: dict | None = None # Module-specific parameters
+    config_overrides: dict | None = None # Config values for this task only, e.g. {"vulnerability_crawler": {"max_results_per_source": 5}}
 
 class TaskStatus(BaseModel):
     task_id: str
@@ -29,8 +36,15 @@ class TaskStatus(BaseModel):
     completed_at: str | None = None
     result_summary: str | None = None
 
+def _record_task_status(task_id: str, status: str, **fields):
+    """Status callback used by the TaskExecutor to record transitions and timestamps."""
+    task = tasks_db.get(task_id)
+    if task is not None:
+        task["status"] = status
+        task.update(fields)
+
 @router.post("/", response_model=TaskStatus, status_code=202, summary="Submit a New Security Task")
-async def submit_new_task(task_details: TaskCreate):
+async def submit_new_task(task_details: TaskCreate, executor: TaskExecutor = Depends(get_task_executor)):
     """
     Submits a new security task to the system.
 
@@ -38,25 +52,37 @@ async def submit_new_task(task_details: TaskCreate):
     - **module_to_run**: Identifier of the security module to execute (e.g., from advanced_security_script).
     - **target**: (Optional) The target for the security task.
     - **parameters**: (Optional) Additional parameters for the module.
+    - **config_overrides**: (Optional) Configuration overrides applied to this task only.
     """
     task_id = str(uuid.uuid4())
-    current_time = str(uuid.uuid4()) # Placeholder for actual timestamp
+    current_time = datetime.datetime.now().isoformat()
     new_task = TaskStatus(
         task_id=task_id,
         task_name=task_details.task_name,
         status="pending",
         module_to_run=task_details.module_to_run,
         target=task_details.target,
-        submitted_at=current_time # Replace with actual datetime
+        submitted_at=current_time
     )
     tasks_db[task_id] = new_task.dict()
-    
-    # Here, you would typically trigger the WorkflowOrchestrator from advanced_security_script
-    # to actually start processing this task asynchronously.
-    # For now, we'll just simulate it as pending.
+
+    # The WorkflowOrchestrator runs the task on a background worker; status and
+    # timestamps in tasks_db are updated by _record_task_status as it progresses.
+    task_config = dict(task_details.parameters or {}, task_name=task_details.module_to_run,
+                       target=task_details.target, task_id=task_id)
+    if task_details.config_overrides:
+        task_config["config_overrides"] = task_details.config_overrides
+    try:
+        executor.submit(task_id, task_config, on_status=_record_task_status)
+    except ValueError as e:
+        del tasks_db[task_id]
+        raise HTTPException(status_code=400, detail=str(e))
+    except (asyncio.QueueFull, RuntimeError) as e:
+        del tasks_db[task_id]
+        raise HTTPException(status_code=503, detail=f"Task could not be queued: {str(e) or 'task queue is full'}")
     print(f"Task {task_id} ({task_details.task_name}) submitted for module {task_details.module_to_run}.")
-    
-    return new_task
+
+    return tasks_db[task_id]
 
 @router.get("/{task_id}", response_model=TaskStatus, summary="Get Task Status and Details")
 async def get_task_status(task_id: str):
@@ -67,12 +93,23 @@ async def get_task_status(task_id: str):
         raise HTTPException(status_code=404, detail="Task not found")
     return tasks_db[task_id]
 
+TASK_SORT_FIELDS = ("submitted_at", "started_at", "completed_at", "task_name", "status")
+
 @router.get("/", response_model=list[TaskStatus], summary="List All Submitted Tasks")
-async def list_all_tasks():
+async def list_all_tasks(response: Response, limit: int = Query(100, ge=1, le=1000), cursor: str | None = None,
+                         sort: str = "submitted_at", order: str = "desc"):
     """
-    Retrieves a list of all submitted security tasks and their current status.
+    Retrieves a page of submitted security tasks and their current status.
+
+    - **limit**: Maximum number of tasks to return.
+    - **cursor**: Opaque cursor from the `X-Next-Cursor` header of the previous page.
+    - **sort**: Sort field (submitted_at, started_at, completed_at, task_name, status).
+    - **order**: "asc" or "desc".
     """
-    return list(tasks_db.values())
+    page, next_cursor = paginate(tasks_db.values(), sort=sort, order=order, limit=limit, cursor=cursor,
+                                 id_field="task_id", allowed_sorts=TASK_SORT_FIELDS)
+    set_next_cursor(response, next_cursor)
+    return page
 
 # Further endpoints could include:
 # - PUT /tasks/{task_id}/cancel - To cancel a running task
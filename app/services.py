@@ -0,0 +1,33 @@
+import functools
+import os
+
+from advanced_security_script.core.config_manager import ConfigManager
+from advanced_security_script.core.task_executor import TaskExecutor
+from advanced_security_script.modules.intelligence.vulnerability_store import VulnerabilityStore, shared_store
+
+# Shared backend services used by the routers.
+# Each accessor builds its service once per process and is usable as a FastAPI dependency,
+# so tests can swap implementations through app.dependency_overrides.
+
+@functools.lru_cache(maxsize=None)
+def get_config_manager() -> ConfigManager:
+    """
+    Returns the process-wide ConfigManager. The config file can be selected with the
+    ADVANCED_SECURITY_CONFIG environment variable.
+    """
+    return ConfigManager(config_path=os.environ.get("ADVANCED_SECURITY_CONFIG"))
+
+def get_vulnerability_store() -> VulnerabilityStore:
+    """
+    Returns the persistent vulnerability store populated by VulnerabilityCrawler. The workflows
+    run by the task executor write to the same instance (see shared_store).
+    """
+    return shared_store(get_config_manager().get("vulnerability_store", "db_path"))
+
+@functools.lru_cache(maxsize=None)
+def get_task_executor() -> TaskExecutor:
+    """
+    Returns the background executor that runs submitted tasks through the WorkflowOrchestrator.
+    It is started and stopped with the application (see app.main).
+    """
+    return TaskExecutor(get_config_manager())